@@ -0,0 +1,87 @@
+"""
+Shared Setup of the Benchmarks.
+
+Run from the Repository Root, e.g. `python -m benchmarks.product_cache --products 100000`.
+Every Benchmark Seeds its own Data into a Temporary SQLite File, or into the Database of
+BENCHMARK_DATABASE_URL (an Empty Scratch Database, the Tables are Dropped Afterwards) to Measure
+against PostgreSQL. SQLite lacks the PostgreSQL Date Functions the Queries use, they are Registered
+on every Connection with the same Semantics for UTC Timestamps.
+"""
+import os
+
+# The Modules Read their Settings at Import, the Application Database is never Connected to.
+for name, value in {
+    "DB_USER": "benchmark",
+    "DB_PASSWORD": "benchmark",
+    "DB_URL": "localhost",
+    "DB_NAME": "benchmark",
+    "SECRET_KEY": "benchmark",
+    "HASHING_ALGORITHM": "HS256",
+}.items():
+    os.environ.setdefault(name, value)
+
+from schemas.base import Base
+from tests.sqlite_schema import create_tables
+from sqlalchemy import Table, event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator
+import tempfile
+import time
+
+
+BENCHMARK_DATABASE_URL = os.environ.get("BENCHMARK_DATABASE_URL")
+
+
+def _date_trunc(unit: str, value: str) -> str:
+    # SQLite Stores Timestamps as "YYYY-MM-DD HH:MM:SS.ffffff".
+    if unit == "hour":
+        return value[:13] + ":00:00.000000"
+    if unit == "day":
+        return value[:10] + " 00:00:00.000000"
+    raise ValueError(f"Unsupported date_trunc Unit: {unit}")
+
+
+def _register_sqlite_functions(dbapi_connection, connection_record):
+    dbapi_connection.create_function("timezone", 2, lambda zone, value: value, deterministic=True)
+    dbapi_connection.create_function("date_trunc", 2, _date_trunc, deterministic=True)
+
+
+@asynccontextmanager
+async def scratch_database(*tables: Table) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    """Creates the given Tables (or all) and Yields a Session Factory bound to them."""
+    with tempfile.TemporaryDirectory() as directory:
+        engine: AsyncEngine
+        if BENCHMARK_DATABASE_URL:
+            engine = create_async_engine(BENCHMARK_DATABASE_URL)
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all, tables=list(tables) or None)
+        else:
+            engine = create_async_engine(f"sqlite+aiosqlite:///{directory}/benchmark.db")
+            event.listen(engine.sync_engine, "connect", _register_sqlite_functions)
+            await create_tables(engine, *tables)
+
+        try:
+            yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        finally:
+            if BENCHMARK_DATABASE_URL:
+                async with engine.begin() as conn:
+                    await conn.run_sync(Base.metadata.drop_all, tables=list(tables) or None)
+            await engine.dispose()
+
+
+@contextmanager
+def timed(label: str, results: dict) -> Iterator[None]:
+    """Stores the Seconds the Block took under the Label."""
+    start = time.perf_counter()
+    yield
+    results[label] = time.perf_counter() - start
+
+
+def report(title: str, rows: dict):
+    print(title)
+    width = max(map(len, rows))
+    for label, value in rows.items():
+        if isinstance(value, float):
+            value = f"{value * 1000:,.2f} ms" if value < 1 else f"{value:,.2f} s"
+        print(f"  {label:<{width}}  {value}")
@@ -0,0 +1,60 @@
+"""
+Catalog Lookups of Order Pricing, with and without the Product Cache (utils/product_cache.py).
+
+Seeds the Products, then Prices Carts of Random Products the way create_order does:
+once with the Cache Cleared before every Cart (one SELECT per Cart) and once with a Warm Cache.
+
+    python -m benchmarks.product_cache --products 100000 --carts 5000 --cart-size 10
+"""
+from benchmarks.common import report, scratch_database, timed
+from schemas.product import Product
+from utils.product_cache import fetch_products, product_cache
+from sqlalchemy import insert
+from uuid import uuid4
+import argparse
+import asyncio
+import random
+
+
+async def main(products: int, carts: int, cart_size: int):
+    async with scratch_database(Product.__table__) as session_factory:
+        product_ids = [uuid4() for _ in range(products)]
+        async with session_factory() as db:
+            await db.execute(insert(Product), [
+                {"id": product_id, "name": f"Product {i}", "description": "", "price": 1 + i % 500 / 10,
+                 "is_removed": False, "category_id": 1}
+                for i, product_id in enumerate(product_ids)
+            ])
+            await db.commit()
+
+        rng = random.Random(4)
+        cart_products = [rng.sample(product_ids, cart_size) for _ in range(carts)]
+        results = {}
+        async with session_factory() as db:
+            with timed("uncached", results):
+                for cart in cart_products:
+                    product_cache.clear()
+                    await fetch_products(cart, db)
+
+            for chunk in range(0, products, 10_000):
+                await fetch_products(product_ids[chunk:chunk + 10_000], db)
+            product_cache.hits = product_cache.misses = 0
+            with timed("cached", results):
+                for cart in cart_products:
+                    await fetch_products(cart, db)
+
+        report(f"{carts:,} Carts of {cart_size} out of {products:,} Products", {
+            "Uncached, per Cart": results["uncached"] / carts,
+            "Cached, per Cart": results["cached"] / carts,
+            "Speedup": f"{results['uncached'] / results['cached']:,.1f}x",
+            "Hit Ratio": f"{product_cache.stats()['hit_ratio']:.2%}"
+        })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--carts", type=int, default=5_000)
+    parser.add_argument("--cart-size", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.products, args.carts, args.cart_size))
@@ -0,0 +1,117 @@
+"""
+Sales Rollups (utils/sales_rollup.py): Rolls up the Seeded Sales, then Times a Daily All Stores
+Report from the Rollup against the same Report Scanning the Orders and Cart Items.
+Catalog Prices are Raised after the Sales, the Rolled up Amounts must still Match the Orders.
+
+    python -m benchmarks.sales_rollup --orders 200000 --stores 20 --products 200 --days 90
+"""
+from benchmarks.common import report, scratch_database, timed
+from schemas.order import Order, CartItems
+from schemas.product import Product
+from schemas.refund import Refund, RefundItems
+from schemas.sales_rollup import SalesRollupHourly, SalesRollupDaily, RollupWatermark
+from schemas.transaction import Transaction
+from utils import sales_rollup
+from utils.sales_rollup import query_sales, run_sales_rollup
+from sqlalchemy import func, insert, update
+from sqlalchemy.future import select
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+import argparse
+import asyncio
+import math
+import random
+
+
+async def _seed(session_factory, orders: int, stores: int, products: int, days: int, start: datetime):
+    rng = random.Random(25)
+    store_ids = [uuid4() for _ in range(stores)]
+    prices = {uuid4(): rng.randint(100, 5_000) / 100 for _ in range(products)}
+    product_ids = list(prices)
+
+    async with session_factory() as db:
+        await db.execute(insert(Product), [
+            {"id": product_id, "name": f"Product {i}", "description": "", "price": price,
+             "is_removed": False, "category_id": 1}
+            for i, (product_id, price) in enumerate(prices.items())
+        ])
+        for chunk in range(0, orders, 20_000):
+            order_rows, item_rows = [], []
+            for _ in range(min(20_000, orders - chunk)):
+                order_id = uuid4()
+                lines = [(product_id, rng.randint(1, 4)) for product_id in rng.sample(product_ids, 2)]
+                amount = round(sum(prices[product_id] * quantity for product_id, quantity in lines), 2)
+                order_rows.append({"id": order_id, "store_id": rng.choice(store_ids), "customer_id": uuid4(),
+                                   "order_amount": amount, "discount_amount": round(amount * 0.05, 2),
+                                   "tax": round(amount * 0.95 * 0.18, 2), "status": "Received",
+                                   "date_placed": start + timedelta(seconds=rng.randrange(days * 86_400)),
+                                   "order_mode": "Offline"})
+                item_rows.extend({"order_id": order_id, "product_id": product_id, "quantity": quantity,
+                                  "discount": 0.05} for product_id, quantity in lines)
+
+            await db.execute(insert(Order), order_rows)
+            await db.execute(insert(CartItems), item_rows)
+            await db.execute(insert(Transaction), [
+                {"id": uuid4(), "type": "Sale", "date": order["date_placed"], "operation_id": order["id"],
+                 "request_made_by": uuid4(), "store_id": order["store_id"]}
+                for order in order_rows
+            ])
+
+        # Prices Change between the Sales and the Rollup.
+        await db.execute(update(Product).values(price=Product.price * 1.1))
+        await db.commit()
+
+
+async def main(orders: int, stores: int, products: int, days: int):
+    tables = [Product.__table__, Order.__table__, CartItems.__table__, Refund.__table__, RefundItems.__table__,
+              Transaction.__table__, SalesRollupHourly.__table__, SalesRollupDaily.__table__,
+              RollupWatermark.__table__]
+    async with scratch_database(*tables) as session_factory:
+        sales_rollup.AsyncSessionLocal = session_factory
+        sales_rollup.SALES_ROLLUP_LAG = 0
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        end = start + timedelta(days=days)
+        await _seed(session_factory, orders, stores, products, days, start)
+
+        results = {}
+        with timed("rollup", results):
+            await run_sales_rollup()
+
+        async with session_factory() as db:
+            with timed("report", results):
+                rows = await query_sales(db, "day", start, end, by_store=True)
+            with timed("scan", results):
+                day = func.date(Order.date_placed)
+                scanned = (await db.execute(
+                    select(day, Order.store_id, func.sum(CartItems.quantity))
+                    .join(CartItems, CartItems.order_id == Order.id)
+                    .where(Order.date_placed >= start, Order.date_placed < end)
+                    .group_by(day, Order.store_id)
+                )).all()
+                order_totals = (await db.execute(
+                    select(func.sum(Order.order_amount), func.sum(Order.discount_amount), func.sum(Order.tax))
+                    .where(Order.date_placed >= start, Order.date_placed < end)
+                )).one()
+            rollup_rows = await db.scalar(select(func.count()).select_from(SalesRollupDaily))
+
+        rolled_up = [sum(getattr(row, name) for row in rows) for name in ("gross", "discount", "tax")]
+        units_match = sum(row.units_sold for row in rows) == sum(row[2] for row in scanned)
+        amounts_match = all(math.isclose(a, b, rel_tol=1e-9, abs_tol=0.01) for a, b in zip(rolled_up, order_totals))
+        report(f"{orders:,} Orders, {stores} Stores, {products} Products, {days} Days", {
+            "Rollup of every Transaction": results["rollup"],
+            "Daily Report from the Rollup": results["report"],
+            "Daily Report Scanning Orders": results["scan"],
+            "Daily Rollup Rows": f"{rollup_rows:,}",
+            "Units Match": str(units_match),
+            "Gross, Discount, Tax Match the Orders": str(amounts_match)
+        })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=50_000)
+    parser.add_argument("--stores", type=int, default=20)
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--days", type=int, default=90)
+    args = parser.parse_args()
+    asyncio.run(main(args.orders, args.stores, args.products, args.days))
@@ -0,0 +1,130 @@
+"""
+Store Dashboard (utils/store_dashboard.py): the SQL Aggregation, against Shipping the Rows of
+the Store and Aggregating them in Python, and a Cached Hit.
+
+    python -m benchmarks.store_dashboard --orders 200000 --days 365
+"""
+from benchmarks.common import report, scratch_database, timed
+from schemas.data_version import DataVersion
+from schemas.order import Order, CartItems
+from schemas.refund import Refund
+from schemas.restock import Restock, RestockItems
+from utils.store_dashboard import compute_store_dashboard, get_store_dashboard
+from sqlalchemy import insert
+from sqlalchemy.future import select
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+import argparse
+import asyncio
+import random
+
+
+async def _seed(session_factory, store_id, orders: int, days: int, first_day: date):
+    rng = random.Random(24)
+    start = datetime.combine(first_day, datetime.min.time(), tzinfo=timezone.utc)
+
+    def _moment():
+        return start + timedelta(seconds=rng.randrange(days * 24 * 60 * 60))
+
+    async with session_factory() as db:
+        for chunk in range(0, orders, 50_000):
+            order_rows = [{"id": uuid4(), "store_id": store_id, "customer_id": uuid4(),
+                           "order_amount": rng.randint(100, 10_000) / 100, "discount_amount": 0.5, "tax": 1.0,
+                           "status": rng.choice(("Pending", "Received", "Received", "Cancelled")),
+                           "date_placed": _moment(), "order_mode": "Offline"}
+                          for _ in range(min(50_000, orders - chunk))]
+            await db.execute(insert(Order), order_rows)
+            await db.execute(insert(CartItems), [
+                {"order_id": order["id"], "product_id": uuid4(), "quantity": rng.randint(1, 5), "discount": 0.0}
+                for order in order_rows for _ in range(2)
+            ])
+            await db.execute(insert(Refund), [
+                {"id": uuid4(), "reason": "Damaged", "amount": 5.0, "store_id": store_id, "order_id": order["id"],
+                 "status": rng.choice(("Pending", "Approved", "Refunded")), "application_date": _moment()}
+                for order in order_rows[::20]
+            ])
+
+        restocks = [{"id": uuid4(), "store_id": store_id, "status": "Received", "date_placed": _moment()}
+                    for _ in range(days * 2)]
+        await db.execute(insert(Restock), restocks)
+        await db.execute(insert(RestockItems), [
+            {"restock_id": restock["id"], "product_id": uuid4(), "previous_quantity": 0, "restock_quantity": 40}
+            for restock in restocks for _ in range(3)
+        ])
+        await db.commit()
+
+
+async def _client_side(db, store_id, start_date: date, end_date: date) -> dict:
+    """The Totals, Aggregated in Python over every Row of the Range."""
+    start = datetime.combine(start_date, datetime.min.time(), tzinfo=timezone.utc)
+    end = datetime.combine(end_date + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+    orders = (await db.execute(
+        select(Order.id, Order.date_placed, Order.order_amount, Order.discount_amount)
+        .where(Order.store_id == store_id, Order.date_placed >= start, Order.date_placed < end,
+               Order.status != "Cancelled")
+    )).all()
+    items = (await db.execute(
+        select(CartItems.order_id, CartItems.quantity)
+        .join(Order, Order.id == CartItems.order_id)
+        .where(Order.store_id == store_id, Order.date_placed >= start, Order.date_placed < end,
+               Order.status != "Cancelled")
+    )).all()
+    refunds = (await db.execute(
+        select(Refund.application_date, Refund.amount)
+        .where(Refund.store_id == store_id, Refund.application_date >= start, Refund.application_date < end,
+               Refund.status.in_(("Approved", "Refunded")))
+    )).all()
+
+    revenue, units = Counter(), Counter()
+    order_day = {}
+    for order_id, placed, amount, discount in orders:
+        order_day[order_id] = placed.date()
+        revenue[placed.date()] += amount - discount
+    for order_id, quantity in items:
+        units[order_day[order_id]] += quantity
+    return {"rows": len(orders) + len(items) + len(refunds),
+            "orders": len(orders),
+            "revenue": round(sum(revenue.values()), 2),
+            "units_sold": sum(units.values()),
+            "refunds": len(refunds)}
+
+
+async def main(orders: int, days: int):
+    tables = [DataVersion.__table__, Order.__table__, CartItems.__table__, Refund.__table__,
+              Restock.__table__, RestockItems.__table__]
+    async with scratch_database(*tables) as session_factory:
+        store_id = uuid4()
+        end_date = date(2025, 12, 31)
+        start_date = end_date - timedelta(days=days - 1)
+        await _seed(session_factory, store_id, orders, days, start_date)
+
+        results = {}
+        async with session_factory() as db:
+            with timed("sql", results):
+                dashboard = await compute_store_dashboard(store_id, start_date, end_date, db)
+            with timed("client", results):
+                client = await _client_side(db, store_id, start_date, end_date)
+            await get_store_dashboard(store_id, start_date, end_date, db)
+            with timed("cached", results):
+                await get_store_dashboard(store_id, start_date, end_date, db)
+
+        # The Dashboard Rounds every Day to the Cent.
+        matches = ((dashboard.orders, dashboard.units_sold, dashboard.refunds)
+                   == (client["orders"], client["units_sold"], client["refunds"])
+                   and abs(dashboard.revenue - client["revenue"]) < 0.01 * len(dashboard.days))
+        report(f"{orders:,} Orders of one Store over {days} Days", {
+            "SQL Aggregation": results["sql"],
+            "Client Side Aggregation": results["client"],
+            "Rows Shipped to the Client": f"{client['rows']:,}",
+            "Cached Hit (Version Lookup)": results["cached"],
+            "Totals Match": str(matches)
+        })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+    asyncio.run(main(args.orders, args.days))
@@ -0,0 +1,68 @@
+"""
+Peak Memory and Time of the Transaction Export (utils/transaction_export.py), against Loading
+every Transaction and Encoding them in one Response, as GET /transactions/all does.
+
+    python -m benchmarks.transaction_export --transactions 200000
+"""
+from benchmarks.common import report, scratch_database, timed
+from schemas.transaction import Transaction
+from validations.transaction import TransactionResponse
+from utils import transaction_export
+from utils.responses import list_response
+from sqlalchemy import insert
+from sqlalchemy.future import select
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+import argparse
+import asyncio
+import tracemalloc
+
+
+async def _export(export_format: str) -> int:
+    size = 0
+    async for chunk in transaction_export.stream_transactions(export_format):
+        size += len(chunk)
+    return size
+
+
+async def _load_all(session_factory) -> int:
+    async with session_factory() as db:
+        transactions = (await db.execute(select(Transaction))).scalars().all()
+        return len(list_response(TransactionResponse, transactions).body)
+
+
+async def main(transactions: int):
+    async with scratch_database(Transaction.__table__) as session_factory:
+        transaction_export.ReadSessionLocal = session_factory
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        stores = [uuid4() for _ in range(20)]
+        async with session_factory() as db:
+            for chunk in range(0, transactions, 50_000):
+                await db.execute(insert(Transaction), [
+                    {"id": uuid4(), "type": "Sale", "date": start + timedelta(seconds=i),
+                     "operation_id": uuid4(), "request_made_by": uuid4(), "store_id": stores[i % len(stores)]}
+                    for i in range(chunk, min(chunk + 50_000, transactions))
+                ])
+            await db.commit()
+
+        rows = {}
+        for label, run in (("Export NDJSON", lambda: _export("ndjson")),
+                           ("Export CSV", lambda: _export("csv")),
+                           ("Load All", lambda: _load_all(session_factory))):
+            results = {}
+            tracemalloc.start()
+            with timed(label, results):
+                size = await run()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            rows[label] = f"{results[label]:,.2f} s, Peak {peak / 2 ** 20:,.1f} MiB, Body {size / 2 ** 20:,.1f} MiB"
+
+        report(f"{transactions:,} Transactions, Batches of {transaction_export.EXPORT_BATCH_SIZE:,} "
+               f"(Times include the Tracing Overhead)", rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.transactions))
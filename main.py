@@ -8,7 +8,12 @@ sys.path.insert(0, str(Path.joinpath(Path.cwd().absolute(), "/routes/")))
 
 
 from fastapi import FastAPI
-from utils.db import create_database
+from utils.db import create_database, warm_up_pool, dispose_engine
+from utils.auth import password_executor
+from utils.stock_alerts import start_stock_alerts, stop_stock_alerts
+from utils.metrics import MetricsMiddleware, TimedRoute
+from utils.product_search import build_product_index
+from utils.sales_rollup import start_sales_rollup, stop_sales_rollup
 from contextlib import asynccontextmanager
 import uvicorn
 from routes.routes import *
@@ -17,14 +22,24 @@ from routes.routes import *
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Initialize Database
-    create_database()
-    
+    await create_database()
+    await warm_up_pool()
+    await build_product_index()
+    start_stock_alerts()
+    start_sales_rollup()
+
     yield
-    
+
+    await stop_sales_rollup()
+    await stop_stock_alerts()
+    await dispose_engine()
+    password_executor.shutdown(wait=False)
     print("Shutting down")
 
 
 app = FastAPI(lifespan=lifespan)
+app.router.route_class = TimedRoute
+app.add_middleware(MetricsMiddleware)
 
 @app.get('/')
 async def greet():
@@ -80,6 +95,16 @@ app.include_router(stock_removal_router, tags=["Stock Removal Management"])
 ##########################
 app.include_router(transaction_router, tags=["Transaction Management"])
 
+####################
+# Analytics Router
+####################
+app.include_router(analytics_router, tags=["Analytics"])
+
+#####################
+# Monitoring Router
+#####################
+app.include_router(metrics_router, tags=["Monitoring"])
+
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
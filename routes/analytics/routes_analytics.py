@@ -0,0 +1,76 @@
+from fastapi import APIRouter, HTTPException, Depends, status
+from typing import List, Annotated, Optional, Literal
+from uuid import UUID
+from datetime import date, datetime, time, timedelta, timezone
+from validations.analytics import SalesRollupResponse, SalesRollupStatusResponse
+from utils.db import read_db_dependency
+from utils.auth import require_access_level
+from utils.responses import list_response
+from utils.sales_rollup import query_sales, sales_rollup_status
+from dotenv import load_dotenv
+import os
+from utils.metrics import TimedRoute
+
+
+load_dotenv()
+
+# Hourly Reports over long Ranges should use the Daily Rollup.
+ANALYTICS_MAX_HOURLY_DAYS = int(os.environ.get("ANALYTICS_MAX_HOURLY_DAYS", 31))
+
+router = APIRouter(prefix="/analytics", route_class=TimedRoute)
+
+
+@router.get("/sales",
+            response_model=List[SalesRollupResponse],
+            status_code=status.HTTP_200_OK)
+async def get_sales_report(db: read_db_dependency,
+                           current_user: Annotated[dict, Depends(require_access_level(3))],
+                           start_date: date,
+                           end_date: date,
+                           granularity: Literal["hour", "day"] = "day",
+                           store_id: Optional[UUID] = None,
+                           product_id: Optional[UUID] = None,
+                           by_store: bool = False,
+                           by_product: bool = False):
+    """
+    Units, Gross, Discount, Tax and Refunds per Hour or Day (UTC) from the Sales Rollups,
+    for all Stores or one, Optionally Split by Store and / or Product. End Date is Inclusive.
+    """
+    try:
+        if start_date > end_date:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail="start_date must not be after end_date")
+
+        if granularity == "hour" and (end_date - start_date).days >= ANALYTICS_MAX_HOURLY_DAYS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"Hourly Reports are Limited to {ANALYTICS_MAX_HOURLY_DAYS} Days")
+
+        start = datetime.combine(start_date, time.min, tzinfo=timezone.utc)
+        end = datetime.combine(end_date + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        rows = await query_sales(db, granularity, start, end,
+                                 store_id=store_id,
+                                 product_id=product_id,
+                                 by_store=by_store,
+                                 by_product=by_product)
+        return list_response(SalesRollupResponse, rows)
+
+    except HTTPException as e:
+        raise e
+
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Error Fetching Sales Report: {str(e)}")
+
+
+@router.get("/rollup/status",
+            response_model=SalesRollupStatusResponse,
+            status_code=status.HTTP_200_OK)
+async def get_rollup_status(db: read_db_dependency,
+                            current_user: Annotated[dict, Depends(require_access_level(4))]):
+    """Watermark and Counters of the Sales Rollup Job, the Reports Cover Sales up to the Watermark."""
+    try:
+        return await sales_rollup_status(db)
+
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail=f"Error Fetching Rollup Status: {str(e)}")
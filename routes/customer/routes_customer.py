@@ -1,5 +1,5 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List, Annotated
+from fastapi import APIRouter, HTTPException, status, Depends, Response
+from typing import List, Annotated, Optional
 from uuid import UUID
 from sqlalchemy.future import select
 from validations.customer import (
@@ -10,15 +10,18 @@ from validations.customer import (
 )
 from validations.order import OrderResponse
 from validations.refund import RefundResponse
-from utils.db import db_dependency
+from utils.db import db_dependency, read_db_dependency
 from schemas.user import User
 from schemas.customer import Customer
 from schemas.order import Order
 from schemas.refund import Refund
 from utils.auth import require_access_level, user_dependency
+from utils.pagination import fetch_page, NEXT_CURSOR_HEADER
+from utils.responses import list_response
+from utils.metrics import TimedRoute
 
 
-router = APIRouter(prefix="/customers")
+router = APIRouter(prefix="/customers", route_class=TimedRoute)
 
 
 @router.post("/add",
@@ -49,15 +52,19 @@ async def add_customers(customer: CustomerRequest, db: db_dependency,
 @router.get("/all",
             response_model=List[CustomerResponse],
             status_code=status.HTTP_200_OK)
-async def get_customers(db: db_dependency,
+async def get_customers(db: read_db_dependency,
+                        response: Response,
                         current_user: Annotated[dict, Depends(require_access_level(2))],
-                        limit: int = 10, offset: int = 0):
+                        limit: int = 10, offset: int = 0,
+                        cursor: Optional[str] = None):
     """Get All Customers."""
     try:
-        stmt = select(Customer).offset(offset).limit(limit)
-        result = await db.execute(stmt)
-        customers = result.scalars().all()
-        return [CustomerResponse.model_validate(customer) for customer in customers]
+        sort_keys = [(Customer.id, False)]
+        customers, next_cursor = await fetch_page(db, select(Customer), sort_keys, limit, cursor, offset)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+        return list_response(CustomerResponse, customers, response)
 
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
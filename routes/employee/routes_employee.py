@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Response
 from typing import List, Annotated
 from uuid import UUID
 from validations.employee import (
@@ -8,14 +8,17 @@ from validations.employee import (
     EmployeeDeleteRequest,
     EmployeeUserIDUpdateRequest
 )
-from utils.db import db_dependency
+from utils.db import db_dependency, read_db_dependency
 from schemas.employee import Employee
 from utils.auth import require_access_level
+from utils.pagination import fetch_page, NEXT_CURSOR_HEADER
+from utils.responses import list_response
 from schemas.user import User
 from sqlalchemy.future import select
+from utils.metrics import TimedRoute
 
 
-router = APIRouter(prefix="/employees")
+router = APIRouter(prefix="/employees", route_class=TimedRoute)
 
 
 @router.post("/add",
@@ -49,7 +52,7 @@ async def add_employees(employees: List[EmployeeRequest], db: db_dependency,
 @router.get("/get/{employee_id}",
             response_model=EmployeeResponse,
             status_code=status.HTTP_200_OK)
-async def get_employee_by_id(employee_id: UUID, db: db_dependency,
+async def get_employee_by_id(employee_id: UUID, db: read_db_dependency,
                              current_user: Annotated[dict, Depends(require_access_level(3))]):
     """Get Employee details."""
     try:
@@ -74,20 +77,25 @@ async def get_employee_by_id(employee_id: UUID, db: db_dependency,
 @router.get("/all",
             response_model=List[EmployeeResponse],
             status_code=status.HTTP_200_OK)
-async def get_all_employees(db: db_dependency,
+async def get_all_employees(db: read_db_dependency,
+                            response: Response,
                             current_user: Annotated[dict, Depends(require_access_level(3))],
                             limit: int = 10,
-                            offset: int = 0, by_position: str | None = None):
+                            offset: int = 0, by_position: str | None = None,
+                            cursor: str | None = None):
     """Get all Employee details."""
     try:
-        stmt = select(Employee).offset(offset).limit(limit)
+        stmt = select(Employee)
 
         if by_position:
             stmt = stmt.where(Employee.position == by_position)
 
-        result = await db.execute(stmt)
-        employees = result.scalars().all()
-        return [EmployeeResponse.model_validate(emp) for emp in employees]
+        sort_keys = [(Employee.id, False)]
+        employees, next_cursor = await fetch_page(db, stmt, sort_keys, limit, cursor, offset)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+        return list_response(EmployeeResponse, employees, response)
 
     except HTTPException as e:
         raise e
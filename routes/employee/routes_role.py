@@ -6,13 +6,15 @@ from validations.role import (
     RoleResponseWithUsers,
     RoleUpdateRequest,
     RoleDeleteRequest)
-from utils.db import db_dependency
+from utils.db import db_dependency, read_db_dependency
 from schemas.role import Role
 from utils.auth import require_access_level
+from utils.responses import list_response
 from sqlalchemy.future import select
+from utils.metrics import TimedRoute
 
 
-router = APIRouter(prefix="/management")
+router = APIRouter(prefix="/management", route_class=TimedRoute)
 
 
 @router.post("/role/add",
@@ -39,7 +41,7 @@ async def create_role(roles: List[RoleRequest], db: db_dependency,
 @router.get("/role/all",
             response_model=List[RoleResponse | RoleResponseWithUsers],
             status_code=status.HTTP_200_OK)
-async def get_roles(db: db_dependency,
+async def get_roles(db: read_db_dependency,
                     current_user: Annotated[dict, Depends(require_access_level(2))],
                     include_users: bool = True):
     """Get Roles details along with associated Users."""
@@ -48,9 +50,9 @@ async def get_roles(db: db_dependency,
         result = await db.execute(stmt)
         roles = result.scalars().all()
         if include_users:
-            return [RoleResponseWithUsers.model_validate(role) for role in roles]
+            return list_response(RoleResponseWithUsers, roles)
 
-        return [RoleResponse.model_validate(role) for role in roles]
+        return list_response(RoleResponse, roles)
 
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
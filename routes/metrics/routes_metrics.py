@@ -0,0 +1,19 @@
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from utils.metrics import METRICS_ENABLED, TimedRoute, render_metrics
+
+
+router = APIRouter(route_class=TimedRoute)
+
+
+# Scraped by Prometheus, which does not hold a User Token, so the Route is not Authenticated.
+# Set METRICS_ENABLED=false to Disable it (and the Instrumentation) altogether.
+@router.get("/metrics",
+            response_class=PlainTextResponse,
+            include_in_schema=False)
+async def get_metrics():
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail="Metrics are Disabled")
+
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
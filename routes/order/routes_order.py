@@ -1,20 +1,28 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import List, Annotated
+from fastapi import APIRouter, HTTPException, Depends, Response, status
+from typing import List, Annotated, Optional
 from uuid import UUID
 from datetime import datetime, timezone
-from utils.db import db_dependency
+from utils.db import db_dependency, read_db_dependency
 from utils.cart_creator import create_cart_items
+from utils.product_cache import fetch_products
 from schemas.order import Order
-from schemas.product import Product
 from schemas.customer import Customer
-from validations.order import OrderRequest, OrderResponse, OrderUpdateRequest, CartItemUpdateRequest
+from validations.order import (OrderRequest, OrderResponse, OrderUpdateRequest, CartItemUpdateRequest,
+                               BulkOrderRequest, BulkOrderResponse)
 from utils.check_inventory import check_and_remove_inventory, check_and_add_inventory
 from utils.auth import require_access_level, user_dependency
 from utils.create_transaction import add_transaction
+from utils.pagination import fetch_page, NEXT_CURSOR_HEADER
+from utils.loaders import ORDER_LOADERS, ORDER_WITH_CUSTOMER_LOADERS, reload
+from utils.bulk_orders import create_orders_bulk, ORDER_BULK_MAX_SIZE
+from utils.idempotency import idempotency_dependency
+from utils.responses import list_response
 from sqlalchemy.future import select
+from pydantic import ValidationError
+from utils.metrics import TimedRoute
 
 
-router = APIRouter(prefix="/orders")
+router = APIRouter(prefix="/orders", route_class=TimedRoute)
 
 
 @router.post("/add",
@@ -22,8 +30,12 @@ router = APIRouter(prefix="/orders")
              status_code=status.HTTP_201_CREATED)
 async def create_order(order_data: OrderRequest,
                  db: db_dependency,
-                 current_user: user_dependency):
+                 current_user: user_dependency,
+                 idempotency: idempotency_dependency):
     try:
+        if idempotency and idempotency.replay:
+            return idempotency.replay
+
         stmt = select(Customer).where(Customer.id == order_data.customer_id)
         result = await db.execute(stmt)
         customer = result.scalars().first()
@@ -41,45 +53,79 @@ async def create_order(order_data: OrderRequest,
                                 detail="Cannot Place Order with an Empty Cart")
 
         product_ids = [item.product_id for item in order_data.items]
-        stmt = select(Product).where(Product.id.in_(product_ids))
-        result = await db.execute(stmt)
-        products = {p.id: p for p in result.scalars().all()}
+        products = await fetch_products(product_ids, db)
 
         cart_items, total_amount, total_discount, total_tax = create_cart_items(
-            order_data.items, products)
+            order_data.items, products, order_data.store_id)
 
         new_order = Order(
+            store_id=order_data.store_id,
             customer_id=order_data.customer_id,
             order_amount=total_amount,
             discount_amount=total_discount,
             tax=total_tax,
             status=order_data.status,
             date_placed=datetime.now(timezone.utc),
+            date_received=order_data.date_received,
             order_mode=order_data.order_mode,
             items=cart_items
         )
         await check_and_remove_inventory(new_order, order_data.store_id, db)
-        add_transaction(new_order, current_user["id"], db)
-        await db.add(new_order)
+        db.add(new_order)
+        # The ID is Generated on Flush, the Transaction References it.
+        await db.flush()
+        await add_transaction(new_order, current_user["id"], db)
+        new_order = await reload(db, Order, new_order.id, ORDER_LOADERS)
+        response = OrderResponse.model_validate(new_order)
+        if idempotency:
+            await idempotency.save(db, response)
         await db.commit()
-        await db.refresh(new_order)
-        return OrderResponse.model_validate(new_order)
+        return response
 
     except HTTPException as e:
         raise e
 
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"Error Creating Order: {str(e)}")
+
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_406_NOT_ACCEPTABLE,
+                            detail=str(e))
+
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error Fetching Order: {str(e)}")
 
 
+@router.post("/bulk",
+             response_model=BulkOrderResponse,
+             status_code=status.HTTP_200_OK)
+async def create_orders(bulk_data: BulkOrderRequest,
+                        db: db_dependency,
+                        current_user: Annotated[dict, Depends(require_access_level(2))]):
+    try:
+        if len(bulk_data.orders) > ORDER_BULK_MAX_SIZE:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                                detail=f"Cannot Place more than {ORDER_BULK_MAX_SIZE} Orders at once")
+
+        return await create_orders_bulk(bulk_data.orders, current_user, db)
+
+    except HTTPException as e:
+        raise e
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error Placing Orders: {str(e)}")
+
+
 @router.get("/get/{order_id}",
             response_model=OrderResponse,
             status_code=status.HTTP_200_OK)
 async def get_order(order_id: UUID, db: db_dependency,
               current_user: user_dependency):
     try:
-        stmt = select(Order).where(Order.id == order_id)
+        stmt = select(Order).options(*ORDER_LOADERS).where(Order.id == order_id)
         result = await db.execute(stmt)
         order = result.scalars().first()
         
@@ -99,15 +145,19 @@ async def get_order(order_id: UUID, db: db_dependency,
 @router.get("/all",
             response_model=List[OrderResponse],
             status_code=status.HTTP_200_OK)
-async def get_orders(db: db_dependency,
+async def get_orders(db: read_db_dependency,
+                     response: Response,
                      current_user: Annotated[dict, Depends(require_access_level(2))],
                      limit: int = 50,
-                     offset: int = 0):
+                     offset: int = 0,
+                     cursor: Optional[str] = None):
     try:
-        stmt = select(Order).offset(offset).limit(limit)
-        result = await db.execute(stmt)
-        orders = result.scalars().all()
-        return [OrderResponse.model_validate(order) for order in orders]
+        sort_keys = [(Order.date_placed, True), (Order.id, True)]
+        orders, next_cursor = await fetch_page(db, select(Order).options(*ORDER_LOADERS), sort_keys, limit, cursor, offset)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+        return list_response(OrderResponse, orders, response)
 
     except HTTPException as e:
         raise e
@@ -124,7 +174,7 @@ async def update_order(order_id: UUID, new_order_data: OrderUpdateRequest,
                  db: db_dependency, current_user: user_dependency):
     """Status Update for the Order."""
     try:
-        stmt = select(Order).where(Order.id == order_id)
+        stmt = select(Order).options(*ORDER_WITH_CUSTOMER_LOADERS).where(Order.id == order_id)
         result = await db.execute(stmt)
         order = result.scalars().first()
         
@@ -142,7 +192,7 @@ async def update_order(order_id: UUID, new_order_data: OrderUpdateRequest,
             await check_and_add_inventory(order, operation_type="Sale", db=db)
 
         await db.commit()
-        await db.refresh(order)
+        order = await reload(db, Order, order.id, ORDER_LOADERS)
         return OrderResponse.model_validate(order)
 
     except HTTPException as e:
@@ -160,7 +210,7 @@ async def delete_order(order_id: UUID, db: db_dependency,
     """Delete an Order. This End-Point Should be Used Carefully, 
     Otherwise it will result in discrepencies."""
     try:
-        stmt = select(Order).where(Order.id == order_id)
+        stmt = select(Order).options(*ORDER_LOADERS).where(Order.id == order_id)
         result = await db.execute(stmt)
         order = result.scalars().first()
 
@@ -189,7 +239,7 @@ async def update_cart_items(order_id: UUID,
                       current_user: Annotated[dict, Depends(require_access_level(4))]):
     """Update Cart Items of an Order, Usage is highly Discouraged."""
     try:
-        stmt = select(Order).where(Order.id == order_id)
+        stmt = select(Order).options(*ORDER_LOADERS).where(Order.id == order_id)
         result = await db.execute(stmt)
         order = result.scalars().first()
 
@@ -216,11 +266,9 @@ async def update_cart_items(order_id: UUID,
             if item_update.discount is not None:
                 cart_item.discount = item_update.discount
         
-        stmt = select(Product.id, Product.price, Product.discount).where(Product.id.in_(cart_items_dict))
-        results = await db.execute(stmt)
-        products = {p.id: p for p in results}
+        products = await fetch_products(cart_items_dict, db)
         cart_items, total_amount, total_discount, total_tax = create_cart_items(
-            cart_items_dict.values(), products)
+            cart_items_dict.values(), products, order.store_id)
 
         order.order_amount = total_amount
         order.discount_amount = total_discount
@@ -228,7 +276,7 @@ async def update_cart_items(order_id: UUID,
         order.items = cart_items
 
         await db.commit()
-        await db.refresh(order)
+        order = await reload(db, Order, order.id, ORDER_LOADERS)
 
         return OrderResponse.model_validate(order)
 
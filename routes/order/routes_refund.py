@@ -1,7 +1,7 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List, Annotated
+from fastapi import APIRouter, HTTPException, status, Depends, Response
+from typing import List, Annotated, Optional
 from uuid import UUID
-from utils.db import db_dependency
+from utils.db import db_dependency, read_db_dependency
 from schemas.order import Order
 from schemas.refund import Refund, RefundItems
 from validations.refund import (
@@ -13,10 +13,16 @@ from validations.refund import (
 from utils.check_inventory import check_and_add_inventory
 from utils.auth import user_dependency, require_access_level
 from utils.create_transaction import add_transaction
+from utils.pagination import fetch_page, NEXT_CURSOR_HEADER
+from utils.loaders import ORDER_LOADERS, REFUND_LOADERS, REFUND_WITH_ORDER_LOADERS, reload
+from utils.idempotency import idempotency_dependency
+from utils.responses import list_response
 from sqlalchemy.future import select
+from pydantic import ValidationError
+from utils.metrics import TimedRoute
 
 
-router = APIRouter(prefix="/refunds")
+router = APIRouter(prefix="/refunds", route_class=TimedRoute)
 
 
 @router.post("/add",
@@ -24,9 +30,13 @@ router = APIRouter(prefix="/refunds")
              status_code=status.HTTP_201_CREATED)
 async def create_refund(refund_data: RefundRequest,
                   db: db_dependency,
-                  current_user: user_dependency):
+                  current_user: user_dependency,
+                  idempotency: idempotency_dependency):
     try:
-        stmt = select(Order).filter(Order.id == refund_data.order_id)
+        if idempotency and idempotency.replay:
+            return idempotency.replay
+
+        stmt = select(Order).options(*ORDER_LOADERS).filter(Order.id == refund_data.order_id)
         result = await db.execute(stmt)
         order = result.scalar_one_or_none()
         if not order:
@@ -43,6 +53,7 @@ async def create_refund(refund_data: RefundRequest,
             status=refund_data.status,
             application_date=refund_data.application_date,
             order_id=refund_data.order_id,
+            store_id=order.store_id,
             items=refund_items
         )
 
@@ -50,6 +61,9 @@ async def create_refund(refund_data: RefundRequest,
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
                                 detail="Only Internal Users are allowed to have refund application status other than Pending")
 
+        db.add(new_refund)
+        # The Response is Built before the Commit, the Refund's ID is Generated on Flush.
+        await db.flush()
         if refund_data.status == "Refunded":
             order.status = "Refunded"
             await check_and_add_inventory(new_refund, operation_type="Sale", db=db)
@@ -58,15 +72,21 @@ async def create_refund(refund_data: RefundRequest,
         else:
             order.status = "For Refund"
 
-        await db.add(new_refund)
+        new_refund = await reload(db, Refund, new_refund.id, REFUND_LOADERS)
+        response = RefundResponse.model_validate(new_refund)
+        if idempotency:
+            await idempotency.save(db, response)
         await db.commit()
-        await db.refresh(new_refund)
 
-        return RefundResponse.model_validate(new_refund)
+        return response
 
     except HTTPException as e:
         raise e
 
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"Error Creating Refund Application: {str(e)}")
+
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_406_NOT_ACCEPTABLE,
                             detail=str(e))
@@ -83,7 +103,7 @@ async def get_refund(refund_id: UUID,
                db: db_dependency,
                current_user: user_dependency):
     try:
-        stmt = select(Refund).filter(Refund.id == refund_id)
+        stmt = select(Refund).options(*REFUND_WITH_ORDER_LOADERS).filter(Refund.id == refund_id)
         result = await db.execute(stmt)
         refund = result.scalar_one_or_none()
         
@@ -108,15 +128,19 @@ async def get_refund(refund_id: UUID,
 @router.get("/all",
             response_model=List[RefundResponse],
             status_code=status.HTTP_200_OK)
-async def get_all_refunds(db: db_dependency,
+async def get_all_refunds(db: read_db_dependency,
+                    response: Response,
                     current_user: Annotated[dict, Depends(require_access_level(3))],
                     limit: int = 100,
-                    offset: int = 0):
+                    offset: int = 0,
+                    cursor: Optional[str] = None):
     try:
-        stmt = select(Refund).order_by(Refund.application_date.desc()).offset(offset).limit(limit)
-        result = await db.execute(stmt)
-        refunds = result.scalars().all()
-        return [RefundResponse.model_validate(refund) for refund in refunds]
+        sort_keys = [(Refund.application_date, True), (Refund.id, True)]
+        refunds, next_cursor = await fetch_page(db, select(Refund).options(*REFUND_LOADERS), sort_keys, limit, cursor, offset)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+        return list_response(RefundResponse, refunds, response)
 
     except HTTPException as e:
         raise e
@@ -134,7 +158,7 @@ async def update_refund(refund_id: UUID,
                   db: db_dependency,
                   current_user: user_dependency):
     try:
-        stmt = select(Refund).filter(Refund.id == refund_id)
+        stmt = select(Refund).options(*REFUND_WITH_ORDER_LOADERS).filter(Refund.id == refund_id)
         result = await db.execute(stmt)
         refund = result.scalar_one_or_none()
         if not refund:
@@ -162,7 +186,7 @@ async def update_refund(refund_id: UUID,
             await check_and_add_inventory(refund, operation_type="Sale", db=db)
 
         await db.commit()
-        await db.refresh(refund)
+        refund = await reload(db, Refund, refund.id, REFUND_LOADERS)
         return RefundResponse.model_validate(refund)
 
     except HTTPException as e:
@@ -1,25 +1,30 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Response, status
 from typing import List, Annotated
-from utils.db import db_dependency
+from utils.db import db_dependency, read_db_dependency
 from schemas.product import Category
 from validations.product import CategoryRequest, CategoryResponse, CategoryResponseWithProducts
 from utils.auth import require_access_level
+from utils.responses import list_response
+from utils.etag import conditional_get, bump_versions
 from sqlalchemy.future import select
+from utils.metrics import TimedRoute
 
 
-router = APIRouter(prefix="/categories")
+router = APIRouter(prefix="/categories", route_class=TimedRoute)
 
 
 @router.get("/all",
             response_model=List[CategoryResponseWithProducts],
             status_code=status.HTTP_200_OK)
-async def get_categories(db: db_dependency):
+async def get_categories(db: read_db_dependency,
+                         response: Response,
+                         etag: Annotated[str, Depends(conditional_get("categories"))]):
     """Retrieve all Categories."""
     try:
         stmt = select(Category)
         result = await db.execute(stmt)
         categories = result.scalars().all()
-        return [CategoryResponseWithProducts.model_validate(category) for category in categories]
+        return list_response(CategoryResponseWithProducts, categories, response)
 
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -37,8 +42,9 @@ async def add_categories(categories: List[CategoryRequest], db: db_dependency,
         for cat in categories:
             new_category = Category(**cat.model_dump())
             new_categories.append(new_category)
-            await db.add(new_category)
+            db.add(new_category)
         
+        await bump_versions(db, "categories")
         await db.commit()
         response = []
         for category in new_categories:
@@ -58,7 +64,7 @@ async def add_categories(categories: List[CategoryRequest], db: db_dependency,
 @router.get("/get/{id}",
             response_model=CategoryResponseWithProducts,
             status_code=status.HTTP_200_OK)
-async def get_category(id: int, db: db_dependency):
+async def get_category(id: int, db: read_db_dependency):
     """Retrieve a Category by ID."""
     try:
         stmt = select(Category).where(Category.id == id)
@@ -91,6 +97,7 @@ async def delete_category(id: int, db: db_dependency,
 
         if category:
             await db.delete(category)
+            await bump_versions(db, "categories")
             await db.commit()
             return
 
@@ -118,6 +125,7 @@ async def update_category(id: int, updated_data: CategoryRequest, db: db_depende
 
         if category:
             category.category = updated_data.category
+            await bump_versions(db, "categories")
             await db.commit()
             await db.refresh(category)
             return CategoryResponse.model_validate(category)
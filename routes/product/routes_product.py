@@ -1,14 +1,31 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import List, Annotated
-from validations.product import ProductRequest, ProductResponse, ProductUpdateRequest, ProductResponseWithCategory
-from utils.db import db_dependency
+from fastapi import APIRouter, HTTPException, Depends, Response, status, UploadFile, File
+from typing import List, Annotated, Optional, Literal
+from validations.product import (
+    ProductRequest,
+    ProductResponse,
+    ProductUpdateRequest,
+    ProductResponseWithCategory,
+    ProductImportResponse,
+    ProductFilterParams
+)
+from utils.db import db_dependency, read_db_dependency
 from schemas.product import Product
 from uuid import UUID
 from utils.auth import require_access_level
+from utils.product_cache import product_cache, invalidate_products
+from utils.product_import import import_products
+from utils.inventory_summary import apply_price_change
+from utils.responses import list_response
+from utils.etag import conditional_get, bump_versions
+from utils.product_search import search_products, index_products, unindex_products
+from utils.loaders import PRODUCT_LOADERS
+from utils.filters import apply_filters, parse_sort, PRODUCT_FILTERS, PRODUCT_SORTS
+from utils.pagination import fetch_page, sort_order, NEXT_CURSOR_HEADER
 from sqlalchemy.future import select
+from utils.metrics import TimedRoute
 
 
-router = APIRouter(prefix="/products")
+router = APIRouter(prefix="/products", route_class=TimedRoute)
 
 
 @router.post("/add",
@@ -23,15 +40,19 @@ async def add_products(products: List[ProductRequest],
         for product in products:
             new_product = Product(**product.model_dump())
             new_products.append(new_product)
-            await db.add(new_product)
-            
+            db.add(new_product)
+
+        await bump_versions(db, "products")
         await db.commit()
-        
+        invalidate_products(product.id for product in new_products)
+
         response = []
         for product in new_products:
-            db.refresh(product)
+            await db.refresh(product)
             response.append(ProductResponse.model_validate(product))
-        
+
+        index_products(new_products)
+
         return response
 
     except HTTPException as e:
@@ -42,15 +63,64 @@ async def add_products(products: List[ProductRequest],
                             detail=f"Error Adding Products: {str(e)}")
 
 
+@router.post("/import",
+             response_model=ProductImportResponse,
+             status_code=status.HTTP_201_CREATED)
+async def import_product_catalog(db: db_dependency,
+                                 current_user: Annotated[dict, Depends(require_access_level(3))],
+                                 file: UploadFile = File(..., description="CSV (with Header) or NDJSON File"),
+                                 import_format: Optional[Literal["csv", "ndjson"]] = None):
+    """Bulk Import Products from a CSV or NDJSON File, Invalid Rows are Reported and Skipped."""
+    try:
+        if import_format is None:
+            filename = (file.filename or "").lower()
+            if filename.endswith(".csv") or file.content_type == "text/csv":
+                import_format = "csv"
+            elif filename.endswith((".ndjson", ".jsonl")) or file.content_type == "application/x-ndjson":
+                import_format = "ndjson"
+            else:
+                raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                                    detail="Cannot Infer the Import Format, Use import_format=csv|ndjson")
+
+        return await import_products(file, import_format, db)
+
+    except HTTPException as e:
+        raise e
+
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Error Importing Products: {str(e)}")
+
+
+async def _list_products(db, stmt, filters: ProductFilterParams, response: Response,
+                         limit: Optional[int], cursor: Optional[str]):
+    """Filtered and Sorted Product List, Paginated by Cursor only when a Limit is Given."""
+    stmt = apply_filters(stmt.options(*PRODUCT_LOADERS), filters, PRODUCT_FILTERS)
+    sort_keys = parse_sort(filters.sort, PRODUCT_SORTS, Product.id)
+
+    if limit is None:
+        result = await db.execute(stmt.order_by(*sort_order(sort_keys)))
+        products = result.scalars().all()
+    else:
+        products, next_cursor = await fetch_page(db, stmt, sort_keys, limit, cursor)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return list_response(ProductResponseWithCategory, products, response)
+
+
 @router.get("/all/active",
             response_model=List[ProductResponseWithCategory],
             status_code=status.HTTP_200_OK)
-async def get_active_products(db: db_dependency):
+async def get_active_products(db: read_db_dependency,
+                              response: Response,
+                              etag: Annotated[str, Depends(conditional_get("products"))],
+                              filters: Annotated[ProductFilterParams, Depends()],
+                              limit: Optional[int] = None,
+                              cursor: Optional[str] = None):
     try:
         stmt = select(Product).where(Product.is_removed == False)
-        result = await db.execute(stmt)
-        products = result.scalars().all()
-        return [ProductResponseWithCategory.model_validate(product) for product in products]
+        return await _list_products(db, stmt, filters, response, limit, cursor)
 
     except HTTPException as e:
         raise e
@@ -63,13 +133,15 @@ async def get_active_products(db: db_dependency):
 @router.get("/all",
             response_model=List[ProductResponseWithCategory],
             status_code=status.HTTP_200_OK)
-async def get_products(db: db_dependency):
-    """Get All Products (Active + Removed)."""
+async def get_products(db: read_db_dependency,
+                       response: Response,
+                       etag: Annotated[str, Depends(conditional_get("products"))],
+                       filters: Annotated[ProductFilterParams, Depends()],
+                       limit: Optional[int] = None,
+                       cursor: Optional[str] = None):
+    """Get All Products (Active + Removed), Filtered and Sorted by the Query Parameters."""
     try:
-        stmt = select(Product)
-        result = await db.execute(stmt)
-        products = result.scalars().all()
-        return [ProductResponseWithCategory.model_validate(product) for product in products]
+        return await _list_products(db, select(Product), filters, response, limit, cursor)
 
     except HTTPException as e:
         raise e
@@ -79,10 +151,40 @@ async def get_products(db: db_dependency):
                             detail=f"Error Fetching Products: {str(e)}")
 
 
+@router.get("/search",
+            response_model=List[ProductResponseWithCategory],
+            status_code=status.HTTP_200_OK)
+async def search_product_catalog(q: str,
+                                 db: read_db_dependency,
+                                 category_id: Optional[int] = None,
+                                 include_removed: bool = False,
+                                 limit: int = 20):
+    """Search Products by Name and Description, the Last Word is Matched as a Prefix (Autocomplete)."""
+    try:
+        product_ids = await search_products(db, q, category_id, include_removed, limit)
+        if not product_ids:
+            return list_response(ProductResponseWithCategory, [])
+
+        stmt = select(Product).options(*PRODUCT_LOADERS).where(Product.id.in_(product_ids))
+        result = await db.execute(stmt)
+        products = {product.id: product for product in result.scalars().all()}
+
+        # Keep the Search Ranking, Products Deleted since the Index was Updated are Skipped.
+        ranked = [products[product_id] for product_id in product_ids if product_id in products]
+        return list_response(ProductResponseWithCategory, ranked)
+
+    except HTTPException as e:
+        raise e
+
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Error Searching Products: {str(e)}")
+
+
 @router.get("/get/{product_id}",
             response_model=ProductResponse,
             status_code=status.HTTP_200_OK)
-async def get_product(product_id: UUID, db: db_dependency):
+async def get_product(product_id: UUID, db: read_db_dependency):
     try:
         stmt = select(Product).where(Product.id == product_id, Product.is_removed == False)
         result = await db.execute(stmt)
@@ -118,11 +220,16 @@ async def update_product(product_id: UUID,
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                                 detail="Product Not Found")
 
+        old_price = product_to_update.price
         for field, value in update_data.model_dump(exclude_unset=True).items():
             setattr(product_to_update, field, value)
 
+        await apply_price_change(db, product_id, old_price, product_to_update.price)
+        await bump_versions(db, "products")
         await db.commit()
+        invalidate_products([product_id])
         await db.refresh(product_to_update)
+        index_products([product_to_update])
         return ProductResponse.model_validate(product_to_update)
 
     except HTTPException as e:
@@ -145,7 +252,10 @@ async def delete_product(product_id: UUID,
         
         if product:
             await db.delete(product)
+            await bump_versions(db, "products")
             await db.commit()
+            invalidate_products([product_id])
+            unindex_products([product_id])
             return
 
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
@@ -157,3 +267,10 @@ async def delete_product(product_id: UUID,
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail=f"Error Deleting Product: {str(e)}")
+
+
+@router.get("/cache/stats",
+            status_code=status.HTTP_200_OK)
+async def get_product_cache_stats(current_user: Annotated[dict, Depends(require_access_level(4))]):
+    """Hit/Miss Counters of the In-Process Product Catalog Cache."""
+    return product_cache.stats()
@@ -12,4 +12,6 @@ from .store.routes_location import router as location_router
 from .store.routes_restock import router as restock_router
 from .store.routes_stock_removal import router as stock_removal_router
 from .store.routes_store import router as store_router
-from .store.routes_transaction import router as transaction_router
\ No newline at end of file
+from .store.routes_transaction import router as transaction_router
+from .metrics.routes_metrics import router as metrics_router
+from .analytics.routes_analytics import router as analytics_router
@@ -1,39 +1,59 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import List, Annotated
+from fastapi import APIRouter, HTTPException, Depends, Response, status
+from typing import List, Annotated, Optional
 from validations.inventory import (
     InventoryResponse,
     InventoryResponseWithProduct,
     InventoryRequest,
-    InventoryUpdateRequest
+    InventoryUpdateRequest,
+    StoreInventorySummaryResponse,
+    InventoryFilterParams
 )
-from utils.db import db_dependency
-from schemas.inventory import Inventory
+from utils.db import db_dependency, read_db_dependency
+from schemas.inventory import Inventory, StoreInventorySummary
 from uuid import UUID
 from utils.auth import require_access_level
+from utils.pagination import fetch_page, NEXT_CURSOR_HEADER
+from utils.loaders import INVENTORY_PRODUCT_LOADERS
+from utils.filters import apply_filters, parse_sort, INVENTORY_FILTERS, INVENTORY_SORTS
+from utils.inventory_summary import apply_inventory_changes, rebuild_inventory_summary
+from utils.stock_alerts import stock_alert_stats
+from utils.responses import list_response
 from sqlalchemy.future import select
+from utils.metrics import TimedRoute
 
 
-router = APIRouter(prefix="/inventory")
+router = APIRouter(prefix="/inventory", route_class=TimedRoute)
 
 
 @router.get("/all",
-            response_model=List[InventoryResponse],
+            response_model=List[InventoryResponse | InventoryResponseWithProduct],
             status_code=status.HTTP_200_OK)
-async def get_all_inventory(db: db_dependency,
+async def get_all_inventory(db: read_db_dependency,
+                            response: Response,
+                            filters: Annotated[InventoryFilterParams, Depends()],
                             product_details: bool = False,
                             offset: int = 0,
-                            limit: int = 100):
-    """Retrieve all Inventory."""
+                            limit: int = 100,
+                            cursor: Optional[str] = None):
+    """Retrieve all Inventory, Filtered and Sorted by the Query Parameters."""
     try:
-        stmt = select(Inventory).offset(offset).limit(limit)
-        result = await db.execute(stmt)
-        complete_inventory = result.scalars().all()
-        
+        sort_keys = parse_sort(filters.sort, INVENTORY_SORTS, Inventory.id)
+        stmt = apply_filters(select(Inventory), filters, INVENTORY_FILTERS)
+        if product_details:
+            stmt = stmt.options(*INVENTORY_PRODUCT_LOADERS)
+
+        complete_inventory, next_cursor = await fetch_page(db, stmt, sort_keys,
+                                                           limit, cursor, offset)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
         if product_details:
-            return [InventoryResponseWithProduct.model_validate(inventory)
-                    for inventory in complete_inventory]
+            return list_response(InventoryResponseWithProduct, complete_inventory, response)
 
-        return [InventoryResponse.model_validate(inventory) for inventory in complete_inventory]
+        return list_response(InventoryResponse, complete_inventory, response)
+
+    except HTTPException as e:
+        raise e
 
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -41,15 +61,18 @@ async def get_all_inventory(db: db_dependency,
 
 
 @router.get("/get/{store_id}",
-            response_model=List[InventoryResponse],
+            response_model=List[InventoryResponse | InventoryResponseWithProduct],
             status_code=status.HTTP_200_OK)
-async def get_inventory_by_store(store_id: UUID, db: db_dependency,
+async def get_inventory_by_store(store_id: UUID, db: read_db_dependency,
                                  product_details: bool = False,
                                  offset: int = 0,
                                  limit: int = 100):
     """Retrieve Inventory for a specific Store."""
     try:
         stmt = select(Inventory).where(Inventory.store_id == store_id).offset(offset).limit(limit)
+        if product_details:
+            stmt = stmt.options(*INVENTORY_PRODUCT_LOADERS)
+
         result = await db.execute(stmt)
         complete_inventory = result.scalars().all()
 
@@ -58,10 +81,9 @@ async def get_inventory_by_store(store_id: UUID, db: db_dependency,
                                 detail="Inventory Not Found.")
 
         if product_details:
-            return [InventoryResponseWithProduct.model_validate(inventory)
-                    for inventory in complete_inventory]
+            return list_response(InventoryResponseWithProduct, complete_inventory)
 
-        return [InventoryResponse.model_validate(inventory) for inventory in complete_inventory]
+        return list_response(InventoryResponse, complete_inventory)
 
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -81,6 +103,9 @@ async def add_inventory(inventory: InventoryRequest, db: db_dependency,
 
         new_inventory = Inventory(**inventory.model_dump())
         db.add(new_inventory)
+        await apply_inventory_changes(db, new_inventory.store_id,
+                                      {new_inventory.product_id: (None, new_inventory.quantity)},
+                                      {new_inventory.product_id: (None, new_inventory.reorder_threshold)})
         await db.commit()
         await db.refresh(new_inventory)
 
@@ -100,6 +125,7 @@ async def add_inventory(inventory: InventoryRequest, db: db_dependency,
 async def modify_inventory(store_id: UUID,
                            update_data: List[InventoryUpdateRequest],
                            db: db_dependency,
+                           response: Response,
                            current_user: Annotated[dict, Depends(require_access_level(3))]):
     """Update Inventory for a Specific Store."""
     try:
@@ -117,6 +143,8 @@ async def modify_inventory(store_id: UUID,
 
         inventory_map = {record.product_id: record for record in inventory_records}
         updated_items = []
+        changes = {}
+        thresholds = {}
 
         for update in update_data:
             inventory = inventory_map.get(update.product_id)
@@ -126,15 +154,24 @@ async def modify_inventory(store_id: UUID,
                                     detail=f"Inventory Not Found for Product ID: {update.product_id}")
 
             if update.quantity is not None:
+                old_quantity = changes.get(update.product_id, (inventory.quantity,))[0]
+                changes[update.product_id] = (old_quantity, update.quantity)
                 inventory.quantity = update.quantity
 
             if update.max_discount_amount is not None:
                 inventory.max_discount_amount = update.max_discount_amount
 
+            if update.reorder_threshold is not None:
+                old_threshold = thresholds.get(update.product_id, (inventory.reorder_threshold,))[0]
+                thresholds[update.product_id] = (old_threshold, update.reorder_threshold)
+                changes.setdefault(update.product_id, (inventory.quantity, inventory.quantity))
+                inventory.reorder_threshold = update.reorder_threshold
+
             updated_items.append(inventory)
 
+        await apply_inventory_changes(db, store_id, changes, thresholds)
         await db.commit()
-        return [InventoryResponse.model_validate(item) for item in updated_items]
+        return list_response(InventoryResponse, updated_items, response)
 
     except HTTPException as e:
         raise e
@@ -158,8 +195,11 @@ async def delete_inventory_by_store(store_id: UUID,
                                        Inventory.product_id.in_(product_ids))
         result = await db.execute(stmt)
         inventory_records = result.scalars().all()
-        await db.execute(stmt)
-        await db.delete(inventory_records)
+        for record in inventory_records:
+            await db.delete(record)
+
+        await apply_inventory_changes(db, store_id,
+                                      {record.product_id: (record.quantity, None) for record in inventory_records})
         await db.commit()
 
         return
@@ -172,5 +212,57 @@ async def delete_inventory_by_store(store_id: UUID,
                             detail=f"Error Deleting Records: {str(e)}")
 
 
+@router.get("/summary/{store_id}",
+            response_model=StoreInventorySummaryResponse,
+            status_code=status.HTTP_200_OK)
+async def get_inventory_summary(store_id: UUID, db: read_db_dependency,
+                                current_user: Annotated[dict, Depends(require_access_level(2))]):
+    """Retrieve the Inventory Totals of a Store, Maintained along with every Inventory Change."""
+    try:
+        stmt = select(StoreInventorySummary).where(StoreInventorySummary.store_id == store_id)
+        result = await db.execute(stmt)
+        summary = result.scalar_one_or_none()
+
+        # A Store without any Inventory has no Summary Row yet.
+        if summary is None:
+            return StoreInventorySummaryResponse(store_id=store_id)
+
+        return StoreInventorySummaryResponse.model_validate(summary)
+
+    except HTTPException as e:
+        raise e
+
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail=f"Error Fetching Inventory Summary: {str(e)}")
+
+
+@router.post("/summary/reconcile",
+             response_model=List[StoreInventorySummaryResponse],
+             status_code=status.HTTP_200_OK)
+async def reconcile_inventory_summary(db: db_dependency,
+                                      current_user: Annotated[dict, Depends(require_access_level(4))],
+                                      store_id: Optional[UUID] = None):
+    """Rebuild the Inventory Summaries (of a Store or of all Stores) from the Inventory Records."""
+    try:
+        summaries = await rebuild_inventory_summary(db, store_id)
+        await db.commit()
+        return [StoreInventorySummaryResponse.model_validate(summary) for summary in summaries]
+
+    except HTTPException as e:
+        raise e
+
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail=f"Error Reconciling Inventory Summary: {str(e)}")
+
+
+@router.get("/alerts/stats",
+            status_code=status.HTTP_200_OK)
+async def get_stock_alert_stats(current_user: Annotated[dict, Depends(require_access_level(4))]):
+    """Low Stock Alert Engine Statistics, including the Commit to Alert Latency."""
+    return stock_alert_stats()
+
+
 # Note: Direct modifications to inventory via this API are discouraged.
 # Please use Stock Removal or Restock APIs to ensure proper auditing.
@@ -1,14 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Response, status
 from typing import List, Annotated
 from schemas.store import Location
 from validations.location import LocationRequest, LocationResponse, LocationResponseWithStores
-from utils.db import db_dependency
+from utils.db import db_dependency, read_db_dependency
 from utils.auth import require_access_level
+from utils.responses import list_response
+from utils.etag import conditional_get, bump_versions
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
+from utils.metrics import TimedRoute
 
 
-router = APIRouter(prefix="/locations")
+router = APIRouter(prefix="/locations", route_class=TimedRoute)
 
 
 @router.post("/add",
@@ -19,6 +22,7 @@ async def add_location(location: LocationRequest, db: db_dependency,
     try:
         new_location = Location(**location.model_dump())
         db.add(new_location)
+        await bump_versions(db, "locations")
         await db.commit()
         await db.refresh(new_location)
         return LocationResponse.model_validate(new_location)
@@ -38,14 +42,16 @@ async def add_location(location: LocationRequest, db: db_dependency,
 @router.get("/all",
             response_model=List[LocationResponseWithStores],
             status_code=status.HTTP_200_OK)
-async def get_locations(db: db_dependency,
+async def get_locations(db: read_db_dependency,
+                        response: Response,
+                        etag: Annotated[str, Depends(conditional_get("locations"))],
                         limit: int = 50,
                         offset: int = 0):
     try:
         stmt = select(Location).offset(offset).limit(limit)
         result = await db.execute(stmt)
         locations = result.scalars().all()
-        return [LocationResponseWithStores.model_validate(location) for location in locations]
+        return list_response(LocationResponseWithStores, locations, response)
 
     except HTTPException as e:
         raise e
@@ -58,7 +64,7 @@ async def get_locations(db: db_dependency,
 @router.get("/get/{id}",
             response_model=LocationResponseWithStores,
             status_code=status.HTTP_200_OK)
-async def get_location(id: int, db: db_dependency):
+async def get_location(id: int, db: read_db_dependency):
     try:
         stmt = select(Location).where(Location.id == id)
         result = await db.execute()
@@ -87,6 +93,7 @@ async def delete_location(id: int, db: db_dependency,
         location = result.scalar_one_or_none()
         if location:
             await db.delete(location)
+            await bump_versions(db, "locations")
             await db.commit()
             return
 
@@ -123,6 +130,7 @@ async def update_location(id: int, location: LocationRequest, db: db_dependency)
         if location.address:
             location_to_update.address = location.address
 
+        await bump_versions(db, "locations")
         await db.commit()
         await db.refresh(location_to_update)
         return LocationResponse.model_validate(location_to_update)
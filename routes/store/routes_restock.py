@@ -1,17 +1,22 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Response, status
 from typing import List, Annotated, Optional
 from uuid import UUID
 from datetime import date
-from utils.db import db_dependency
+from utils.db import db_dependency, read_db_dependency
 from validations.restock import RestockRequest, RestockResponse, RestockUpdateRequest
 from schemas.restock import Restock
 from utils.stock_restore import restore_inventory
 from utils.auth import require_access_level
 from utils.create_transaction import add_transaction
 from utils.restock_creator import create_restock_items, add_restock_items_to_inventory
+from utils.pagination import fetch_page, NEXT_CURSOR_HEADER
+from utils.loaders import RESTOCK_LOADERS, reload
+from utils.idempotency import idempotency_dependency
+from utils.responses import list_response
 from sqlalchemy.future import select
+from utils.metrics import TimedRoute
 
-router = APIRouter(prefix="/restocks")
+router = APIRouter(prefix="/restocks", route_class=TimedRoute)
 
 
 @router.post("/add",
@@ -19,10 +24,13 @@ router = APIRouter(prefix="/restocks")
              status_code=status.HTTP_201_CREATED)
 async def create_restock(restock_data: RestockRequest,
                    db: db_dependency,
-                   current_user: Annotated[dict, Depends(require_access_level(3))]):
+                   current_user: Annotated[dict, Depends(require_access_level(3))],
+                   idempotency: idempotency_dependency):
     try:
+        if idempotency and idempotency.replay:
+            return idempotency.replay
 
-        restock_items = create_restock_items(restock_data, db)
+        restock_items = await create_restock_items(restock_data, db)
         new_restock = Restock(
             store_id=restock_data.store_id,
             status=restock_data.status,
@@ -30,11 +38,15 @@ async def create_restock(restock_data: RestockRequest,
             date_received=restock_data.date_received,
             items=restock_items)
 
+        db.add(new_restock)
+        await db.flush()
         await add_transaction(new_restock, current_user["id"], db)
-        await db.add(new_restock)
+        new_restock = await reload(db, Restock, new_restock.id, RESTOCK_LOADERS)
+        response = RestockResponse.model_validate(new_restock)
+        if idempotency:
+            await idempotency.save(db, response)
         await db.commit()
-        await db.refresh(new_restock)
-        return RestockResponse.model_validate(new_restock)
+        return response
 
 
     except HTTPException as e:
@@ -49,10 +61,10 @@ async def create_restock(restock_data: RestockRequest,
             response_model=RestockResponse,
             status_code=status.HTTP_200_OK)
 async def get_restock(restock_id: UUID,
-                db: db_dependency,
+                db: read_db_dependency,
                 current_user: Annotated[dict, Depends(require_access_level(2))]):
     try:
-        stmt = select(Restock).where(Restock.id == restock_id)
+        stmt = select(Restock).options(*RESTOCK_LOADERS).where(Restock.id == restock_id)
         result = await db.execute(stmt)
         restock = result.scalar_one_or_none()
         if not restock:
@@ -71,7 +83,7 @@ async def get_restock(restock_id: UUID,
 @router.get("/filter",
             response_model=List[RestockResponse],
             status_code=status.HTTP_200_OK)
-async def get_filtered_restocks(db: db_dependency,
+async def get_filtered_restocks(db: read_db_dependency,
                           current_user: Annotated[dict, Depends(require_access_level(2))],
                           store_id: Optional[UUID] = None,
                           status: Optional[str] = None,
@@ -80,13 +92,14 @@ async def get_filtered_restocks(db: db_dependency,
                           limit: int = 50,
                           offset: int = 0):
     try:
-        stmt = select(Restock)
+        stmt = select(Restock).options(*RESTOCK_LOADERS)
 
         if store_id:
             stmt = stmt.where(Restock.store_id == store_id)
             
         if status:
-            stmt = stmt.where(Restock.status.ilike(status))
+            # Statuses are Stored Capitalized, an Equality keeps the Index usable unlike ILIKE.
+            stmt = stmt.where(Restock.status == status.capitalize())
             
         if date_placed:
             stmt = stmt.where(Restock.date_placed == date_placed)
@@ -96,7 +109,7 @@ async def get_filtered_restocks(db: db_dependency,
         
         result = await db.execute(stmt)
         restocks = result.scalars().all()
-        return [RestockResponse.model_validate(r) for r in restocks]
+        return list_response(RestockResponse, restocks)
 
     except HTTPException as e:
         raise e
@@ -109,15 +122,19 @@ async def get_filtered_restocks(db: db_dependency,
 @router.get("/all",
             response_model=List[RestockResponse],
             status_code=status.HTTP_200_OK)
-async def get_restocks(db: db_dependency,
+async def get_restocks(db: read_db_dependency,
+                 response: Response,
                  current_user: Annotated[dict, Depends(require_access_level(2))],
                  limit: int = 10,
-                 offset: int = 0):
+                 offset: int = 0,
+                 cursor: Optional[str] = None):
     try:
-        stmt = select(Restock).offset(offset).limit(limit)
-        result = await db.execute(stmt)
-        restocks = result.scalars().all()
-        return [RestockResponse.model_validate(r) for r in restocks]
+        sort_keys = [(Restock.date_placed, True), (Restock.id, True)]
+        restocks, next_cursor = await fetch_page(db, select(Restock).options(*RESTOCK_LOADERS), sort_keys, limit, cursor, offset)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+        return list_response(RestockResponse, restocks, response)
 
     except HTTPException as e:
         raise e
@@ -135,7 +152,7 @@ async def update_restock(restock_id: UUID,
                    db: db_dependency,
                    current_user: Annotated[dict, Depends(require_access_level(2))]):
     try:
-        stmt = select(Restock).where(Restock.id == restock_id)
+        stmt = select(Restock).options(*RESTOCK_LOADERS).where(Restock.id == restock_id)
         result = await db.execute(stmt)
         restock = result.scalar_one_or_none()
 
@@ -149,14 +166,14 @@ async def update_restock(restock_id: UUID,
             restock.date_received = new_data.date_received
 
         if new_data.status == "Cancelled":
-            products = {p.id: p.restock_quantity for p in restock.items}
-            await restore_inventory(db, products, add_stock=False)
+            products = {p.product_id: p.restock_quantity for p in restock.items}
+            await restore_inventory(db, restock.store_id, products, add_stock=False)
 
         elif new_data.status == "Completed":
             await add_restock_items_to_inventory(restock, db)
 
         await db.commit()
-        await db.refresh(restock)
+        restock = await reload(db, Restock, restock.id, RESTOCK_LOADERS)
         return RestockResponse.model_validate(restock)
 
     except HTTPException as e:
@@ -173,15 +190,15 @@ async def delete_restock(restock_id: UUID,
                    db: db_dependency,
                    current_user: Annotated[dict, Depends(require_access_level(4))]):
     try:
-        stmt = select(Restock).where(Restock.id == restock_id)
+        stmt = select(Restock).options(*RESTOCK_LOADERS).where(Restock.id == restock_id)
         result = await db.execute(stmt)
-        restock = result.scalar_one_or_none()()
+        restock = result.scalar_one_or_none()
         if not restock:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                                 detail="Restock Record Not Found")
 
-        products = {p.id: p.restock_quantity for p in restock.items}
-        await restore_inventory(db, products, add_stock=False)
+        products = {p.product_id: p.restock_quantity for p in restock.items}
+        await restore_inventory(db, restock.store_id, products, add_stock=False)
 
         await db.delete(restock)
         await db.commit()
@@ -2,17 +2,21 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from typing import List, Annotated, Optional
 from uuid import UUID
 from datetime import date
-from utils.db import db_dependency
+from utils.db import db_dependency, read_db_dependency
 from validations.removal import StockRemovalRequest, StockRemovalResponse, StockRemovalUpdateRequest
 from schemas.inventory import Inventory
 from schemas.removal import StockRemoval, RemovalItems
 from utils.stock_restore import restore_inventory
 from utils.auth import require_access_level
 from utils.create_transaction import add_transaction
+from utils.loaders import REMOVAL_LOADERS, reload
+from utils.inventory_summary import apply_inventory_changes
+from utils.responses import list_response
 from sqlalchemy.future import select
+from utils.metrics import TimedRoute
 
 
-router = APIRouter(prefix="/stock-removals")
+router = APIRouter(prefix="/stock-removals", route_class=TimedRoute)
 
 
 @router.post("/add",
@@ -31,6 +35,7 @@ async def create_stock_removal(removal_data: StockRemovalRequest,
         inventories = {inv.product_id: inv for inv in result.scalars().all()}
 
         removal_items = []
+        changes = {}
 
         for item in removal_data.items:
             inventory = inventories.get(item.product_id)
@@ -44,6 +49,7 @@ async def create_stock_removal(removal_data: StockRemovalRequest,
                     detail=f"Insufficient Quantity for Product {item.product_id}. Available: {inventory.quantity}"
                 )
 
+            changes[item.product_id] = (inventory.quantity, inventory.quantity - item.removal_quantity)
             inventory.quantity -= item.removal_quantity
 
             removal_item = RemovalItems(
@@ -60,10 +66,12 @@ async def create_stock_removal(removal_data: StockRemovalRequest,
             is_cancelled=removal_data.is_cancelled,
             items=removal_items)
 
+        await apply_inventory_changes(db, removal_data.store_id, changes)
+        db.add(stock_removal)
+        await db.flush()
         await add_transaction(stock_removal, current_user["id"], db)
-        await db.add(stock_removal)
         await db.commit()
-        await db.refresh(stock_removal)
+        stock_removal = await reload(db, StockRemoval, stock_removal.id, REMOVAL_LOADERS)
 
         return StockRemovalResponse.model_validate(stock_removal)
 
@@ -79,10 +87,10 @@ async def create_stock_removal(removal_data: StockRemovalRequest,
             response_model=StockRemovalResponse,
             status_code=status.HTTP_200_OK)
 async def get_stock_removal(removal_id: UUID,
-                      db: db_dependency,
+                      db: read_db_dependency,
                       current_user: Annotated[dict, Depends(require_access_level(2))]):
     try:
-        stmt = select(StockRemoval).where(StockRemoval.id == removal_id)
+        stmt = select(StockRemoval).options(*REMOVAL_LOADERS).where(StockRemoval.id == removal_id)
         result = await db.execute(stmt)
         stock_removal = result.scalars().first()
         if not stock_removal:
@@ -99,14 +107,14 @@ async def get_stock_removal(removal_id: UUID,
 
 
 @router.get("/all", response_model=List[StockRemovalResponse])
-async def get_stock_removals(db: db_dependency,
+async def get_stock_removals(db: read_db_dependency,
                        current_user: Annotated[dict, Depends(require_access_level(2))],
                        limit: int = 10, offset: int = 0):
     try:
-        stmt = select(StockRemoval).offset(offset).limit(limit)
+        stmt = select(StockRemoval).options(*REMOVAL_LOADERS).offset(offset).limit(limit)
         result = await db.execute(stmt)
         removals = result.scalars().all()
-        return [StockRemovalResponse.model_validate(r) for r in removals]
+        return list_response(StockRemovalResponse, removals)
 
     except HTTPException as e:
         raise e
@@ -119,7 +127,7 @@ async def get_stock_removals(db: db_dependency,
 @router.get("/filter",
             response_model=List[StockRemovalResponse],
             status_code=status.HTTP_200_OK)
-async def filter_stock_removals(db: db_dependency,
+async def filter_stock_removals(db: read_db_dependency,
                           current_user: Annotated[dict, Depends(require_access_level(2))],
                           store_id: Optional[UUID] = None,
                           start_date: Optional[date] = None,
@@ -128,7 +136,7 @@ async def filter_stock_removals(db: db_dependency,
                           limit: int = 50,
                           offset: int = 0):
     try:
-        stmt = select(StockRemoval)
+        stmt = select(StockRemoval).options(*REMOVAL_LOADERS)
 
         if store_id:
             stmt = stmt.where(StockRemoval.store_id == store_id)
@@ -143,7 +151,7 @@ async def filter_stock_removals(db: db_dependency,
         result = await db.execute(stmt)
         removals = result.scalars().all()
         
-        return [StockRemovalResponse.model_validate(r) for r in removals]
+        return list_response(StockRemovalResponse, removals)
 
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -158,7 +166,7 @@ async def update_stock_removal(removal_id: UUID,
                          db: db_dependency,
                          current_user: Annotated[dict, Depends(require_access_level(3))]):
     try:
-        stmt = select(StockRemoval).where(StockRemoval.id == removal_id)
+        stmt = select(StockRemoval).options(*REMOVAL_LOADERS).where(StockRemoval.id == removal_id)
         result = await db.execute(stmt)
         stock_removal = result.scalars().first()
         if not stock_removal:
@@ -175,10 +183,10 @@ async def update_stock_removal(removal_id: UUID,
         if update_data.is_cancelled:
             products = {
                 p.product_id: p.removal_quantity for p in stock_removal.items}
-            await restore_inventory(db, products, add_stock=True)
+            await restore_inventory(db, stock_removal.store_id, products, add_stock=True)
 
         await db.commit()
-        await db.refresh(stock_removal)
+        stock_removal = await reload(db, StockRemoval, stock_removal.id, REMOVAL_LOADERS)
         return StockRemovalResponse.model_validate(stock_removal)
 
     except HTTPException as e:
@@ -195,7 +203,7 @@ async def delete_stock_removal(removal_id: UUID,
                          db: db_dependency,
                          current_user: Annotated[dict, Depends(require_access_level(3))]):
     try:
-        stmt = select(StockRemoval).where(StockRemoval.id == removal_id)
+        stmt = select(StockRemoval).options(*REMOVAL_LOADERS).where(StockRemoval.id == removal_id)
         result = await db.execute(stmt)
         stock_removal = result.scalars().first()
         if not stock_removal:
@@ -203,7 +211,7 @@ async def delete_stock_removal(removal_id: UUID,
                 status_code=404, detail="Stock Removal not found.")
 
         products = {p.product_id: p.removal_quantity for p in stock_removal.items}
-        await restore_inventory(db, products, add_stock=True)
+        await restore_inventory(db, stock_removal.store_id, products, add_stock=True)
 
         await db.delete(stock_removal)
         await db.commit()
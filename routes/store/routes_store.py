@@ -1,21 +1,27 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List, Annotated
+from fastapi import APIRouter, HTTPException, status, Depends, Response
+from typing import List, Annotated, Optional
 from uuid import UUID
+from datetime import date, datetime, timedelta, timezone
 from schemas.store import Store
 from validations.store import (
     StoreRequest,
     StoreResponse,
     StoreResponseWithRelations,
     StoreUpdateRequest,
-    StoreWithIncludeRelationsRequest
+    StoreWithIncludeRelationsRequest,
+    StoreDashboardResponse
 )
-from utils.db import db_dependency
+from utils.db import db_dependency, read_db_dependency
 from utils.auth import require_access_level
 from utils.information_loader import load_store_related_data
+from utils.responses import list_response
+from utils.etag import conditional_get, bump_versions
+from utils.store_dashboard import get_store_dashboard, STORE_DASHBOARD_MAX_DAYS
 from sqlalchemy.future import select
+from utils.metrics import TimedRoute
 
 
-router = APIRouter(prefix="/stores")
+router = APIRouter(prefix="/stores", route_class=TimedRoute)
 
 
 @router.post("/add",
@@ -30,8 +36,9 @@ async def create_stores(stores: List[StoreRequest],
         for store in stores:
             new_store = Store(**store.model_dump())
             new_stores.append(new_store)
-            await db.add(new_store)
+            db.add(new_store)
             
+        await bump_versions(db, "stores")
         await db.commit()
         response = []
         for store in new_stores:
@@ -51,13 +58,15 @@ async def create_stores(stores: List[StoreRequest],
 @router.get("/all",
             response_model=List[StoreResponse],
             status_code=status.HTTP_200_OK)
-async def get_all_stores(db: db_dependency):
+async def get_all_stores(db: read_db_dependency,
+                         response: Response,
+                         etag: Annotated[str, Depends(conditional_get("stores"))]):
     """Retrieve All Registered Stores."""
     try:
         stmt =  select(Store)
         result = await db.execute(stmt)
         stores = result.scalars().all()
-        return [StoreResponse.model_validate(store) for store in stores]
+        return list_response(StoreResponse, stores, response)
 
     except HTTPException as e:
         raise e
@@ -71,7 +80,8 @@ async def get_all_stores(db: db_dependency):
              response_model=StoreResponseWithRelations,
              status_code=status.HTTP_200_OK)
 async def get_store_by_id(store_response_config: StoreWithIncludeRelationsRequest,
-                          db: db_dependency,
+                          response: Response,
+                          db: read_db_dependency,
                           current_user: Annotated[dict, Depends(require_access_level(2))],
                           ):
     """Retrieve a Store and its Related Information by ID."""
@@ -86,7 +96,13 @@ async def get_store_by_id(store_response_config: StoreWithIncludeRelationsReques
         location = store.location
         store_model = StoreResponseWithRelations(**store.__dict__)
         store_model.location = location
-        store_model = await load_store_related_data(store_model, db, store_response_config)
+
+        timings = {}
+        store_model = await load_store_related_data(store_model, db, store_response_config, timings)
+        if timings:
+            response.headers["Server-Timing"] = ", ".join(
+                f"{name};dur={duration:.1f}" for name, duration in timings.items()
+            )
         return store_model
 
     except HTTPException as e:
@@ -97,6 +113,42 @@ async def get_store_by_id(store_response_config: StoreWithIncludeRelationsReques
                             detail=f"Error Fetching Store: {str(e)}")
 
 
+@router.get("/dashboard/{store_id}",
+            response_model=StoreDashboardResponse,
+            status_code=status.HTTP_200_OK)
+async def get_store_dashboard_by_id(store_id: UUID,
+                                    db: read_db_dependency,
+                                    current_user: Annotated[dict, Depends(require_access_level(2))],
+                                    start_date: Optional[date] = None,
+                                    end_date: Optional[date] = None):
+    """Daily Revenue, Orders, Units Sold, Refunds and Restocks of a Store, Defaults to the Last 30 Days."""
+    try:
+        end_date = end_date or datetime.now(timezone.utc).date()
+        start_date = start_date or end_date - timedelta(days=29)
+        if start_date > end_date:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail="start_date must not be after end_date")
+
+        if (end_date - start_date).days >= STORE_DASHBOARD_MAX_DAYS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"Date Range is Limited to {STORE_DASHBOARD_MAX_DAYS} Days")
+
+        stmt = select(Store.id).where(Store.id == store_id)
+        result = await db.execute(stmt)
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                                detail="Store Not Found")
+
+        return await get_store_dashboard(store_id, start_date, end_date, db)
+
+    except HTTPException as e:
+        raise e
+
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Error Fetching Store Dashboard: {str(e)}")
+
+
 @router.put("/update/{store_id}",
             response_model=StoreResponse,
             status_code=status.HTTP_200_OK)
@@ -120,6 +172,7 @@ async def update_store(store_id: UUID,
         if store.location_id:
             store_to_update.location_id = store.location_id
 
+        await bump_versions(db, "stores")
         await db.commit()
         await db.refresh(store_to_update)
 
@@ -149,6 +202,7 @@ async def delete_store(store_id: UUID,
                                 detail="Store Not Found")
 
         await db.delete(store)
+        await bump_versions(db, "stores")
         await db.commit()
 
     except HTTPException as e:
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List, Annotated, Optional
+from fastapi.responses import StreamingResponse
+from typing import List, Annotated, Optional, Literal
 from uuid import UUID
 from schemas.transaction import Transaction
 from validations.transaction import (
@@ -7,19 +8,22 @@ from validations.transaction import (
     TransactionResponse
 )
 from datetime import date
-from utils.db import db_dependency
+from utils.db import read_db_dependency
 from utils.auth import require_access_level
+from utils.transaction_export import apply_transaction_filters, stream_transactions, EXPORT_MEDIA_TYPES
+from utils.responses import list_response
 from sqlalchemy.future import select
+from utils.metrics import TimedRoute
 
-router = APIRouter(prefix="/transactions")
+router = APIRouter(prefix="/transactions", route_class=TimedRoute)
 
 # NOTE: No Routes for Transaction Creation and Modification will be Exposed. Only Retrievals are Allowed.
 
 
 @router.get("/all",
-            response_model=List[TransactionResponseWithRelations],
+            response_model=List[TransactionResponse | TransactionResponseWithRelations],
             status_code=status.HTTP_200_OK)
-async def get_all_transactions(db: db_dependency,
+async def get_all_transactions(db: read_db_dependency,
                                current_user: Annotated[dict, Depends(require_access_level(3))],
                                include_details: bool = False):
     """Retrieve all Transactions."""
@@ -29,15 +33,9 @@ async def get_all_transactions(db: db_dependency,
         transactions = result.scalars().all()
         
         if include_details:
-            return [
-                TransactionResponseWithRelations.model_validate(transaction)
-                for transaction in transactions
-            ]
+            return list_response(TransactionResponseWithRelations, transactions)
 
-        return [
-            TransactionResponse.model_validate(transaction)
-            for transaction in transactions
-        ]
+        return list_response(TransactionResponse, transactions)
 
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
@@ -48,7 +46,7 @@ async def get_all_transactions(db: db_dependency,
             response_model=TransactionResponseWithRelations,
             status_code=status.HTTP_200_OK)
 async def get_transaction(transaction_id: UUID,
-                          db: db_dependency,
+                          db: read_db_dependency,
                           current_user: Annotated[dict, Depends(require_access_level(3))]):
     """Retrieve a Transaction by ID."""
     try:
@@ -73,7 +71,7 @@ async def get_transaction(transaction_id: UUID,
 @router.get("/filter",
             response_model=List[TransactionResponseWithRelations],
             status_code=status.HTTP_200_OK)
-async def filter_transactions(db: db_dependency,
+async def filter_transactions(db: read_db_dependency,
                               current_user: Annotated[dict, Depends(require_access_level(3))],
                               store_id: Optional[UUID] = None,
                               operation_type: Optional[str] = None,
@@ -82,28 +80,35 @@ async def filter_transactions(db: db_dependency,
                               limit: int = 50,
                               offset: int = 0):
     try:
-        stmt = select(Transaction)
-
-        if store_id:
-            stmt = stmt.where(Transaction.store_id == store_id)
-        if operation_type:
-            stmt = stmt.where(Transaction.operation_type == operation_type)
-        if start_date:
-            stmt = stmt.where(Transaction.date >= start_date)
-        if end_date:
-            stmt = stmt.where(Transaction.date <= end_date)
-
+        stmt = apply_transaction_filters(select(Transaction), store_id, operation_type, start_date, end_date)
         stmt = stmt.order_by(Transaction.date.desc()).offset(offset).limit(limit)
         result = await db.execute(stmt)
         transactions = result.scalars().all()
 
-        return [
-            TransactionResponseWithRelations.model_validate(transaction)
-            for transaction in transactions
-        ]
+        return list_response(TransactionResponseWithRelations, transactions)
 
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Error Fetching Filtered Transactions: {str(e)}"
         )
+
+
+@router.get("/export",
+            status_code=status.HTTP_200_OK)
+async def export_transactions(current_user: Annotated[dict, Depends(require_access_level(3))],
+                              export_format: Literal["ndjson", "csv"] = "ndjson",
+                              store_id: Optional[UUID] = None,
+                              operation_type: Optional[Literal["Restock", "Sale", "Refund", "Removal"]] = None,
+                              start_date: Optional[date] = None,
+                              end_date: Optional[date] = None):
+    """Stream the Transactions for Audit Exports, as NDJSON or CSV."""
+    return StreamingResponse(
+        stream_transactions(export_format,
+                            store_id=store_id,
+                            operation_type=operation_type,
+                            start_date=start_date,
+                            end_date=end_date),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{export_format}"'}
+    )
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, status, HTTPException
+from fastapi import APIRouter, status, HTTPException, Depends
+from typing import Annotated
 from utils.db import db_dependency
 from validations.user import (
     Token,
@@ -10,11 +11,17 @@ from utils.auth import (
     authenticate_user,
     create_access_token,
     user_dependency,
+    oauth2_bearer,
+    revoke_token,
+    token_cache_stats,
+    password_hashing_stats,
+    require_access_level,
 )
 from datetime import timedelta
+from utils.metrics import TimedRoute
 
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", route_class=TimedRoute, tags=["Authentication"])
 
 
 @router.get("/me",
@@ -47,7 +54,7 @@ async def get_user(db: db_dependency, user: user_dependency):
              status_code=status.HTTP_202_ACCEPTED)
 async def user_login(form_data: auth_form, db: db_dependency):
     try:
-        user = authenticate_user(form_data.username, form_data.password, db)
+        user = await authenticate_user(form_data.username, form_data.password, db)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -56,7 +63,9 @@ async def user_login(form_data: auth_form, db: db_dependency):
 
         token = create_access_token(
             user.username,
-            user.id,
+            str(user.id),
+            is_internal_user=user.is_internal_user,
+            level=user.level,
             expires_in=timedelta(minutes=30)
         )
 
@@ -70,3 +79,25 @@ async def user_login(form_data: auth_form, db: db_dependency):
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Login Failed: {str(e)}"
         )
+
+
+@router.post("/logout",
+             status_code=status.HTTP_204_NO_CONTENT)
+async def user_logout(token: Annotated[str, Depends(oauth2_bearer)], user: user_dependency, db: db_dependency):
+    """Revoke the Current Access Token."""
+    await revoke_token(token, db)
+
+
+@router.get("/cache/stats",
+            status_code=status.HTTP_200_OK)
+async def get_token_cache_stats(db: db_dependency,
+                                current_user: Annotated[dict, Depends(require_access_level(4))]):
+    """Hit Ratio of the Decoded Token Cache."""
+    return await token_cache_stats(db)
+
+
+@router.get("/hashing/stats",
+            status_code=status.HTTP_200_OK)
+async def get_password_hashing_stats(current_user: Annotated[dict, Depends(require_access_level(4))]):
+    """Concurrency and Queue Depth of the Password Hashing Pool."""
+    return password_hashing_stats()
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, status, HTTPException, Depends
-from utils.db import db_dependency
+from fastapi import APIRouter, status, HTTPException, Depends, Response
+from utils.db import db_dependency, read_db_dependency
 from validations.user import (
     UserRequest,
     UserRead,
@@ -8,16 +8,19 @@ from validations.user import (
 )
 from schemas.user import User
 from utils.auth import (
-    bcrypt_context,
+    hash_password,
     user_dependency,
     require_access_level
 )
 from typing import Annotated, List
 from uuid import UUID
+from utils.pagination import fetch_page, NEXT_CURSOR_HEADER
+from utils.responses import list_response
 from sqlalchemy.future import select
+from utils.metrics import TimedRoute
 
 
-router = APIRouter(prefix="/users")
+router = APIRouter(prefix="/users", route_class=TimedRoute)
 
 
 @router.post("/public/add",
@@ -29,11 +32,11 @@ async def create_public_user(user_data: UserRequest, db: db_dependency):
         new_user = User(
             username=user_data.username,
             email=user_data.email,
-            password=bcrypt_context.hash(user_data.password),
+            password=await hash_password(user_data.password),
             is_internal_user=user_data.is_internal_user
         )
 
-        await db.add(new_user)
+        db.add(new_user)
         await db.commit()
         await db.refresh(new_user)
 
@@ -56,7 +59,7 @@ async def create_internal_user(user_data: UserRequest,
     try:
         new_user = User(
             username=user_data.username,
-            password=bcrypt_context.hash(user_data.password),
+            password=await hash_password(user_data.password),
             email=user_data.email,
             is_internal_user=user_data.is_internal_user,
             level=user_data.level
@@ -68,7 +71,7 @@ async def create_internal_user(user_data: UserRequest,
                 detail="Cannot Create a User with Equal or Higher Privileges."
             )
 
-        await db.add(new_user)
+        db.add(new_user)
         await db.commit()
         await db.refresh(new_user)
 
@@ -128,15 +131,19 @@ async def get_user_from_identifier(identifier: str | UUID,
 @router.get("/all",
             response_model=List[UserRead],
             status_code=status.HTTP_200_OK)
-async def get_all_users(db: db_dependency,
+async def get_all_users(db: read_db_dependency,
+                        response: Response,
                         current_user: Annotated[dict, Depends(require_access_level(4))],
                         limit: int = 50,
-                        offset: int = 0):
+                        offset: int = 0,
+                        cursor: str | None = None):
     try:
-        stmt = select(User).offset(offset).limit(limit)
-        result = await db.execute(stmt)
-        users = result.scalars().all()
-        return [UserRead.model_validate(user) for user in users]
+        sort_keys = [(User.created_at, True), (User.id, True)]
+        users, next_cursor = await fetch_page(db, select(User), sort_keys, limit, cursor, offset)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+        return list_response(UserRead, users, response)
 
     except HTTPException as e:
         raise e
@@ -175,7 +182,7 @@ async def modify_user(updated_user: UserPublicUpdateRequest,
         if updated_user.new_username:
             user.username = updated_user.new_username
         if updated_user.new_password:
-            user.password = bcrypt_context.hash(updated_user.new_password)
+            user.password = await hash_password(updated_user.new_password)
         if updated_user.new_email:
             user.email = updated_user.new_email
 
@@ -233,7 +240,7 @@ async def modify_any_user(updated_user: UserManagementUpdateRequest,
         if updated_user.new_username:
             user.username = updated_user.new_username
         if updated_user.new_password:
-            user.password = bcrypt_context.hash(updated_user.new_password)
+            user.password = await hash_password(updated_user.new_password)
         if updated_user.new_email:
             user.email = updated_user.new_email
         if updated_user.new_level:
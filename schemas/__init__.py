@@ -2,7 +2,7 @@ from .base import Base
 from .customer import Customer
 from .role import Role
 from .employee import Employee
-from .inventory import Inventory
+from .inventory import Inventory, StoreInventorySummary
 from .order import Order, CartItems
 from .product import Product, Category
 from .refund import Refund, RefundItems
@@ -11,6 +11,10 @@ from .store import Location, Store
 from .transaction import Transaction
 from .removal import StockRemoval, RemovalItems
 from .user import User
+from .idempotency import IdempotencyRecord
+from .sales_rollup import SalesRollupHourly, SalesRollupDaily, RollupWatermark
+from .data_version import DataVersion
+from .revoked_token import RevokedToken
 
 
 __all__ = [
@@ -20,6 +24,7 @@ __all__ = [
     "Category",
     "Employee",
     "Inventory",
+    "StoreInventorySummary",
     "Order",
     "CartItems",
     "Product",
@@ -32,5 +37,11 @@ __all__ = [
     "Transaction",
     "StockRemoval",
     "RemovalItems",
-    "User"
+    "User",
+    "IdempotencyRecord",
+    "SalesRollupHourly",
+    "SalesRollupDaily",
+    "RollupWatermark",
+    "DataVersion",
+    "RevokedToken"
 ]
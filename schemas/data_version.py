@@ -0,0 +1,22 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, BigInteger
+from .base import Base
+
+
+# Version Counters of Cached or Conditionally Served Data (e.g. the ETags of the Catalog Lists).
+# A Counter is Incremented in the same Transaction as the Write it Covers, so every Worker
+# and Replica sees the new Version exactly when it sees the Data.
+class DataVersion(Base):
+    __tablename__ = 'data_versions'
+
+    name: Mapped[str] = mapped_column(
+        String(100),
+        primary_key=True,
+        comment="Name of the Versioned Data, e.g. a Collection."
+    )
+    version: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="Incremented on every Committed Write of the Data."
+    )
@@ -79,3 +79,7 @@ class Employee(Base):
     user: Mapped["User"] = relationship(
         uselist=False
     )
+    store: Mapped["Store"] = relationship(
+        uselist=False,
+        back_populates="employees"
+    )
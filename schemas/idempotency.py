@@ -0,0 +1,54 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Text, UUID, ForeignKey, Integer, DateTime
+from datetime import datetime, timezone
+from .base import Base
+
+
+# Responses of Create Requests sent with an Idempotency-Key Header,
+# a Retried Request with the same Key is Answered from here instead of being Executed again.
+# The Record is Written in the same Transaction as the Operation itself.
+class IdempotencyRecord(Base):
+    __tablename__ = 'idempotency_keys'
+
+    key: Mapped[str] = mapped_column(
+        String(255),
+        primary_key=True,
+        comment="Idempotency Key sent by the Client."
+    )
+    endpoint: Mapped[str] = mapped_column(
+        String(100),
+        primary_key=True,
+        comment="Path of the Endpoint the Key was used on."
+    )
+    request_hash: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        comment="SHA-256 of the Request Body, a Key cannot be Reused with a different Body."
+    )
+    status_code: Mapped[int] = mapped_column(
+        Integer,
+        nullable=True,
+        comment="Status Code of the Stored Response, Null while the Request is in Progress."
+    )
+    response_body: Mapped[str] = mapped_column(
+        Text,
+        nullable=True,
+        comment="JSON Body of the Stored Response."
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        comment="Timestamp When the Key was First Used."
+    )
+
+    ###############
+    # Foreign Keys
+    ###############
+
+    user_id: Mapped[UUID] = mapped_column(
+        UUID,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="(F.Key) Unique identifier for the User who sent the Key."
+    )
@@ -1,11 +1,20 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Float, UUID, ForeignKey, Integer
+from sqlalchemy import Float, UUID, ForeignKey, Integer, BigInteger, DateTime, Index, UniqueConstraint
+from datetime import datetime, timezone
 from .product import Product
 from .base import Base
 
 
 class Inventory(Base):
     __tablename__ = 'inventory'
+    __table_args__ = (
+        # The Primary Key leads with the Surrogate ID, so Lookups by Store and Product need their own.
+        # Also the Conflict Target of the Restock Upsert, a Product is Stocked once per Store.
+        UniqueConstraint("store_id", "product_id", name="uq_inventory_store_id_product_id"),
+        Index("ix_inventory_product_id", "product_id"),
+        # Quantity Filters within a Store (e.g. Low Stock Lists).
+        Index("ix_inventory_store_id_quantity", "store_id", "quantity"),
+    )
 
     id: Mapped[int] = mapped_column(
         Integer,
@@ -25,6 +34,11 @@ class Inventory(Base):
         nullable=False,
         comment="Max Discount Applicable on the Product (0-1)."
     )
+    reorder_threshold: Mapped[int] = mapped_column(
+        Integer,
+        nullable=True,
+        comment="Quantity below which a Low Stock Alert is Raised, Defaults to LOW_STOCK_THRESHOLD."
+    )
 
     ###############
     # Foreign Keys
@@ -52,3 +66,52 @@ class Inventory(Base):
 
 # Relationship: 1-to-1
 # Each Item in the Inventory is a Product.
+
+
+# Per Store Aggregate of the Inventory, Maintained Incrementally in the same Transaction
+# as every Inventory Change (see utils/inventory_summary.py) and Rebuilt by the Reconcile Job.
+class StoreInventorySummary(Base):
+    __tablename__ = 'store_inventory_summary'
+
+    sku_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        nullable=False,
+        comment="Number of Products Stocked in the Store."
+    )
+    units_on_hand: Mapped[int] = mapped_column(
+        BigInteger,
+        default=0,
+        nullable=False,
+        comment="Total Quantity of all Products in the Store."
+    )
+    stock_value: Mapped[float] = mapped_column(
+        Float,
+        default=0.0,
+        nullable=False,
+        comment="Total Value of the Stock at the Current Product Prices."
+    )
+    low_stock_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        nullable=False,
+        comment="Number of Products below the Low Stock Threshold."
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        comment="Timestamp of the last Change to the Summary."
+    )
+
+    ###############
+    # Foreign Keys
+    ###############
+
+    store_id: Mapped[UUID] = mapped_column(
+        UUID,
+        ForeignKey("stores.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="(F.Key) Unique identifier for the Store."
+    )
@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Float, DateTime, UUID, ForeignKey, Integer
+from sqlalchemy import String, Float, DateTime, UUID, ForeignKey, Integer, Index
 from datetime import datetime, timezone
-from typing import List
+from typing import List, Optional
 from uuid import uuid4
 from .product import Product
 from .customer import Customer
@@ -64,6 +64,14 @@ class CartItems(Base):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Order History of a Customer, Newest First.
+        Index("ix_orders_customer_id_date_placed", "customer_id", "date_placed"),
+        # Orders of a Store, Newest First.
+        Index("ix_orders_store_id_date_placed", "store_id", "date_placed"),
+        # Keyset Pagination of all Orders.
+        Index("ix_orders_date_placed_id", "date_placed", "id"),
+    )
 
     id: Mapped[UUID] = mapped_column(
         UUID,
@@ -101,9 +109,10 @@ class Order(Base):
         default=lambda: datetime.now(timezone.utc),
         comment="Timestamp When the Order is Placed."
     )
-    date_received: Mapped[datetime] = mapped_column(
+    date_received: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True),
-        comment="Timestamp When the Order is Delivered to the Customer."
+        nullable=True,
+        comment="Timestamp When the Order is Delivered to the Customer, Unset until then."
     )
     order_mode: Mapped[str] = mapped_column(
         String,
@@ -124,7 +133,6 @@ class Order(Base):
         UUID,
         ForeignKey("stores.id", ondelete="RESTRICT"),
         nullable=False,
-        index=True,
         comment="(F.Key) Unique identifier for the Store."
     )
     customer_id: Mapped[UUID] = mapped_column(
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Float, UUID, ForeignKey, Integer, Boolean
+from sqlalchemy import String, Float, UUID, ForeignKey, Integer, Boolean, Index, text
 from typing import List
 from uuid import uuid4
 from .base import Base
@@ -35,6 +35,20 @@ class Category(Base):
 # marked as True.
 class Product(Base):
     __tablename__ = 'products'
+    __table_args__ = (
+        # Partial, Covering Index for the Active Catalog (Removed Products are never Listed),
+        # Price Lookups can be Served as Index Only Scans.
+        Index("ix_products_active_category_id", "category_id", "id",
+              postgresql_where=text("is_removed = false"),
+              postgresql_include=["price"]),
+        # Price Range Filters and the Price Sort of the Product Lists (Keyset on Price, ID).
+        Index("ix_products_price_id", "price", "id"),
+        # Full Text Search on Name and Description (utils/product_search.py, Postgres Backend),
+        # the Query must Repeat this Expression to Use the Index.
+        Index("ix_products_search",
+              text("to_tsvector('simple', name || ' ' || description)"),
+              postgresql_using="gin"),
+    )
 
     id: Mapped[UUID] = mapped_column(
         UUID,
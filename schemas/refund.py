@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Float, DateTime, UUID, ForeignKey, Integer
+from sqlalchemy import String, Float, DateTime, UUID, ForeignKey, Integer, Index
 from datetime import datetime, timezone
 from typing import List
 from uuid import uuid4
@@ -55,6 +55,12 @@ class RefundItems(Base):
 
 class Refund(Base):
     __tablename__ = "refunds"
+    __table_args__ = (
+        # Refunds of a Store, Newest First.
+        Index("ix_refunds_store_id_application_date", "store_id", "application_date"),
+        # Keyset Pagination of all Refunds.
+        Index("ix_refunds_application_date_id", "application_date", "id"),
+    )
 
     id: Mapped[UUID] = mapped_column(
         UUID,
@@ -99,7 +105,6 @@ class Refund(Base):
         UUID,
         ForeignKey("stores.id", ondelete="RESTRICT"),
         nullable=False,
-        index=True,
         comment="(F.Key) Unique identifier for the Store."
     )
     order_id: Mapped[UUID] = mapped_column(
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, UUID, ForeignKey, Integer, Boolean
+from sqlalchemy import String, DateTime, UUID, ForeignKey, Integer, Boolean, Index
 from datetime import datetime, timezone
 from uuid import uuid4
 from typing import List
@@ -61,6 +61,10 @@ class RemovalItems(Base):
 # This removal could be of complete inventory or of some specific quantity.
 class StockRemoval(Base):
     __tablename__ = 'stock_removals'
+    __table_args__ = (
+        # Removals of a Store, Newest First.
+        Index("ix_stock_removals_store_id_date", "store_id", "date"),
+    )
 
     id: Mapped[UUID] = mapped_column(
         UUID,
@@ -94,7 +98,6 @@ class StockRemoval(Base):
         UUID,
         ForeignKey("stores.id", ondelete="RESTRICT"),
         nullable=False,
-        index=True,
         comment="(F.Key) Unique identifier for the Store."
     )
 
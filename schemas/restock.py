@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, UUID, ForeignKey, Integer
+from sqlalchemy import String, DateTime, UUID, ForeignKey, Integer, Index
 from datetime import datetime, timezone
 from uuid import uuid4
 from typing import List
@@ -57,6 +57,12 @@ class RestockItems(Base):
 
 class Restock(Base):
     __tablename__ = "restocks"
+    __table_args__ = (
+        # Restock Filters by Store and Status, Newest First.
+        Index("ix_restocks_store_id_status_date_placed", "store_id", "status", "date_placed"),
+        # Keyset Pagination of all Restocks.
+        Index("ix_restocks_date_placed_id", "date_placed", "id"),
+    )
 
     id: Mapped[UUID] = mapped_column(
         UUID,
@@ -90,7 +96,6 @@ class Restock(Base):
         UUID,
         ForeignKey("stores.id", ondelete="RESTRICT"),
         nullable=False,
-        index=True,
         comment="(F.Key) Unique identifier for the Store."
     )
 
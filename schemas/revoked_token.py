@@ -0,0 +1,24 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, DateTime, Index
+from datetime import datetime
+from .base import Base
+
+
+# Access Tokens Revoked before their Expiry (Logout), Shared by all Workers and Restarts.
+# A Row is only Needed until its Token would Expire anyway, Expired ones are Purged on Revocation.
+class RevokedToken(Base):
+    __tablename__ = 'revoked_tokens'
+    __table_args__ = (
+        Index("ix_revoked_tokens_expires_at", "expires_at"),
+    )
+
+    token_hash: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        comment="SHA-256 of the Revoked Token, the Token itself is not Stored."
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="Expiry of the Token, after which the Row can be Purged."
+    )
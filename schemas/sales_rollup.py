@@ -0,0 +1,109 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Float, UUID, ForeignKey, Integer, DateTime, Index
+from datetime import datetime
+from .base import Base
+
+
+# Sales per (Time Bucket, Store, Product), Maintained by the Incremental Job in utils/sales_rollup.py
+# from the Sale and Refund Transactions, so Reports Read Buckets instead of Scanning Orders.
+class SalesRollupColumns:
+    bucket: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+        comment="Start of the Time Bucket (UTC)."
+    )
+    units_sold: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Quantity Sold."
+    )
+    gross: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        default=0.0,
+        comment="Sold Quantity at the Catalog Price, before Discounts."
+    )
+    discount: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        default=0.0,
+        comment="Discounts Given on the Sales."
+    )
+    tax: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        default=0.0,
+        comment="Order Tax, Allocated to the Products by their Discounted Amount."
+    )
+    units_refunded: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Quantity Refunded."
+    )
+    refund_amount: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        default=0.0,
+        comment="Refunded Amount, Allocated to the Products by their Value."
+    )
+
+    ###############
+    # Foreign Keys
+    ###############
+
+    store_id: Mapped[UUID] = mapped_column(
+        UUID,
+        ForeignKey("stores.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="(F.Key) Unique identifier for the Store."
+    )
+    product_id: Mapped[UUID] = mapped_column(
+        UUID,
+        ForeignKey("products.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="(F.Key) Unique identifier for the Product."
+    )
+
+
+class SalesRollupHourly(SalesRollupColumns, Base):
+    __tablename__ = 'sales_rollup_hourly'
+    __table_args__ = (
+        # The Primary Key leads with the Bucket (All Stores Reports), this one Serves a single Store.
+        Index("ix_sales_rollup_hourly_store_id_bucket", "store_id", "bucket"),
+    )
+
+
+class SalesRollupDaily(SalesRollupColumns, Base):
+    __tablename__ = 'sales_rollup_daily'
+    __table_args__ = (
+        Index("ix_sales_rollup_daily_store_id_bucket", "store_id", "bucket"),
+    )
+
+
+# Position of an Incremental Job in the Transactions, as the (Date, ID) of the last Processed one.
+# The Row is Locked while a Batch is Rolled Up, so several Workers never Process the same Batch.
+class RollupWatermark(Base):
+    __tablename__ = 'rollup_watermarks'
+
+    name: Mapped[str] = mapped_column(
+        String(50),
+        primary_key=True,
+        comment="Name of the Job."
+    )
+    last_date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="Date of the last Processed Transaction."
+    )
+    last_id: Mapped[UUID] = mapped_column(
+        UUID,
+        nullable=False,
+        comment="ID of the last Processed Transaction, Breaks Ties on the Date."
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="Timestamp When the Job last Advanced."
+    )
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, UUID, ForeignKey
+from sqlalchemy import String, DateTime, UUID, ForeignKey, Index
 from datetime import datetime
 from uuid import uuid4
 from .user import User
@@ -15,6 +15,14 @@ from .base import Base
 # Also, the Transaction Join will be based on the Transaction Type and ID with the Associated Tables.
 class Transaction(Base):
     __tablename__ = 'transactions'
+    __table_args__ = (
+        # Joining a Transaction back to its Operation.
+        Index("ix_transactions_type_operation_id", "type", "operation_id"),
+        # Store History, Newest First.
+        Index("ix_transactions_store_id_date", "store_id", "date"),
+        # Ordered Exports.
+        Index("ix_transactions_date_id", "date", "id"),
+    )
 
     id: Mapped[UUID] = mapped_column(
         UUID,
@@ -46,7 +54,6 @@ class Transaction(Base):
     store_id: Mapped[UUID] = mapped_column(
         UUID,
         ForeignKey("stores.id", ondelete="RESTRICT"),
-        index=True,
         nullable=False,
         comment="(F.Key) Unique identifier for the Store."
     )
@@ -64,3 +64,12 @@ class User(Base):
         default=1,
         comment="Level of the User for RBAC."
     )
+
+    ###############
+    # Relationships
+    ###############
+
+    role: Mapped["Role"] = relationship(
+        back_populates="users",
+        uselist=False
+    )
@@ -0,0 +1,32 @@
+import os
+
+# The Modules Read their Settings at Import, the Database ones are never Connected to.
+for name, value in {
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_URL": "localhost",
+    "DB_NAME": "test",
+    "SECRET_KEY": "test",
+    "HASHING_ALGORITHM": "HS256",
+}.items():
+    os.environ.setdefault(name, value)
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
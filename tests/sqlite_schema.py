@@ -0,0 +1,47 @@
+"""
+Creates the Tables of the Models in SQLite, for the Tests and Benchmarks.
+
+The Schema targets PostgreSQL, SQLite cannot Create it as it is: Expression Indexes use PostgreSQL
+Functions, and the Item Tables have a Surrogate Autoincrement ID inside a Composite Primary Key.
+Each Table is therefore Copied with only its Columns, Primary Key, Unique Constraints and Column
+Indexes, the Surrogate ID alone being the Primary Key of the Copy. The Models keep Reading and
+Writing the Copies.
+"""
+from schemas.base import Base
+from sqlalchemy import Column, Index, MetaData, Table, UniqueConstraint, Uuid
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+def _sqlite_table(table: Table, metadata: MetaData) -> Table:
+    primary_key = list(table.primary_key.columns)
+    surrogate = next((column for column in primary_key if column.autoincrement is True), None)
+    if len(primary_key) < 2:
+        surrogate = None
+
+    columns = []
+    for column in table.columns:
+        if surrogate is not None:
+            is_primary_key = column is surrogate
+        else:
+            is_primary_key = column.primary_key
+        columns.append(Column(column.name,
+                              Uuid() if isinstance(column.type, Uuid) else column.type,
+                              primary_key=is_primary_key,
+                              nullable=column.nullable or is_primary_key))
+
+    unique = [UniqueConstraint(*constraint.columns.keys())
+              for constraint in table.constraints if isinstance(constraint, UniqueConstraint)]
+    # Plain Column Indexes only, Expression ones use PostgreSQL Functions.
+    indexes = [Index(index.name, *(column.name for column in index.columns))
+               for index in table.indexes if len(index.columns) == len(index.expressions)]
+    return Table(table.name, metadata, *columns, *unique, *indexes)
+
+
+async def create_tables(engine: AsyncEngine, *tables: Table):
+    """Creates the given Tables, or all of them."""
+    metadata = MetaData()
+    for table in tables or Base.metadata.sorted_tables:
+        _sqlite_table(table, metadata)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
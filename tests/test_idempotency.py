@@ -0,0 +1,132 @@
+from schemas.idempotency import IdempotencyRecord
+from tests.sqlite_schema import create_tables
+from utils import idempotency
+from utils.idempotency import REPLAYED_HEADER, idempotency_key
+from fastapi import HTTPException, Request
+from pydantic import BaseModel
+from sqlalchemy import func
+from sqlalchemy.future import select
+from typing import Optional
+from uuid import UUID, uuid4
+import asyncio
+import json
+import pytest
+
+
+pytestmark = pytest.mark.anyio
+
+
+class Created(BaseModel):
+    id: UUID
+
+
+def _request(body: bytes, key: str = "retry-1", path: str = "/orders/add") -> Request:
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request({"type": "http",
+                    "method": "POST",
+                    "path": path,
+                    "query_string": b"",
+                    "headers": [(b"idempotency-key", key.encode())]}, receive)
+
+
+async def _send(session_factory, user: dict, body: bytes, key: str = "retry-1", committed: Optional[asyncio.Event] = None):
+    """Runs the Dependency as a Create Route does, Returns (Replay, Response Created by this Call)."""
+    async with session_factory() as db:
+        dependency = idempotency_key(_request(body, key), db, user)
+        idempotent = await dependency.__anext__()
+        try:
+            if idempotent.replay is not None:
+                return idempotent.replay, None
+
+            if committed is not None:
+                await committed.wait()
+            response = Created(id=uuid4())
+            await idempotent.save(db, response)
+            await db.commit()
+            return None, response
+        finally:
+            await dependency.aclose()
+
+
+@pytest.fixture
+async def session_factory(session_factory, engine):
+    await create_tables(engine, IdempotencyRecord.__table__)
+    idempotency._responses.clear()
+    yield session_factory
+    idempotency._responses.clear()
+
+
+async def test_retry_replays_stored_response(session_factory):
+    user = {"id": uuid4()}
+    replay, created = await _send(session_factory, user, b'{"items": []}')
+    assert replay is None
+
+    # From the In-Memory Cache, then (as on another Worker) from the Database.
+    for _ in range(2):
+        replay, again = await _send(session_factory, user, b'{"items": []}')
+        assert again is None
+        assert replay.status_code == 201
+        assert replay.headers[REPLAYED_HEADER] == "true"
+        assert json.loads(replay.body) == {"id": str(created.id)}
+        idempotency._responses.clear()
+
+    async with session_factory() as db:
+        assert await db.scalar(select(func.count()).select_from(IdempotencyRecord)) == 1
+
+
+async def test_key_is_scoped_to_user_and_endpoint(session_factory):
+    await _send(session_factory, {"id": uuid4()}, b"{}")
+    replay, created = await _send(session_factory, {"id": uuid4()}, b"{}")
+    assert replay is None and created is not None
+
+
+async def test_reused_key_with_different_body_is_rejected(session_factory):
+    user = {"id": uuid4()}
+    await _send(session_factory, user, b'{"quantity": 1}')
+
+    with pytest.raises(HTTPException) as error:
+        await _send(session_factory, user, b'{"quantity": 2}')
+    assert error.value.status_code == 422
+
+
+async def test_rolled_back_request_releases_key(session_factory):
+    user = {"id": uuid4()}
+    async with session_factory() as db:
+        dependency = idempotency_key(_request(b"{}"), db, user)
+        idempotent = await dependency.__anext__()
+        assert idempotent.replay is None
+        await db.rollback()
+        await dependency.aclose()
+
+    replay, created = await _send(session_factory, user, b"{}")
+    assert replay is None and created is not None
+
+
+async def test_concurrent_duplicate_waits_for_first_response(session_factory):
+    user = {"id": uuid4()}
+    committed = asyncio.Event()
+    first = asyncio.create_task(_send(session_factory, user, b"{}", committed=committed))
+    await asyncio.sleep(0.05)
+    duplicate = asyncio.create_task(_send(session_factory, user, b"{}"))
+    await asyncio.sleep(0.05)
+    assert not duplicate.done()
+
+    committed.set()
+    _, created = await first
+    replay, _ = await duplicate
+    assert json.loads(replay.body) == {"id": str(created.id)}
+
+
+async def test_key_held_by_another_worker_is_in_progress(session_factory):
+    user = {"id": uuid4()}
+    # A Claimed Row without a Response, as Committed by a Worker which has not Saved yet.
+    async with session_factory() as db:
+        db.add(IdempotencyRecord(key="retry-1", endpoint="/orders/add", user_id=user["id"],
+                                 request_hash="0" * 64))
+        await db.commit()
+
+    with pytest.raises(HTTPException) as error:
+        await _send(session_factory, user, b"{}")
+    assert error.value.status_code == 409
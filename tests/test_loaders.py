@@ -0,0 +1,67 @@
+from schemas.order import Order, CartItems
+from schemas.product import Category, Product
+from tests.sqlite_schema import create_tables
+from utils.loaders import ORDER_LOADERS
+from utils.responses import list_response
+from validations.order import OrderResponse
+from sqlalchemy import event
+from sqlalchemy.future import select
+from uuid import uuid4
+import json
+import pytest
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def seed(engine, session_factory):
+    await create_tables(engine, Category.__table__, Product.__table__, Order.__table__, CartItems.__table__)
+
+    async def _seed(orders: int, items_per_order: int = 3):
+        async with session_factory() as db:
+            category = Category(category="Groceries")
+            products = [Product(id=uuid4(), name=f"Product {i}", description="", price=2.5,
+                                is_removed=False, category=category)
+                        for i in range(items_per_order)]
+            db.add_all(products)
+            for _ in range(orders):
+                db.add(Order(id=uuid4(), store_id=uuid4(), customer_id=uuid4(), order_amount=7.5,
+                             discount_amount=0.0, tax=1.35, status="Pending", order_mode="Offline",
+                             items=[CartItems(product=product, quantity=1, discount=0.0) for product in products]))
+            await db.commit()
+
+    return _seed
+
+
+@pytest.fixture
+def statements(engine) -> list[str]:
+    issued = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        issued.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _count)
+    yield issued
+    event.remove(engine.sync_engine, "before_cursor_execute", _count)
+
+
+async def _list_orders(session_factory) -> list[dict]:
+    async with session_factory() as db:
+        orders = (await db.execute(select(Order).options(*ORDER_LOADERS))).scalars().all()
+        # Lazy Loading a Relation would Fail here, the Response must only Walk Loaded ones.
+        return json.loads(list_response(OrderResponse, orders).body)
+
+
+@pytest.mark.parametrize("orders", [1, 5, 30])
+async def test_order_list_statements_do_not_grow_with_rows(seed, session_factory, statements, orders):
+    await seed(orders)
+    statements.clear()
+
+    body = await _list_orders(session_factory)
+
+    # The Orders, then their Items joined with Product and Category.
+    assert len(statements) == 2
+    assert len(body) == orders
+    assert all(item["product"]["category"] == "Groceries"
+               for order in body for item in order["items"])
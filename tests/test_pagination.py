@@ -0,0 +1,87 @@
+from schemas.product import Product
+from tests.sqlite_schema import create_tables
+from utils.filters import PRODUCT_SORTS, parse_sort
+from utils.pagination import fetch_page
+from fastapi import HTTPException
+from sqlalchemy.future import select
+from uuid import uuid4
+import pytest
+import random
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def products(engine, session_factory) -> list[Product]:
+    await create_tables(engine, Product.__table__)
+    rng = random.Random(7)
+    # Few Distinct Prices and Names, so Pages Split Runs of Equal Sort Values.
+    rows = [Product(id=uuid4(), name=f"Product {rng.randint(1, 5)}", description="",
+                    price=rng.choice((1.5, 2.0, 9.99)), is_removed=False, category_id=1)
+            for _ in range(57)]
+    async with session_factory() as db:
+        db.add_all(rows)
+        await db.commit()
+    return rows
+
+
+def _sorted(rows: list[Product], sort_keys) -> list:
+    # Stable Sorts from the Last Key to the First give the Multi Key Order.
+    rows = list(rows)
+    for column, desc in reversed(sort_keys):
+        rows.sort(key=lambda row: getattr(row, column.key), reverse=desc)
+    return [row.id for row in rows]
+
+
+async def _walk(session_factory, sort_keys, limit: int) -> list:
+    seen, cursor = [], None
+    async with session_factory() as db:
+        while True:
+            rows, cursor = await fetch_page(db, select(Product), sort_keys, limit, cursor)
+            assert len(rows) <= limit
+            seen.extend(row.id for row in rows)
+            if cursor is None:
+                return seen
+
+
+@pytest.mark.parametrize("sort", [None, "price", "-price", "price,-name", "-name,price"])
+@pytest.mark.parametrize("limit", [1, 10, 57, 100])
+async def test_pages_cover_every_row_once_in_order(products, session_factory, sort, limit):
+    sort_keys = parse_sort(sort, PRODUCT_SORTS, Product.id)
+    assert await _walk(session_factory, sort_keys, limit) == _sorted(products, sort_keys)
+
+
+async def test_cursor_from_another_sort_is_rejected(products, session_factory):
+    async with session_factory() as db:
+        _, cursor = await fetch_page(db, select(Product), parse_sort("-price", PRODUCT_SORTS, Product.id), 10)
+
+        for sort in ("price", "-name"):
+            with pytest.raises(HTTPException) as error:
+                await fetch_page(db, select(Product), parse_sort(sort, PRODUCT_SORTS, Product.id), 10, cursor)
+            assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "e30", "W10"])
+async def test_malformed_cursor_is_rejected(products, session_factory, cursor):
+    async with session_factory() as db:
+        with pytest.raises(HTTPException) as error:
+            await fetch_page(db, select(Product), parse_sort(None, PRODUCT_SORTS, Product.id), 10, cursor)
+        assert error.value.status_code == 400
+
+
+async def test_offset_is_ignored_with_cursor(products, session_factory):
+    sort_keys = parse_sort("price", PRODUCT_SORTS, Product.id)
+    async with session_factory() as db:
+        first, cursor = await fetch_page(db, select(Product), sort_keys, 10)
+        second, _ = await fetch_page(db, select(Product), sort_keys, 10, cursor, offset=30)
+        skipped, _ = await fetch_page(db, select(Product), sort_keys, 10, offset=10)
+
+    assert [row.id for row in second] == [row.id for row in skipped]
+
+
+async def test_limit_below_one_is_rejected(products, session_factory):
+    async with session_factory() as db:
+        with pytest.raises(HTTPException) as error:
+            await fetch_page(db, select(Product), parse_sort(None, PRODUCT_SORTS, Product.id), 0)
+        assert error.value.status_code == 400
@@ -0,0 +1,77 @@
+from utils.cart_creator import create_cart_items
+from utils.pricing import (
+    CartTotals,
+    price_cart,
+    price_carts,
+    tax_rate_for_store,
+    to_basis_points,
+    to_cents
+)
+from utils.product_cache import CachedProduct
+from validations.order import CartItemBase
+from uuid import uuid4
+import pytest
+import random
+
+
+def _random_cart(rng: random.Random, size: int) -> list[tuple[int, int, int]]:
+    return [(rng.randint(1, 500_000), rng.randint(1, 50), rng.choice((0, 250, 1000, 1250, 3333)))
+            for _ in range(size)]
+
+
+def test_conversions_round_half_up():
+    # 1.005 is 1.00499... as a Float, the Decimal Conversion still gives the Intended Cent.
+    assert to_cents(1.005) == 101
+    assert to_cents(19.99) == 1999
+    assert to_basis_points(0.125) == 1250
+    assert to_basis_points("0.18") == 1800
+
+
+def test_cart_is_rounded_per_line():
+    # 3 x 19.99 at 10% off: 59.97 - 6.00 (5.997 Rounded), Tax 18% of 53.97 is 9.7146, so 9.71.
+    totals = price_cart([(1999, 3, 1000)], tax_bp=1800)
+    assert totals == CartTotals(5997, 600, 971)
+    assert totals.as_currency() == (59.97, 6.0, 9.71)
+
+    # Two Lines of 0.05 at 10% off Round to 0.01 each, not 0.01 for the Sum of 0.10.
+    assert price_cart([(5, 1, 1000), (5, 1, 1000)], tax_bp=0).discount == 2
+
+
+def test_batch_matches_single_carts():
+    rng = random.Random(16)
+    carts = [_random_cart(rng, rng.randint(0, 20)) for _ in range(200)]
+    assert price_carts(carts, 1800) == [price_cart(cart, 1800) for cart in carts]
+
+
+def test_vectorized_matches_scalar(monkeypatch):
+    pytest.importorskip("numpy")
+    import utils.pricing as pricing
+
+    rng = random.Random(61)
+    carts = [_random_cart(rng, rng.randint(0, 300)) for _ in range(50)]
+    vectorized = price_carts(carts, 1800)
+    single = [price_cart(cart, 1800) for cart in carts]
+
+    monkeypatch.setattr(pricing, "np", None)
+    assert vectorized == single == price_carts(carts, 1800)
+
+
+def test_order_pricing_matches_bulk_pricing():
+    # The Single Order (create_cart_items) and Bulk Order Paths Price the same Cart alike.
+    rng = random.Random(17)
+    products = {}
+    items = []
+    for _ in range(12):
+        product = CachedProduct(uuid4(), rng.randint(1, 99_999) / 100, False, 1)
+        products[product.id] = product
+        items.append(CartItemBase(product_id=product.id,
+                                  quantity=rng.randint(1, 9),
+                                  discount=rng.choice((0.0, 0.05, 0.125, 0.3))))
+
+    store_id = uuid4()
+    _, amount, discount, tax = create_cart_items(items, products, store_id)
+
+    lines = [(to_cents(products[item.product_id].price), item.quantity, to_basis_points(item.discount))
+             for item in items]
+    [bulk_totals] = price_carts([lines], tax_rate_for_store(store_id))
+    assert (amount, discount, tax) == bulk_totals.as_currency()
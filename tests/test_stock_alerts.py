@@ -0,0 +1,87 @@
+from schemas.inventory import Inventory, StoreInventorySummary
+from schemas.product import Product
+from tests.sqlite_schema import create_tables
+from utils import stock_alerts
+from utils.inventory_summary import LOW_STOCK_THRESHOLD, apply_inventory_changes
+from utils.stock_alerts import evaluate_stock_changes
+from uuid import uuid4
+import asyncio
+import pytest
+import time
+
+
+pytestmark = pytest.mark.anyio
+
+STORE_ID = uuid4()
+
+
+@pytest.fixture
+async def stock(engine, session_factory, monkeypatch) -> dict:
+    """Products of the Store by Name: (ID, Reorder Threshold), None Falls back to LOW_STOCK_THRESHOLD."""
+    await create_tables(engine, Product.__table__, Inventory.__table__, StoreInventorySummary.__table__)
+    monkeypatch.setattr(stock_alerts, "AsyncSessionLocal", session_factory)
+
+    thresholds = {"default": None, "custom": 5, "zero": 0}
+    products = {name: uuid4() for name in thresholds}
+    async with session_factory() as db:
+        for name, product_id in products.items():
+            db.add(Product(id=product_id, name=name, description="", price=2.5, is_removed=False, category_id=1))
+            db.add(Inventory(store_id=STORE_ID, product_id=product_id, quantity=50,
+                             max_discount_amount=0.0, reorder_threshold=thresholds[name]))
+        await db.commit()
+    return products
+
+
+async def _alerts(changes: dict) -> list[dict]:
+    return await evaluate_stock_changes([(time.monotonic(), STORE_ID, changes)])
+
+
+async def test_alert_only_when_crossing_below_threshold(stock):
+    default, custom = stock["default"], stock["custom"]
+    below = LOW_STOCK_THRESHOLD - 1
+
+    [alert] = await _alerts({default: (LOW_STOCK_THRESHOLD, below)})
+    assert alert["product_id"] == str(default)
+    assert alert["reorder_threshold"] == LOW_STOCK_THRESHOLD
+    assert (alert["previous_quantity"], alert["quantity"], alert["out_of_stock"]) == (LOW_STOCK_THRESHOLD, below, False)
+
+    # Already Below, or still at the Threshold: no new Alert.
+    assert await _alerts({default: (below, below - 1)}) == []
+    assert await _alerts({custom: (8, 5)}) == []
+
+    [alert] = await _alerts({custom: (5, 0)})
+    assert (alert["reorder_threshold"], alert["out_of_stock"]) == (5, True)
+
+
+async def test_new_row_below_threshold_alerts(stock):
+    [alert] = await _alerts({stock["custom"]: (None, 3)})
+    assert alert["previous_quantity"] is None
+
+
+async def test_zero_threshold_never_alerts(stock):
+    assert await _alerts({stock["zero"]: (50, 0)}) == []
+
+
+async def test_committed_decreases_are_queued(stock, session_factory, monkeypatch):
+    queue = asyncio.Queue()
+    monkeypatch.setattr(stock_alerts, "_queue", queue)
+    default, custom = stock["default"], stock["custom"]
+
+    async with session_factory() as db:
+        await apply_inventory_changes(db, STORE_ID, {default: (50, 4), custom: (50, 60)})
+        await db.rollback()
+    assert queue.empty()
+
+    async with session_factory() as db:
+        await apply_inventory_changes(db, STORE_ID, {default: (50, 4), custom: (50, 60)})
+        assert queue.empty()
+        await db.commit()
+
+    # Only the Decrease can Cross a Threshold.
+    batch = [queue.get_nowait()]
+    assert queue.empty()
+    _, store_id, changes = batch[0]
+    assert (store_id, changes) == (STORE_ID, {default: (50, 4)})
+
+    [alert] = await evaluate_stock_changes(batch)
+    assert alert["product_id"] == str(default)
@@ -6,10 +6,20 @@ from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from dotenv import load_dotenv
 import os
 import re
+import time
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from schemas.user import User
+from schemas.revoked_token import RevokedToken
+from utils.db import AsyncSessionLocal
+from utils.cache import TTLCache
 from uuid import UUID
 from datetime import timedelta, datetime, timezone
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
 
 
 load_dotenv()
@@ -17,6 +27,14 @@ load_dotenv()
 
 SECRET_KEY = os.environ.get("SECRET_KEY")
 ALGORITHM = os.environ.get("HASHING_ALGORITHM")
+# Decoded Claims are Cached per Token, 0 Disables the Cache.
+TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", 10_000))
+# A Cached Token is Checked against the Revocations again after this many Seconds,
+# it Bounds how long a Worker keeps Accepting a Token Revoked through another one.
+TOKEN_CACHE_TTL = float(os.environ.get("TOKEN_CACHE_TTL", 30))
+# Bcrypt runs on its own Bounded Pool so it never Blocks the Event Loop.
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 4))
+PASSWORD_HASH_MAX_QUEUE = int(os.environ.get("PASSWORD_HASH_MAX_QUEUE", 100))
 
 bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/login")
@@ -24,27 +42,72 @@ oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 auth_form = Annotated[OAuth2PasswordRequestForm, Depends()]
 
+token_cache = TTLCache(max_size=TOKEN_CACHE_SIZE, ttl=0)
+
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS,
+                                       thread_name_prefix="password-hash")
+_password_jobs_in_flight = 0
+
 
 def is_email(value: str) -> bool:
     email_pattern = r"[^@]+@[^@]+\.[^@]+"
     return re.fullmatch(email_pattern, value) is not None
 
 
-def authenticate_user(username: str, password: str, db: Session) -> User | None:
+async def _run_password_job(func, *args):
+    global _password_jobs_in_flight
+    if _password_jobs_in_flight - PASSWORD_HASH_WORKERS >= PASSWORD_HASH_MAX_QUEUE:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too Many Authentication Requests, Try Again Later."
+        )
+
+    _password_jobs_in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(password_executor, func, *args)
+    finally:
+        _password_jobs_in_flight -= 1
+
+
+async def hash_password(password: str) -> str:
+    return await _run_password_job(bcrypt_context.hash, password)
+
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    return await _run_password_job(bcrypt_context.verify, password, hashed_password)
+
+
+def password_hashing_stats() -> dict:
+    return {
+        "workers": PASSWORD_HASH_WORKERS,
+        "in_flight": _password_jobs_in_flight,
+        "queued": max(0, _password_jobs_in_flight - PASSWORD_HASH_WORKERS),
+        "max_queue": PASSWORD_HASH_MAX_QUEUE
+    }
+
+
+async def authenticate_user(username: str, password: str, db: AsyncSession) -> User | None:
     try:
         if is_email(username):
-            user = db.query(User).filter(User.email == username).first()
+            stmt = select(User).where(User.email == username)
         else:
-            user = db.query(User).filter(User.username == username).first()
+            stmt = select(User).where(User.username == username)
+
+        result = await db.execute(stmt)
+        user = result.scalar_one_or_none()
 
         if not user:
             return None
 
-        if not bcrypt_context.verify(password, user.password):
+        if not await verify_password(password, user.password):
             return None
 
         return user
 
+    except HTTPException as e:
+        raise e
+
     except Exception as e:
         return None
 
@@ -62,26 +125,77 @@ def create_access_token(username: str, user_id: UUID, is_internal_user: bool,
     return jwt.encode(encode, SECRET_KEY, ALGORITHM)
 
 
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+async def revoke_token(token: str, db: AsyncSession):
+    """Reject the Token from now on, on every Worker, even though its Signature and Expiry are Valid."""
+    try:
+        expires_at = float(jwt.get_unverified_claims(token).get("exp", 0))
+    except JWTError:
+        return
+
+    key = _token_key(token)
+    now = datetime.now(timezone.utc)
+    await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+    if expires_at > now.timestamp():
+        await db.execute(
+            insert(RevokedToken)
+            .values(token_hash=key, expires_at=datetime.fromtimestamp(expires_at, timezone.utc))
+            .on_conflict_do_nothing()
+        )
+    await db.commit()
+    token_cache.invalidate(key)
+
+
+async def token_cache_stats(db: AsyncSession) -> dict:
+    result = await db.execute(select(func.count()).select_from(RevokedToken))
+    return {**token_cache.stats(), "revoked": result.scalar_one()}
+
+
+async def _is_revoked(key: str) -> bool:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(RevokedToken.token_hash).where(RevokedToken.token_hash == key))
+        return result.first() is not None
+
+
+async def decode_access_token(token: str) -> dict:
+    key = _token_key(token)
+    claims = token_cache.get(key)
+    if claims is not None:
+        return claims
+
+    payload = jwt.decode(token, SECRET_KEY, ALGORITHM)
+    if await _is_revoked(key):
+        raise JWTError("Token has been Revoked.")
+
+    claims = {
+        "username": payload.get("sub"),
+        "id": payload.get("id"),
+        "level": payload.get("acc"),
+        "is_internal_user": payload.get("intuser")
+    }
+
+    # The Entry Expires with the Token, or after TOKEN_CACHE_TTL when that is Sooner.
+    ttl = min(float(payload.get("exp", 0)) - time.time(), TOKEN_CACHE_TTL)
+    if ttl > 0 and claims["username"] is not None and claims["id"] is not None:
+        token_cache.set(key, claims, ttl=ttl)
+
+    return claims
+
+
 async def get_current_user(token: Annotated[str, Depends(oauth2_bearer)]) -> dict:
     try:
-        payload = jwt.decode(token, SECRET_KEY, ALGORITHM)
-        username: str = payload.get("sub")
-        user_id: int = payload.get("id")
-        level: int = payload.get("acc")
-        is_internal_user: bool = payload.get("intuser")
+        claims = await decode_access_token(token)
 
-        if username is None or user_id is None:
+        if claims["username"] is None or claims["id"] is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate user."
             )
 
-        return {
-            "username": username,
-            "id": user_id,
-            "level": level,
-            "is_internal_user": is_internal_user
-        }
+        return dict(claims)
 
     except JWTError:
         raise HTTPException(
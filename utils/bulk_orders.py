@@ -0,0 +1,145 @@
+from schemas.order import Order, CartItems
+from schemas.customer import Customer
+from schemas.transaction import Transaction
+from validations.order import OrderRequest, BulkOrderResult, BulkOrderResponse
+from utils.check_inventory import lock_inventory, remove_inventory_bulk
+from utils.pricing import price_carts, tax_rate_for_store, to_basis_points, to_cents
+from utils.product_cache import fetch_products
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+from dotenv import load_dotenv
+import os
+import time
+
+
+load_dotenv()
+
+ORDER_BULK_MAX_SIZE = int(os.environ.get("ORDER_BULK_MAX_SIZE", 1000))
+
+
+def _requested_quantities(order: OrderRequest) -> dict[UUID, int]:
+    requested: dict[UUID, int] = {}
+    for item in order.items:
+        requested[item.product_id] = requested.get(item.product_id, 0) + item.quantity
+    return requested
+
+
+async def create_orders_bulk(orders: list[OrderRequest],
+                             current_user: dict,
+                             db: AsyncSession) -> BulkOrderResponse:
+    """
+    Places a Batch of Orders in a single Transaction.
+    Customers and Products are Resolved with one Query each, the Inventory Rows are Locked once
+    and Allocated to the Orders in Request Order, an Order that cannot be Served is Rejected
+    without Affecting the others. A Product Repeated in a Cart is Allocated its Summed Quantity,
+    its Lines are Kept (and Priced) as Sent, as for a single Order. The Decrements are then
+    Applied with one UPDATE and the Orders, Cart Items and Transactions are Inserted with one
+    Multi-Row INSERT each.
+    """
+    start = time.perf_counter()
+    results: dict[int, BulkOrderResult] = {}
+
+    def _reject(index: int, message: str):
+        results[index] = BulkOrderResult(index=index, status="Failed", detail=message)
+
+    result = await db.execute(
+        select(Customer.id).where(Customer.id.in_({order.customer_id for order in orders})))
+    customer_ids = set(result.scalars().all())
+    products = await fetch_products({item.product_id for order in orders for item in order.items}, db)
+
+    candidates: list[tuple[int, OrderRequest, dict[UUID, int]]] = []
+    for index, order in enumerate(orders):
+        if order.customer_id not in customer_ids:
+            _reject(index, "Customer Not Found")
+        elif not order.items:
+            _reject(index, "Cannot Place Order with an Empty Cart")
+        elif missing := [str(item.product_id) for item in order.items if item.product_id not in products]:
+            _reject(index, f"Products Not Found: {', '.join(missing)}")
+        elif removed := [str(item.product_id) for item in order.items if products[item.product_id].is_removed]:
+            _reject(index, f"Products No Longer Sold: {', '.join(removed)}")
+        else:
+            candidates.append((index, order, _requested_quantities(order)))
+
+    available = await lock_inventory(
+        {(order.store_id, product_id) for _, order, requested in candidates for product_id in requested}, db)
+
+    accepted: list[tuple[int, OrderRequest]] = []
+    decrements: dict[tuple[UUID, UUID], int] = {}
+    for index, order, requested in candidates:
+        short = [f"Product {product_id}: Requested {quantity}, "
+                 f"Only {available.get((order.store_id, product_id), 0)} Available"
+                 for product_id, quantity in requested.items()
+                 if available.get((order.store_id, product_id), 0) < quantity]
+        if short:
+            _reject(index, f"Not enough inventory in Store {order.store_id}. {'; '.join(short)}")
+            continue
+
+        for product_id, quantity in requested.items():
+            key = (order.store_id, product_id)
+            available[key] -= quantity
+            decrements[key] = decrements.get(key, 0) + quantity
+        accepted.append((index, order))
+
+    # Carts of a Store share its Tax Rate, so each Store is Priced as one Batch.
+    by_store: dict[UUID, list[tuple[int, OrderRequest]]] = {}
+    for index, order in accepted:
+        by_store.setdefault(order.store_id, []).append((index, order))
+
+    now = datetime.now(timezone.utc)
+    order_rows, item_rows, transaction_rows = [], [], []
+    for store_id, store_orders in by_store.items():
+        carts = [[(to_cents(products[item.product_id].price), item.quantity, to_basis_points(item.discount))
+                  for item in order.items]
+                 for _, order in store_orders]
+        totals = price_carts(carts, tax_rate_for_store(store_id))
+
+        for (index, order), cart_totals in zip(store_orders, totals):
+            order_id = uuid4()
+            order_amount, discount_amount, tax = cart_totals.as_currency()
+            order_rows.append({
+                "id": order_id,
+                "store_id": store_id,
+                "customer_id": order.customer_id,
+                "order_amount": order_amount,
+                "discount_amount": discount_amount,
+                "tax": tax,
+                "status": order.status,
+                "date_placed": order.date_placed or now,
+                "date_received": order.date_received,
+                "order_mode": order.order_mode,
+                "order_delivery_address": order.order_delivery_address
+            })
+            item_rows.extend({
+                "order_id": order_id,
+                "product_id": item.product_id,
+                "quantity": item.quantity,
+                "discount": item.discount
+            } for item in order.items)
+            transaction_rows.append({
+                "id": uuid4(),
+                "type": "Sale",
+                "date": now,
+                "operation_id": order_id,
+                "request_made_by": current_user["id"],
+                "store_id": store_id
+            })
+            results[index] = BulkOrderResult(index=index, status="Created", order_id=order_id)
+
+    if order_rows:
+        await remove_inventory_bulk(decrements, db)
+        await db.execute(insert(Order), order_rows)
+        await db.execute(insert(CartItems), item_rows)
+        await db.execute(insert(Transaction), transaction_rows)
+        await db.commit()
+
+    duration = time.perf_counter() - start
+    return BulkOrderResponse(
+        created=len(order_rows),
+        failed=len(orders) - len(order_rows),
+        results=[results[index] for index in range(len(orders))],
+        duration_seconds=round(duration, 3),
+        orders_per_second=round(len(orders) / duration, 1) if duration > 0 else 0.0
+    )
@@ -1,29 +1,27 @@
 from fastapi import HTTPException
 from schemas.order import CartItems
 from validations.order import CartItemBase
-from typing import List
+from utils.pricing import price_cart, tax_rate_for_store, to_basis_points, to_cents
+from typing import List, Optional
+from uuid import UUID
 
 
 def create_cart_items(order_items: List[CartItemBase | CartItems],
                       products: dict,
-                      tax_rate: int = 0.18):
-    total_amount = 0
-    total_discount = 0
-    total_tax = 0
+                      store_id: Optional[UUID] = None):
+    """
+    Builds the Cart Lines and Prices them with the Shared Pricing Engine (see utils/pricing.py),
+    using the Tax Rate of the Store. Returns (Cart Items, Amount, Discount, Tax).
+    """
     cart_items = []
+    lines = []
     for item in order_items:
         if item.product_id not in products:
             raise HTTPException(
                 status_code=404, detail=f"Product {item.product_id} not found")
 
         product = products[item.product_id]
-        item_price = product.price * item.quantity
-        item_discount = item_price * item.discount
-        item_tax = (item_price - item_discount) * tax_rate
-
-        total_amount += item_price
-        total_discount += item_discount
-        total_tax += item_tax
+        lines.append((to_cents(product.price), item.quantity, to_basis_points(item.discount)))
 
         cart_items.append(CartItems(
             product_id=item.product_id,
@@ -31,4 +29,5 @@ def create_cart_items(order_items: List[CartItemBase | CartItems],
             discount=item.discount
         ))
 
-    return cart_items, total_amount, total_discount, total_tax
+    totals = price_cart(lines, tax_rate_for_store(store_id))
+    return cart_items, *totals.as_currency()
@@ -5,22 +5,60 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from schemas.refund import Refund
 from schemas.transaction import Transaction
 from sqlalchemy.future import select
+from sqlalchemy import update, values, column, tuple_, Integer, Uuid
+from utils.inventory_summary import apply_inventory_changes
 
 
 async def check_and_remove_inventory(order: Order,
-                               store_id: UUID,
-                               db: AsyncSession):
-    products = {p.product_id: p for p in order.items}
-    stmt = select(Inventory).where(Inventory.product_id.in_(products), Inventory.store_id == store_id)
+                                     store_id: UUID,
+                                     db: AsyncSession) -> dict[UUID, int]:
+    """
+    Decrements the Store Inventory for every Cart Line with a Single Conditional UPDATE,
+    so Concurrent Checkouts cannot Oversell. Returns the New Quantities by Product.
+    Raises ValueError naming every Line without Enough Stock, the Caller must then Rollback.
+    """
+    requested: dict[UUID, int] = {}
+    for item in order.items:
+        requested[item.product_id] = requested.get(item.product_id, 0) + item.quantity
+
+    cart = values(
+        column("product_id", Uuid),
+        column("quantity", Integer),
+        name="cart"
+    ).data(list(requested.items()))
+
+    stmt = (
+        update(Inventory)
+        .where(Inventory.store_id == store_id,
+               Inventory.product_id == cart.c.product_id,
+               Inventory.quantity >= cart.c.quantity)
+        .values(quantity=Inventory.quantity - cart.c.quantity)
+        .returning(Inventory.product_id, Inventory.quantity, Inventory.reorder_threshold)
+        .execution_options(synchronize_session=False)
+    )
     results = await db.execute(stmt)
-    inventories = results.scalars().all()
-    for inventory in inventories:
-        product = products[inventory.product_id]
-        if inventory.quantity < product.quantity:
-            raise ValueError(f"Not enough inventory for Product {product.id} in Store {store_id}.\
-                                        Only {inventory.quantity} Available.")
+    updated, thresholds = {}, {}
+    for row in results:
+        updated[row.product_id] = row.quantity
+        thresholds[row.product_id] = (row.reorder_threshold, row.reorder_threshold)
+
+    failed = [product_id for product_id in requested if product_id not in updated]
+    if failed:
+        stmt = select(Inventory.product_id, Inventory.quantity).where(
+            Inventory.store_id == store_id, Inventory.product_id.in_(failed))
+        results = await db.execute(stmt)
+        available = {row.product_id: row.quantity for row in results}
+        details = "; ".join(
+            f"Product {product_id}: Requested {requested[product_id]}, "
+            f"Only {available.get(product_id, 0)} Available"
+            for product_id in failed)
+        raise ValueError(f"Not enough inventory in Store {store_id}. {details}")
 
-        inventory.quantity -= product.quantity
+    await apply_inventory_changes(db, store_id, {
+        product_id: (quantity + requested[product_id], quantity)
+        for product_id, quantity in updated.items()
+    }, thresholds)
+    return updated
 
 
 async def check_and_add_inventory(order, operation_type: str, db: AsyncSession):
@@ -41,6 +79,66 @@ async def check_and_add_inventory(order, operation_type: str, db: AsyncSession):
     results = await db.execute(stmt)
     inventories = results.scalars().all()
     
+    changes = {}
     for inventory in inventories:
         product = products[inventory.product_id]
+        changes[inventory.product_id] = (inventory.quantity, inventory.quantity + product.quantity)
         inventory.quantity += product.quantity
+
+    await apply_inventory_changes(db, order.store_id, changes)
+
+
+async def lock_inventory(keys: set[tuple[UUID, UUID]],
+                         db: AsyncSession) -> dict[tuple[UUID, UUID], int]:
+    """
+    Reads and Locks the Inventory Rows of the given (Store, Product) Pairs with one Query,
+    Rows are Locked in Key Order, so Concurrent Batches cannot Deadlock.
+    """
+    if not keys:
+        return {}
+
+    stmt = (
+        select(Inventory.store_id, Inventory.product_id, Inventory.quantity)
+        .where(tuple_(Inventory.store_id, Inventory.product_id).in_(keys))
+        .order_by(Inventory.store_id, Inventory.product_id)
+        .with_for_update()
+    )
+    results = await db.execute(stmt)
+    return {(row.store_id, row.product_id): row.quantity for row in results}
+
+
+async def remove_inventory_bulk(requested: dict[tuple[UUID, UUID], int], db: AsyncSession):
+    """
+    Applies the Aggregated Decrements of many Orders, across Stores, with a Single UPDATE.
+    The Rows must be Locked (see lock_inventory) and the Quantities Checked beforehand.
+    """
+    if not requested:
+        return
+
+    cart = values(
+        column("store_id", Uuid),
+        column("product_id", Uuid),
+        column("quantity", Integer),
+        name="cart"
+    ).data([(store_id, product_id, quantity)
+            for (store_id, product_id), quantity in requested.items()])
+
+    stmt = (
+        update(Inventory)
+        .where(Inventory.store_id == cart.c.store_id,
+               Inventory.product_id == cart.c.product_id)
+        .values(quantity=Inventory.quantity - cart.c.quantity)
+        .returning(Inventory.store_id, Inventory.product_id, Inventory.quantity, Inventory.reorder_threshold)
+        .execution_options(synchronize_session=False)
+    )
+    results = await db.execute(stmt)
+
+    changes: dict[UUID, dict] = {}
+    thresholds: dict[UUID, dict] = {}
+    for row in results:
+        removed = requested[(row.store_id, row.product_id)]
+        changes.setdefault(row.store_id, {})[row.product_id] = (row.quantity + removed, row.quantity)
+        thresholds.setdefault(row.store_id, {})[row.product_id] = (row.reorder_threshold, row.reorder_threshold)
+
+    for store_id, store_changes in changes.items():
+        await apply_inventory_changes(db, store_id, store_changes, thresholds[store_id])
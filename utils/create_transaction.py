@@ -29,5 +29,5 @@ async def add_transaction(record, request_made_by: UUID, db: Session):
                                        operation_id=record.id,
                                        request_made_by=request_made_by)
 
-    transaction = Transaction(**validation_model.model_dump())
-    await db.add(transaction)
+    transaction = Transaction(**validation_model.model_dump(), store_id=record.store_id)
+    db.add(transaction)
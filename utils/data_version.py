@@ -0,0 +1,38 @@
+"""
+Shared Version Counters (schemas/data_version.py).
+
+A Writer Increments the Counters of the Data it Changes inside its own Transaction, so a
+Version becomes Visible to every Worker together with the Data, and never before it.
+Readers take the Version from the Session that also Reads the Data (Primary or Replica),
+a Cache Keyed on it can therefore not hold Data Older than its Version.
+"""
+from schemas.data_version import DataVersion
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from typing import Iterable
+
+
+def increment_statement(names: Iterable[str]):
+    # Sorted, so Concurrent Writers Lock the Counter Rows in the same Order.
+    stmt = insert(DataVersion).values([{"name": name, "version": 1} for name in sorted(set(names))])
+    return stmt.on_conflict_do_update(
+        index_elements=[DataVersion.name],
+        set_={"version": DataVersion.version + 1}
+    )
+
+
+async def increment_versions(db: AsyncSession, names: Iterable[str]):
+    """Call in the Writing Transaction, before its Commit."""
+    names = set(names)
+    if names:
+        await db.execute(increment_statement(names))
+
+
+async def get_versions(db: AsyncSession, names: Iterable[str]) -> dict[str, int]:
+    """Current Versions, 0 for Data that was never Written."""
+    names = set(names)
+    result = await db.execute(select(DataVersion.name, DataVersion.version).where(DataVersion.name.in_(names)))
+    versions = dict.fromkeys(names, 0)
+    versions.update(result.tuples().all())
+    return versions
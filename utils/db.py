@@ -1,11 +1,18 @@
 from schemas import *
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy import text, event
 from typing import Annotated, AsyncGenerator
-from fastapi import Depends
+from fastapi import Depends, Request, Response
+from jose import jwt, JWTError
 from sqlalchemy.exc import SQLAlchemyError
 from dotenv import load_dotenv
 import os
+import time
 import asyncio
+import hashlib
+import hmac
+import math
 
 load_dotenv()
 
@@ -13,24 +20,150 @@ db_user = os.environ.get("DB_USER")
 db_password = os.environ.get("DB_PASSWORD")
 db_url = os.environ.get("DB_URL")
 db_name = os.environ.get("DB_NAME")
+db_replica_url = os.environ.get("DB_REPLICA_URL")
 
 
 DATABASE_URL = f"postgresql+asyncpg://{db_user}:{db_password}@{db_url}/{db_name}"
+REPLICA_DATABASE_URL = (
+    f"postgresql+asyncpg://{db_user}:{db_password}@{db_replica_url}/{db_name}"
+    if db_replica_url else None
+)
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+
+##########################
+# Connection Pool Config
+##########################
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_echo(name: str):
+    """SQL Echo Level: 'false' (default), 'true' or 'debug' (also logs result rows)."""
+    value = os.environ.get(name, "false").strip().lower()
+    if value == "debug":
+        return "debug"
+    return value in ("1", "true", "yes", "on")
+
+
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 20))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+DB_STATEMENT_TIMEOUT_MS = int(os.environ.get("DB_STATEMENT_TIMEOUT_MS", 0))
+DB_POOL_WARMUP = int(os.environ.get("DB_POOL_WARMUP", 0))
+DB_ECHO = _env_echo("DB_ECHO")
+# Seconds for which a Client that has Written keeps Reading from the Primary.
+DB_READ_YOUR_WRITES_WINDOW = float(os.environ.get("DB_READ_YOUR_WRITES_WINDOW", 5))
+
+
+def build_engine(url: str):
+    connect_args = {}
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        # Server Side Timeout, Applied to every Connection opened by the Pool.
+        connect_args["server_settings"] = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+
+    return create_async_engine(
+        url,
+        echo=DB_ECHO,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args=connect_args
+    )
+
+
+engine = build_engine(DATABASE_URL)
+
+# Falls back to the Primary when no Replica is Configured.
+replica_engine = build_engine(REPLICA_DATABASE_URL) if REPLICA_DATABASE_URL else engine
 
 AsyncSessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
 
+ReadSessionLocal = async_sessionmaker(bind=replica_engine, expire_on_commit=False)
+
+
+##########################
+# Read-Your-Writes Window
+##########################
+
+# A Commit made for a User Sets this Cookie, Signed for that User and Valid for the Window.
+# Any Worker can then Check it, Reads of the same User within the Window go to the Primary.
+READ_YOUR_WRITES_COOKIE = "read_your_writes"
+_marker_key = (os.environ.get("SECRET_KEY") or "").encode()
+
+
+def _client_id(request: Request) -> str | None:
+    # Only Chooses between Primary and Replica, so the Token's Claims are Read without Verifying it.
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        user_id = jwt.get_unverified_claims(token).get("id")
+    except JWTError:
+        return None
+    return str(user_id) if user_id else None
+
+
+def _marker_signature(client_id: str, until: str) -> str:
+    return hmac.new(_marker_key, f"{client_id}:{until}".encode(), hashlib.sha256).hexdigest()
+
+
+@event.listens_for(Session, "after_commit")
+def _record_write(session: Session):
+    response, client_id = session.info.get("response"), session.info.get("client_id")
+    if response is None or not client_id:
+        return
+
+    until = str(math.ceil(time.time() + DB_READ_YOUR_WRITES_WINDOW))
+    response.set_cookie(READ_YOUR_WRITES_COOKIE, f"{until}.{_marker_signature(client_id, until)}",
+                        max_age=math.ceil(DB_READ_YOUR_WRITES_WINDOW), httponly=True, samesite="lax")
+
+
+def wrote_recently(request: Request) -> bool:
+    client_id = _client_id(request)
+    marker = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    if not client_id or not marker:
+        return False
+
+    until, _, signature = marker.partition(".")
+    return (until.isdigit() and int(until) > time.time()
+            and hmac.compare_digest(signature, _marker_signature(client_id, until)))
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
+
+async def get_db(request: Request, response: Response) -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal(info={"client_id": _client_id(request), "response": response}) as session:
+        try:
+            yield session
+
+        except SQLAlchemyError:
+            await session.rollback()
+            raise
+
+        finally:
+            await session.close()
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for Read-Only Routes, served by the Replica unless the Client has just Written."""
+    session_factory = ReadSessionLocal
+    if replica_engine is not engine and wrote_recently(request):
+        session_factory = AsyncSessionLocal
+
+    async with session_factory() as session:
         try:
             yield session
-            
+
         except SQLAlchemyError:
             await session.rollback()
             raise
-        
+
         finally:
             await session.close()
 
@@ -41,4 +174,39 @@ async def create_database():
     print("Database Created Successfully.")
 
 
+async def warm_up_pool(connections: int = DB_POOL_WARMUP):
+    """Open the given number of Pooled Connections before the App accepts Traffic."""
+    # Overflow Connections are Discarded on Return, only the Pool Size stays Warm.
+    connections = min(connections, DB_POOL_SIZE)
+    if connections <= 0:
+        return
+
+    async def _open_connection():
+        conn = await engine.connect().start()
+        try:
+            await conn.execute(text("SELECT 1"))
+        except BaseException:
+            await conn.close()
+            raise
+        return conn
+
+    # All Connections are held Open together, otherwise the Pool hands the same one back.
+    opened = await asyncio.gather(*(_open_connection() for _ in range(connections)), return_exceptions=True)
+    errors = [conn for conn in opened if isinstance(conn, BaseException)]
+    for conn in opened:
+        if not isinstance(conn, BaseException):
+            await conn.close()
+
+    if errors:
+        raise errors[0]
+    print(f"Database Pool Warmed Up with {connections} Connections.")
+
+
+async def dispose_engine():
+    await engine.dispose()
+    if replica_engine is not engine:
+        await replica_engine.dispose()
+
+
 db_dependency = Annotated[AsyncSession, Depends(get_db)]
+read_db_dependency = Annotated[AsyncSession, Depends(get_read_db)]
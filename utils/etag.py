@@ -0,0 +1,63 @@
+"""
+Conditional GETs for the Catalog Collections.
+
+Every Collection has a Version Counter in the Database (utils/data_version.py), Incremented by
+the Routes inside their Write Transaction. The List Routes Answer with a Strong ETag built from
+the Version, Read on the same Session that then Reads the List, a Client Sending it back in
+If-None-Match gets a 304 after that one Primary Key Lookup, instead of the List Query.
+All Workers see the same Counters, so they Agree on the ETags.
+"""
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from utils.data_version import increment_versions, get_versions
+from utils.db import read_db_dependency
+import hashlib
+
+
+# Lists which Embed another Collection (e.g. Categories with their Products) change with it.
+RELATED_COLLECTIONS = {
+    "products": ("categories",),
+    "categories": ("products",),
+    "stores": ("locations",),
+    "locations": ("stores",)
+}
+
+
+async def bump_versions(db: AsyncSession, *collections: str):
+    """Call in the Write's Transaction, before the Commit."""
+    await increment_versions(db, (name
+                                  for collection in collections
+                                  for name in (collection, *RELATED_COLLECTIONS.get(collection, ()))))
+
+
+def current_etag(collection: str, version: int, variant: str = "") -> str:
+    """The Variant tells apart Representations of the same Version, e.g. Pages of a List."""
+    tag = f"{collection}:{version}:{variant}"
+    return '"' + hashlib.sha1(tag.encode()).hexdigest() + '"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # Weak Comparison, as Required for If-None-Match.
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+
+def conditional_get(collection: str):
+    """
+    Dependency for a List Route, Raises 304 when the Client's Copy is Current,
+    otherwise Sets the ETag on the Injected Response (pass it on to list_response).
+    The Route's read_db_dependency is the same Session, the Version is Read before the List,
+    so a Write Racing with the Request can only make the Body Newer than its ETag.
+    """
+    async def checker(request: Request, response: Response, db: read_db_dependency) -> str:
+        versions = await get_versions(db, (collection,))
+        etag = current_etag(collection, versions[collection], request.url.query)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response.headers.update(headers)
+        return etag
+    return checker
@@ -0,0 +1,88 @@
+"""
+Declarative Filtering and Sorting for the List Routes.
+
+A List Declares its Filters as {Parameter: (Column, Comparison)} and its Sortable Columns,
+the Parameters arrive as a Pydantic Query Model (see validations/), so Malformed Values are
+Rejected before any Query is Built. Every Filter Compiles to a plain Column Comparison
+that the Indexes on those Columns can Serve, and the Sort Keys plug into the Keyset Pagination.
+"""
+from schemas.inventory import Inventory
+from schemas.product import Product
+from utils.pagination import SortKeys
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy.orm import InstrumentedAttribute
+from typing import Callable, Optional
+import operator
+
+
+FilterSpec = dict[str, tuple[InstrumentedAttribute, Callable]]
+
+
+def apply_filters(stmt, params: BaseModel, filters: FilterSpec):
+    """Adds a WHERE Clause for every Filter the Client has Set, the other Parameters are Skipped."""
+    for name, value in params.model_dump(exclude_none=True).items():
+        if name in filters:
+            column, compare = filters[name]
+            stmt = stmt.where(compare(column, value))
+    return stmt
+
+
+def parse_sort(sort: Optional[str],
+               sortable: dict[str, InstrumentedAttribute],
+               unique_key: InstrumentedAttribute) -> SortKeys:
+    """
+    Parses a Sort like "-price,name" (a Leading "-" Sorts Descending) into Keyset Sort Keys.
+    The Unique Key is Appended as the Tie Breaker, in the Direction of the Last Column,
+    so a Uniform Direction can still be Served by a Composite Index.
+    """
+    sort_keys = []
+    for field in filter(None, (part.strip() for part in (sort or "").split(","))):
+        desc = field.startswith("-")
+        name = field.lstrip("-+")
+        if name not in sortable:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"Cannot Sort by '{name}', Use one of: {', '.join(sortable)}")
+        if any(column is sortable[name] for column, _ in sort_keys):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"'{name}' is Sorted by more than once")
+        sort_keys.append((sortable[name], desc))
+
+    sort_keys.append((unique_key, sort_keys[-1][1] if sort_keys else False))
+    return sort_keys
+
+
+##################
+# Product Filters
+##################
+
+PRODUCT_FILTERS: FilterSpec = {
+    "price_gte": (Product.price, operator.ge),
+    "price_lte": (Product.price, operator.le),
+    "category_id": (Product.category_id, operator.eq),
+    "is_removed": (Product.is_removed, operator.eq),
+}
+
+PRODUCT_SORTS = {
+    "name": Product.name,
+    "price": Product.price,
+}
+
+
+####################
+# Inventory Filters
+####################
+
+INVENTORY_FILTERS: FilterSpec = {
+    "store_id": (Inventory.store_id, operator.eq),
+    "product_id": (Inventory.product_id, operator.eq),
+    "quantity_lt": (Inventory.quantity, operator.lt),
+    "quantity_gt": (Inventory.quantity, operator.gt),
+    "max_discount_amount_gte": (Inventory.max_discount_amount, operator.ge),
+    "max_discount_amount_lte": (Inventory.max_discount_amount, operator.le),
+}
+
+INVENTORY_SORTS = {
+    "quantity": Inventory.quantity,
+    "max_discount_amount": Inventory.max_discount_amount,
+}
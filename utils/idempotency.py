@@ -0,0 +1,182 @@
+"""
+Idempotency-Key Support for Create Endpoints.
+
+A Request sent with an Idempotency-Key Header Claims the Key (per User and Endpoint) with a Row
+in the Operation's own Transaction, and Stores its Response on that Row before Committing.
+Retries with the same Key get the Stored Response back instead of Executing again,
+Concurrent Duplicates Wait for the First Request to Finish and then get its Response.
+Committed Responses are also kept in an In-Memory LRU, so most Retries never reach the Database.
+"""
+from schemas.idempotency import IdempotencyRecord
+from utils.auth import user_dependency
+from utils.cache import TTLCache
+from utils.db import db_dependency
+from fastapi import Depends, HTTPException, Request, Response, status
+from pydantic import BaseModel
+from sqlalchemy import event, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, AsyncGenerator, NamedTuple, Optional
+from uuid import UUID
+from dotenv import load_dotenv
+import asyncio
+import hashlib
+import os
+
+
+load_dotenv()
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+IDEMPOTENCY_TTL = int(os.environ.get("IDEMPOTENCY_TTL", 24 * 60 * 60))
+IDEMPOTENCY_CACHE_SIZE = int(os.environ.get("IDEMPOTENCY_CACHE_SIZE", 10_000))
+IDEMPOTENCY_WAIT_TIMEOUT = float(os.environ.get("IDEMPOTENCY_WAIT_TIMEOUT", 30))
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+Scope = tuple[UUID, str, str]
+
+
+class StoredResponse(NamedTuple):
+    request_hash: str
+    status_code: int
+    body: str
+
+
+_responses = TTLCache(max_size=IDEMPOTENCY_CACHE_SIZE, ttl=IDEMPOTENCY_TTL)
+# Keys being Executed by this Process, Duplicates Wait on the Event.
+_in_flight: dict[Scope, asyncio.Event] = {}
+
+
+@event.listens_for(Session, "after_commit")
+def _cache_responses(session: Session):
+    for scope, stored in session.info.pop("idempotent_responses", []):
+        _responses.set(scope, stored)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_responses(session: Session):
+    session.info.pop("idempotent_responses", None)
+
+
+class IdempotentRequest:
+    def __init__(self, scope: Scope, request_hash: str):
+        self.scope = scope
+        self.request_hash = request_hash
+        # Set when the Key was already Used, the Route Returns it as it is.
+        self.replay: Optional[Response] = None
+
+    def _replay(self, stored: StoredResponse):
+        if stored.request_hash != self.request_hash:
+            raise HTTPException(status_code=422,
+                                detail=f"{IDEMPOTENCY_HEADER} was already used with a different Request Body")
+
+        self.replay = Response(content=stored.body,
+                               status_code=stored.status_code,
+                               media_type="application/json",
+                               headers={REPLAYED_HEADER: "true"})
+
+    async def claim(self, db: AsyncSession):
+        """
+        Inserts the Key in the Request Transaction, an Expired Row is Taken over.
+        While another Transaction holds the Key the Insert Blocks, once it Commits the Key is Replayed.
+        """
+        user_id, endpoint, key = self.scope
+        now = datetime.now(timezone.utc)
+        stmt = insert(IdempotencyRecord).values(
+            key=key, endpoint=endpoint, user_id=user_id,
+            request_hash=self.request_hash, created_at=now
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[IdempotencyRecord.key, IdempotencyRecord.endpoint, IdempotencyRecord.user_id],
+            set_={"request_hash": stmt.excluded.request_hash,
+                  "status_code": None,
+                  "response_body": None,
+                  "created_at": stmt.excluded.created_at},
+            where=IdempotencyRecord.created_at < now - timedelta(seconds=IDEMPOTENCY_TTL)
+        ).returning(IdempotencyRecord.key)
+
+        result = await db.execute(stmt)
+        if result.first():
+            return
+
+        # Columns, not the Object: the Rollback Expires it and it could not be Read afterwards.
+        stmt = select(IdempotencyRecord.request_hash,
+                      IdempotencyRecord.status_code,
+                      IdempotencyRecord.response_body).where(
+            IdempotencyRecord.key == key,
+            IdempotencyRecord.endpoint == endpoint,
+            IdempotencyRecord.user_id == user_id
+        )
+        result = await db.execute(stmt)
+        stored = StoredResponse(*result.one())
+        await db.rollback()
+        if stored.body is None:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT,
+                                detail=f"A Request with this {IDEMPOTENCY_HEADER} is already in Progress")
+        self._replay(stored)
+
+    async def save(self, db: AsyncSession, response: BaseModel, status_code: int = status.HTTP_201_CREATED):
+        """Stores the Response on the Claimed Row, must be called before the Route Commits."""
+        user_id, endpoint, key = self.scope
+        body = response.model_dump_json()
+        await db.execute(
+            update(IdempotencyRecord)
+            .where(IdempotencyRecord.key == key,
+                   IdempotencyRecord.endpoint == endpoint,
+                   IdempotencyRecord.user_id == user_id)
+            .values(status_code=status_code, response_body=body)
+            .execution_options(synchronize_session=False)
+        )
+        db.info.setdefault("idempotent_responses", []).append(
+            (self.scope, StoredResponse(self.request_hash, status_code, body)))
+
+
+async def idempotency_key(request: Request,
+                          db: db_dependency,
+                          current_user: user_dependency) -> AsyncGenerator[Optional[IdempotentRequest], None]:
+    """
+    Yields None for Requests without the Header. Otherwise the Route must Return
+    `replay` when it is Set, and call `save` with its Response before Committing.
+    """
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if key is None:
+        yield None
+        return
+
+    if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"{IDEMPOTENCY_HEADER} must be 1 to {IDEMPOTENCY_KEY_MAX_LENGTH} Characters")
+
+    scope: Scope = (UUID(str(current_user["id"])), request.url.path, key)
+    idempotent = IdempotentRequest(scope, hashlib.sha256(await request.body()).hexdigest())
+
+    while (running := _in_flight.get(scope)) is not None:
+        try:
+            await asyncio.wait_for(running.wait(), IDEMPOTENCY_WAIT_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT,
+                                detail=f"A Request with this {IDEMPOTENCY_HEADER} is already in Progress")
+
+    stored = _responses.get(scope)
+    if stored is not None:
+        idempotent._replay(stored)
+        yield idempotent
+        return
+
+    done = _in_flight[scope] = asyncio.Event()
+    try:
+        await idempotent.claim(db)
+        yield idempotent
+    finally:
+        del _in_flight[scope]
+        done.set()
+
+
+idempotency_dependency = Annotated[Optional[IdempotentRequest], Depends(idempotency_key)]
+
+
+def idempotency_stats() -> dict:
+    return {"in_flight": len(_in_flight), **_responses.stats()}
@@ -7,86 +7,98 @@ from schemas.restock import Restock
 from schemas.transaction import Transaction
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from utils.loaders import ORDER_LOADERS, REFUND_LOADERS, RESTOCK_LOADERS, REMOVAL_LOADERS
 from validations.store import StoreResponseWithRelations, StoreWithIncludeRelationsRequest
+import time
 
 
-async def load_store_related_data(store_model: StoreResponseWithRelations,
-                                  db: AsyncSession,
-                                  config: StoreWithIncludeRelationsRequest):
-    
+def _store_sections(config: StoreWithIncludeRelationsRequest) -> dict:
+    """Maps every Requested Section of the Store Response to its Query."""
+    sections = {}
+
     if config.inlcude_inventory:
-        stmt = (
+        sections["inventory"] = (
             select(Inventory)
             .where(Inventory.store_id == config.id)
             .offset(config.inventory_offset)
             .limit(config.records_limit)
         )
-        result = await db.execute(stmt)
-        store_model.inventory = result.scalars().all()
 
     if config.include_employee:
-        stmt = (
+        sections["employees"] = (
             select(Employee)
             .where(Employee.store_id == config.id)
             .offset(config.employee_offset)
             .limit(config.records_limit)
         )
-        result = await db.execute(stmt)
-        store_model.employees = result.scalars().all()
 
     if config.include_transactions:
-        stmt = (
+        sections["transactions"] = (
             select(Transaction)
             .where(Transaction.store_id == config.id)
             .order_by(Transaction.date.desc())
             .offset(config.transactions_offset)
             .limit(config.records_limit)
         )
-        result = await db.execute(stmt)
-        store_model.transactions = result.scalars().all()
 
     if config.include_restock:
-        stmt = (
+        sections["restocks"] = (
             select(Restock)
+            .options(*RESTOCK_LOADERS)
             .where(Restock.store_id == config.id)
-            .order_by(Restock.date.desc())
+            .order_by(Restock.date_placed.desc())
             .offset(config.restock_offset)
             .limit(config.records_limit)
         )
-        result = await db.execute(stmt)
-        store_model.restocks = result.scalars().all()
 
     if config.include_removal:
-        stmt = (
+        sections["removals"] = (
             select(StockRemoval)
+            .options(*REMOVAL_LOADERS)
             .where(StockRemoval.store_id == config.id)
             .order_by(StockRemoval.date.desc())
             .offset(config.removal_offset)
             .limit(config.records_limit)
         )
-        result = await db.execute(stmt)
-        store_model.removals = result.scalars().all()
 
     if config.include_order:
-        stmt = (
+        sections["orders"] = (
             select(Order)
+            .options(*ORDER_LOADERS)
             .where(Order.store_id == config.id)
             .order_by(Order.date_placed.desc())
             .offset(config.order_offset)
             .limit(config.records_limit)
         )
-        result = await db.execute(stmt)
-        store_model.orders = result.scalars().all()
 
     if config.include_refund:
-        stmt = (
+        sections["refunds"] = (
             select(Refund)
+            .options(*REFUND_LOADERS)
             .where(Refund.store_id == config.id)
-            .order_by(Refund.date.desc())
+            .order_by(Refund.application_date.desc())
             .offset(config.refund_offset)
             .limit(config.records_limit)
         )
+
+    return sections
+
+
+async def load_store_related_data(store_model: StoreResponseWithRelations,
+                                  db: AsyncSession,
+                                  config: StoreWithIncludeRelationsRequest,
+                                  timings: dict[str, float] | None = None):
+    """
+    Loads the Requested Sections of a Store on the given Session, one Query per Section.
+    They are not Loaded in Parallel: that needs a Session (and a Pooled Connection) per Section,
+    and Requests Holding one Connection while Waiting for more can Exhaust the Pool.
+    The Duration of each Section in Milliseconds is Recorded into the Timings, if given.
+    """
+    for name, stmt in _store_sections(config).items():
+        start = time.perf_counter()
         result = await db.execute(stmt)
-        store_model.refunds = result.scalars().all()
+        setattr(store_model, name, result.scalars().all())
+        if timings is not None:
+            timings[name] = (time.perf_counter() - start) * 1000
 
-    return store_model
\ No newline at end of file
+    return store_model
@@ -0,0 +1,157 @@
+from schemas.inventory import Inventory, StoreInventorySummary
+from schemas.product import Product
+from sqlalchemy import delete, func, case, literal, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from typing import Optional
+from uuid import UUID
+from dotenv import load_dotenv
+import os
+
+
+load_dotenv()
+
+# Products with a Quantity below their Reorder Threshold are counted as Low Stock,
+# this is the Threshold of the Rows which have none (as in utils/stock_alerts.py).
+# Changing it requires a Reconcile, the Stored Counts were taken with the Old Value.
+LOW_STOCK_THRESHOLD = int(os.environ.get("LOW_STOCK_THRESHOLD", 10))
+
+# Quantity Change of a Product: (Old Quantity, New Quantity),
+# None as Old means the Product was just Stocked, None as New means it was Dropped.
+QuantityChanges = dict[UUID, tuple[Optional[int], Optional[int]]]
+
+# Reorder Threshold Change of a Product: (Old Threshold, New Threshold), None is the Default.
+ThresholdChanges = dict[UUID, tuple[Optional[int], Optional[int]]]
+
+SUMMARY_COLUMNS = ("sku_count", "units_on_hand", "stock_value", "low_stock_count")
+
+
+def _is_low(quantity: Optional[int], threshold: Optional[int]) -> int:
+    if threshold is None:
+        threshold = LOW_STOCK_THRESHOLD
+    return int(quantity is not None and quantity < threshold)
+
+
+async def _load_thresholds(db: AsyncSession, store_id: UUID, product_ids) -> dict[UUID, Optional[int]]:
+    # Without Autoflush the Caller's Pending Changes are not Written yet, Deleted Rows are still Read.
+    with db.no_autoflush:
+        result = await db.execute(
+            select(Inventory.product_id, Inventory.reorder_threshold)
+            .where(Inventory.store_id == store_id, Inventory.product_id.in_(product_ids))
+        )
+    return dict(result.tuples().all())
+
+
+async def apply_inventory_changes(db: AsyncSession,
+                                  store_id: UUID,
+                                  changes: QuantityChanges,
+                                  thresholds: Optional[ThresholdChanges] = None):
+    """
+    Folds the Quantity Changes of a Store into its Summary with a single Upsert.
+    Must be called in the same Transaction as the Inventory Change itself,
+    so the Summary is Committed (or Rolled Back) together with it.
+    Callers which Set a Reorder Threshold Pass it in Thresholds (with an Entry in Changes,
+    the Quantity may be Unchanged), the Thresholds of the other Rows are Loaded.
+    """
+    thresholds = thresholds or {}
+    quantity_changes = {product_id: change for product_id, change in changes.items() if change[0] != change[1]}
+    threshold_changes = {product_id for product_id, (old, new) in thresholds.items() if old != new}
+    changes = {product_id: change for product_id, change in changes.items()
+               if product_id in quantity_changes or product_id in threshold_changes}
+    if not changes:
+        return
+
+    # Handed to the Stock Alert Engine once the Transaction Commits (see utils/stock_alerts.py).
+    if quantity_changes:
+        db.info.setdefault("inventory_changes", []).append((store_id, quantity_changes))
+
+    unknown = [product_id for product_id in changes if product_id not in thresholds]
+    if unknown:
+        loaded = await _load_thresholds(db, store_id, unknown)
+        thresholds = {**thresholds, **{product_id: (loaded.get(product_id),) * 2 for product_id in unknown}}
+
+    deltas = dict.fromkeys(SUMMARY_COLUMNS, 0)
+    unit_deltas = {}
+    for product_id, (old, new) in changes.items():
+        unit_delta = (new or 0) - (old or 0)
+        old_threshold, new_threshold = thresholds[product_id]
+
+        deltas["sku_count"] += (new is not None) - (old is not None)
+        deltas["units_on_hand"] += unit_delta
+        deltas["low_stock_count"] += _is_low(new, new_threshold) - _is_low(old, old_threshold)
+        if unit_delta:
+            unit_deltas[product_id] = unit_delta
+
+    if unit_deltas:
+        # Valued at the Prices in the Database, as Seen by this Transaction, not the Product Cache
+        # of the Process, which can Miss a Price Change made by another Worker.
+        deltas["stock_value"] = (
+            select(func.coalesce(func.sum(Product.price * case(unit_deltas, value=Product.id, else_=0)), 0.0))
+            .where(Product.id.in_(unit_deltas))
+            .scalar_subquery()
+        )
+
+    stmt = insert(StoreInventorySummary).values(store_id=store_id, **deltas)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[StoreInventorySummary.store_id],
+        set_={
+            **{name: getattr(StoreInventorySummary, name) + getattr(stmt.excluded, name)
+               for name in SUMMARY_COLUMNS},
+            "updated_at": func.now()
+        }
+    )
+    await db.execute(stmt)
+
+
+async def apply_price_change(db: AsyncSession, product_id: UUID, old_price: float, new_price: float):
+    """Revalues the Stock of a Product in every Store Summary after a Price Change."""
+    if old_price == new_price:
+        return
+
+    stmt = (
+        update(StoreInventorySummary)
+        .where(StoreInventorySummary.store_id == Inventory.store_id,
+               Inventory.product_id == product_id)
+        .values(stock_value=StoreInventorySummary.stock_value + Inventory.quantity * (new_price - old_price),
+                updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(stmt)
+
+
+async def rebuild_inventory_summary(db: AsyncSession, store_id: Optional[UUID] = None) -> list[StoreInventorySummary]:
+    """
+    Reconcile Job, Recomputes the Summaries from the Inventory Rows (of one or all Stores),
+    Correcting any Drift. The Caller Commits.
+    """
+    aggregate = (
+        select(
+            Inventory.store_id,
+            func.count(Inventory.product_id),
+            func.coalesce(func.sum(Inventory.quantity), 0),
+            func.coalesce(func.sum(Inventory.quantity * Product.price), 0.0),
+            func.count(case((Inventory.quantity < func.coalesce(Inventory.reorder_threshold, LOW_STOCK_THRESHOLD),
+                             literal(1)))),
+            func.now()
+        )
+        .join(Product, Product.id == Inventory.product_id)
+        .group_by(Inventory.store_id)
+    )
+    clear = delete(StoreInventorySummary)
+    if store_id:
+        aggregate = aggregate.where(Inventory.store_id == store_id)
+        clear = clear.where(StoreInventorySummary.store_id == store_id)
+
+    await db.execute(clear)
+    await db.execute(
+        insert(StoreInventorySummary).from_select(
+            ["store_id", *SUMMARY_COLUMNS, "updated_at"], aggregate
+        )
+    )
+
+    stmt = select(StoreInventorySummary).execution_options(populate_existing=True)
+    if store_id:
+        stmt = stmt.where(StoreInventorySummary.store_id == store_id)
+    result = await db.execute(stmt)
+    return result.scalars().all()
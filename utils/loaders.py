@@ -0,0 +1,71 @@
+from schemas.inventory import Inventory
+from schemas.order import Order, CartItems
+from schemas.product import Product
+from schemas.refund import Refund, RefundItems
+from schemas.removal import StockRemoval
+from schemas.restock import Restock, RestockItems
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload, joinedload
+from uuid import UUID
+
+
+# Loader Options for every Relationship walked by a Response Model.
+# Collections use selectinload (one IN query per Level, whatever the Page Size),
+# Many-to-One Relations use joinedload so they come back with their Parent Row.
+# Lazy Loading is not an Option under the AsyncSession, it fails outside of a Greenlet.
+
+# OrderResponse -> items -> product -> category
+ORDER_LOADERS = (
+    selectinload(Order.items).joinedload(CartItems.product).joinedload(Product.category),
+)
+
+# OrderResponseWithCustomer additionally walks the Customer.
+ORDER_WITH_CUSTOMER_LOADERS = ORDER_LOADERS + (
+    joinedload(Order.customer),
+)
+
+# RefundResponse -> items -> product -> category
+REFUND_LOADERS = (
+    selectinload(Refund.items).joinedload(RefundItems.product).joinedload(Product.category),
+)
+
+# Ownership Checks and Status Updates additionally walk the Order and its Customer.
+REFUND_WITH_ORDER_LOADERS = REFUND_LOADERS + (
+    joinedload(Refund.order).joinedload(Order.customer),
+)
+
+# RestockResponse -> items -> product -> category
+RESTOCK_LOADERS = (
+    selectinload(Restock.items).joinedload(RestockItems.product).joinedload(Product.category),
+)
+
+# StockRemovalResponse -> items
+REMOVAL_LOADERS = (
+    selectinload(StockRemoval.items),
+)
+
+# ProductResponseWithCategory -> category
+PRODUCT_LOADERS = (
+    joinedload(Product.category),
+)
+
+# InventoryResponseWithProduct -> product -> category
+INVENTORY_PRODUCT_LOADERS = (
+    joinedload(Inventory.product).joinedload(Product.category),
+)
+
+
+async def reload(db: AsyncSession, model, record_id: UUID, loaders: tuple):
+    """
+    Reloads a Record with its Loader Options, used after a Commit in place of
+    db.refresh(), which would leave the Relationships to be Lazy Loaded.
+    """
+    stmt = (
+        select(model)
+        .options(*loaders)
+        .where(model.id == record_id)
+        .execution_options(populate_existing=True)
+    )
+    result = await db.execute(stmt)
+    return result.scalar_one()
@@ -0,0 +1,266 @@
+"""
+Per Request Instrumentation.
+
+Every Request gets a RequestStats (through a Context Variable) which the Engine Events fill with
+the Number and Duration of the SQL Statements it Issues. The Middleware Records the Totals per Route,
+they are Exposed in the Prometheus Text Format by GET /metrics (see routes/metrics/routes_metrics.py),
+and optionally as a Server-Timing Header on every Response.
+"""
+from utils.db import engine, replica_engine, _env_bool
+from utils.auth import token_cache
+from utils.product_cache import product_cache
+from utils.idempotency import idempotency_stats
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+from dotenv import load_dotenv
+import functools
+import inspect
+import time
+
+
+load_dotenv()
+
+METRICS_ENABLED = _env_bool("METRICS_ENABLED", True)
+SERVER_TIMING_HEADER = _env_bool("SERVER_TIMING_HEADER", False)
+
+# Upper Bounds (in Seconds) of the Request Duration Histogram.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class RequestStats:
+    start: float = field(default_factory=time.perf_counter)
+    statements: int = 0
+    db_seconds: float = 0.0
+    endpoint_end: Optional[float] = None
+
+
+@dataclass
+class RouteMetrics:
+    requests: int = 0
+    statements: int = 0
+    db_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+    total_seconds: float = 0.0
+    buckets: list[int] = field(default_factory=lambda: [0] * len(DURATION_BUCKETS))
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+# Keyed by (Method, Route Path, Status Code), Route Paths are Templates so the Key Space stays Small.
+_routes: dict[tuple[str, str, int], RouteMetrics] = {}
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+##########################
+# SQL Statements
+##########################
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info["metrics_query_start"].pop()
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += time.perf_counter() - start
+
+
+if METRICS_ENABLED:
+    for _engine in (engine, replica_engine) if replica_engine is not engine else (engine,):
+        event.listen(_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(_engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+##########################
+# Endpoint Time
+##########################
+
+def _timed(call: Callable) -> Callable:
+    # Marks the End of the Endpoint, what follows until the Response Starts is Serialization.
+    if inspect.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def timed_endpoint(*args, **kwargs):
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                if (stats := _request_stats.get()) is not None:
+                    stats.endpoint_end = time.perf_counter()
+        return timed_endpoint
+
+    @functools.wraps(call)
+    def timed_sync_endpoint(*args, **kwargs):
+        try:
+            return call(*args, **kwargs)
+        finally:
+            if (stats := _request_stats.get()) is not None:
+                stats.endpoint_end = time.perf_counter()
+    return timed_sync_endpoint
+
+
+class TimedRoute(APIRoute):
+    """
+    Route Class of every Router (APIRouter(route_class=TimedRoute)), Wraps the Endpoint when the
+    Route is Declared, so every Copy FastAPI makes of it for an include_router is Timed as well.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if METRICS_ENABLED:
+            endpoint = _timed(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+##########################
+# Middleware
+##########################
+
+class MetricsMiddleware:
+    """Pure ASGI Middleware, avoids the Extra Task and Body Buffering of BaseHTTPMiddleware."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+        response_start = None
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_start
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_start = time.perf_counter()
+                if SERVER_TIMING_HEADER:
+                    message["headers"] = [*message.get("headers", []),
+                                          (b"server-timing", _server_timing(stats, response_start).encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(token)
+            route = scope.get("route")
+            # Unmatched Paths are Grouped, so Scans cannot Grow the Metrics without Bound.
+            path = route.path if route is not None else "unmatched"
+            _record(scope["method"], path, status_code, stats, response_start or time.perf_counter())
+
+
+def _serialize_seconds(stats: RequestStats, response_start: float) -> float:
+    if stats.endpoint_end is None:
+        return 0.0
+    return max(response_start - stats.endpoint_end, 0.0)
+
+
+def _server_timing(stats: RequestStats, response_start: float) -> str:
+    return (f"db;desc=\"{stats.statements} queries\";dur={stats.db_seconds * 1000:.1f}, "
+            f"serialize;dur={_serialize_seconds(stats, response_start) * 1000:.1f}, "
+            f"total;dur={(response_start - stats.start) * 1000:.1f}")
+
+
+def _record(method: str, path: str, status_code: int, stats: RequestStats, response_start: float):
+    total = time.perf_counter() - stats.start
+    metrics = _routes.get((method, path, status_code))
+    if metrics is None:
+        metrics = _routes[(method, path, status_code)] = RouteMetrics()
+
+    metrics.requests += 1
+    metrics.statements += stats.statements
+    metrics.db_seconds += stats.db_seconds
+    metrics.serialize_seconds += _serialize_seconds(stats, response_start)
+    metrics.total_seconds += total
+    for i, bound in enumerate(DURATION_BUCKETS):
+        if total <= bound:
+            metrics.buckets[i] += 1
+            break
+
+
+##########################
+# Exposition
+##########################
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _collect_caches() -> dict[str, dict]:
+    return {
+        "tokens": token_cache.stats(),
+        "products": product_cache.stats(),
+        "idempotency": idempotency_stats()
+    }
+
+
+def render_metrics() -> str:
+    """All Metrics in the Prometheus Text Exposition Format (Version 0.0.4)."""
+    lines = []
+
+    def _family(name: str, kind: str, help_text: str):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    routes = sorted(_routes.items())
+
+    _family("http_requests_total", "counter", "Requests Served, by Route and Status Code.")
+    for (method, path, code), metrics in routes:
+        lines.append(f"http_requests_total{_labels(method=method, route=path, status=code)} {metrics.requests}")
+
+    _family("http_request_duration_seconds", "histogram", "Total Time to Serve a Request.")
+    for (method, path, code), metrics in routes:
+        cumulative = 0
+        for bound, count in zip(DURATION_BUCKETS, metrics.buckets):
+            cumulative += count
+            lines.append(f"http_request_duration_seconds_bucket"
+                         f"{_labels(method=method, route=path, status=code, le=bound)} {cumulative}")
+        labels = _labels(method=method, route=path, status=code)
+        lines.append(f"http_request_duration_seconds_bucket"
+                     f"{_labels(method=method, route=path, status=code, le='+Inf')} {metrics.requests}")
+        lines.append(f"http_request_duration_seconds_sum{labels} {metrics.total_seconds:.6f}")
+        lines.append(f"http_request_duration_seconds_count{labels} {metrics.requests}")
+
+    for name, attribute, help_text in (
+        ("http_request_db_statements_total", "statements", "SQL Statements Issued while Serving Requests."),
+        ("http_request_db_seconds_total", "db_seconds", "Time Spent in SQL Statements while Serving Requests."),
+        ("http_request_serialize_seconds_total", "serialize_seconds", "Time Spent Serializing Responses.")
+    ):
+        _family(name, "counter", help_text)
+        for (method, path, code), metrics in routes:
+            value = getattr(metrics, attribute)
+            value = f"{value:.6f}" if isinstance(value, float) else value
+            lines.append(f"{name}{_labels(method=method, route=path, status=code)} {value}")
+
+    caches = _collect_caches()
+    for name, key, kind, help_text in (
+        ("cache_hits_total", "hits", "counter", "Cache Lookups that Found an Entry."),
+        ("cache_misses_total", "misses", "counter", "Cache Lookups that Missed."),
+        ("cache_entries", "size", "gauge", "Entries currently in the Cache.")
+    ):
+        _family(name, kind, help_text)
+        for cache, stats in caches.items():
+            lines.append(f"{name}{_labels(cache=cache)} {stats[key]}")
+
+    _family("db_pool_checked_out_connections", "gauge", "Connections currently in Use.")
+    engines = {"primary": engine}
+    if replica_engine is not engine:
+        engines["replica"] = replica_engine
+    for name, pool_engine in engines.items():
+        checkedout = getattr(pool_engine.pool, "checkedout", None)
+        if checkedout is not None:
+            lines.append(f"db_pool_checked_out_connections{_labels(engine=name)} {checkedout()}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,125 @@
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from datetime import datetime
+from uuid import UUID
+import base64
+import binascii
+import hashlib
+import json
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Sort Keys are given as (Column, Descending) pairs, the last one must be Unique (e.g. the ID)
+# so that the Ordering is Stable across Pages.
+SortKeys = list[tuple[InstrumentedAttribute, bool]]
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"uuid": str(value)}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "uuid" in value:
+            return UUID(value["uuid"])
+    return value
+
+
+def _sort_signature(sort_keys: SortKeys) -> str:
+    # Short Hash of the Sorted Columns and Directions, a Cursor taken under another Sort is Rejected.
+    spec = ",".join(f"{column.class_.__tablename__}.{column.key}:{'desc' if desc else 'asc'}"
+                    for column, desc in sort_keys)
+    return hashlib.sha256(spec.encode()).hexdigest()[:12]
+
+
+def encode_cursor(values: list, sort_keys: SortKeys) -> str:
+    """Opaque Cursor holding the Sort Key Values of the Last Row of a Page, and the Sort it was taken under."""
+    payload = json.dumps({"s": _sort_signature(sort_keys), "v": [_encode_value(v) for v in values]},
+                         separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_keys: SortKeys) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, dict) or not isinstance(payload.get("v"), list):
+            raise ValueError("Malformed Cursor")
+
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Invalid Pagination Cursor")
+
+    values = payload["v"]
+    if payload.get("s") != _sort_signature(sort_keys) or len(values) != len(sort_keys):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Pagination Cursor was Issued for a different Sort")
+
+    try:
+        return [_decode_value(v) for v in values]
+
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Invalid Pagination Cursor")
+
+
+def _after_cursor(sort_keys: SortKeys, values: list):
+    directions = {desc for _, desc in sort_keys}
+    if len(directions) == 1:
+        # Uniform Direction, a Row Comparison can be Served directly by a Composite Index.
+        columns = tuple_(*[column for column, _ in sort_keys])
+        if directions.pop():
+            return columns < tuple_(*values)
+        return columns > tuple_(*values)
+
+    clauses = []
+    for i, (column, desc) in enumerate(sort_keys):
+        equal_prefix = [c == v for (c, _), v in zip(sort_keys[:i], values[:i])]
+        clauses.append(and_(*equal_prefix, column < values[i] if desc else column > values[i]))
+    return or_(*clauses)
+
+
+def sort_order(sort_keys: SortKeys) -> list:
+    return [column.desc() if desc else column.asc() for column, desc in sort_keys]
+
+
+def keyset_query(stmt, sort_keys: SortKeys, limit: int, cursor: str | None = None):
+    if limit < 1:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Limit must be at least 1")
+
+    if cursor:
+        stmt = stmt.where(_after_cursor(sort_keys, decode_cursor(cursor, sort_keys)))
+
+    # One extra Row tells whether there is a Next Page.
+    return stmt.order_by(*sort_order(sort_keys)).limit(limit + 1)
+
+
+async def fetch_page(db: AsyncSession, stmt, sort_keys: SortKeys, limit: int,
+                     cursor: str | None = None, offset: int = 0) -> tuple[list, str | None]:
+    """
+    Runs a Keyset Paginated Query and Returns the Rows with the Cursor for the Next Page.
+    The Offset is only kept for Backwards Compatibility and is Ignored when a Cursor is given.
+    """
+    stmt = keyset_query(stmt, sort_keys, limit, cursor)
+    if offset and not cursor:
+        stmt = stmt.offset(offset)
+
+    result = await db.execute(stmt)
+    rows = result.scalars().all()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, column.key) for column, _ in sort_keys], sort_keys)
@@ -0,0 +1,109 @@
+"""
+Shared Pricing Engine for Carts, Orders and Refunds.
+
+Money is Computed in Integer Cents and Rates in Basis Points, so Totals are Exact:
+every Line is Rounded (Half Up, to the Cent) once for its Discount and once for its Tax,
+and the Cart Totals are the Sums of the Rounded Lines.
+Large Carts (and Batches of Carts) use a Vectorized NumPy Path when NumPy is Installed,
+it runs the same Integer Arithmetic, so both Paths give Identical Results.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Iterable, NamedTuple, Optional
+from uuid import UUID
+from dotenv import load_dotenv
+import json
+import os
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+load_dotenv()
+
+# Carts with fewer Lines are Priced in Plain Python, the Array Setup costs more than it saves.
+PRICING_VECTORIZE_THRESHOLD = int(os.environ.get("PRICING_VECTORIZE_THRESHOLD", 64))
+DEFAULT_TAX_RATE = os.environ.get("DEFAULT_TAX_RATE", "0.18")
+# Per Store Overrides, e.g. {"<store uuid>": 0.08}
+STORE_TAX_RATES = json.loads(os.environ.get("STORE_TAX_RATES", "{}"))
+
+BASIS_POINTS = 10_000
+
+# (Unit Price in Cents, Quantity, Discount in Basis Points)
+PricedLine = tuple[int, int, int]
+
+
+class CartTotals(NamedTuple):
+    amount: int
+    discount: int
+    tax: int
+
+    def as_currency(self) -> tuple[float, float, float]:
+        return self.amount / 100, self.discount / 100, self.tax / 100
+
+
+def to_cents(value: float) -> int:
+    return int((Decimal(str(value)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def to_basis_points(rate: float | str) -> int:
+    return int((Decimal(str(rate)) * BASIS_POINTS).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def tax_rate_for_store(store_id: Optional[UUID]) -> int:
+    """Tax Rate of a Store in Basis Points, Falls back to DEFAULT_TAX_RATE."""
+    rate = STORE_TAX_RATES.get(str(store_id), DEFAULT_TAX_RATE) if store_id else DEFAULT_TAX_RATE
+    return to_basis_points(rate)
+
+
+def _apply_rate(cents: int, basis_points: int) -> int:
+    # Half Up Rounding for Non Negative Amounts.
+    return (cents * basis_points + BASIS_POINTS // 2) // BASIS_POINTS
+
+
+def _price_lines_scalar(lines: Iterable[PricedLine], tax_bp: int) -> CartTotals:
+    amount = discount = tax = 0
+    for price, quantity, discount_bp in lines:
+        line_amount = price * quantity
+        line_discount = _apply_rate(line_amount, discount_bp)
+        amount += line_amount
+        discount += line_discount
+        tax += _apply_rate(line_amount - line_discount, tax_bp)
+    return CartTotals(amount, discount, tax)
+
+
+def _price_lines_vectorized(lines: list[PricedLine], tax_bp: int, cart_index=None, carts: int = 1):
+    table = np.asarray(lines, dtype=np.int64).reshape(-1, 3)
+    line_amount = table[:, 0] * table[:, 1]
+    line_discount = (line_amount * table[:, 2] + BASIS_POINTS // 2) // BASIS_POINTS
+    line_tax = ((line_amount - line_discount) * tax_bp + BASIS_POINTS // 2) // BASIS_POINTS
+
+    if cart_index is None:
+        return CartTotals(int(line_amount.sum()), int(line_discount.sum()), int(line_tax.sum()))
+
+    sums = [np.bincount(cart_index, weights=column, minlength=carts)
+            for column in (line_amount, line_discount, line_tax)]
+    # bincount Sums in Float64, Exact for Totals below 2**53 Cents.
+    return [CartTotals(int(a), int(d), int(t)) for a, d, t in zip(*sums)]
+
+
+def price_cart(lines: list[PricedLine], tax_bp: int) -> CartTotals:
+    """Totals of a single Cart, in Cents."""
+    if np is not None and len(lines) >= PRICING_VECTORIZE_THRESHOLD:
+        return _price_lines_vectorized(lines, tax_bp)
+    return _price_lines_scalar(lines, tax_bp)
+
+
+def price_carts(carts: list[list[PricedLine]], tax_bp: int) -> list[CartTotals]:
+    """Totals of a Batch of Carts (sharing a Tax Rate), Priced in a single Pass when Vectorized."""
+    total_lines = sum(len(lines) for lines in carts)
+    if np is None or total_lines < PRICING_VECTORIZE_THRESHOLD:
+        return [_price_lines_scalar(lines, tax_bp) for lines in carts]
+
+    if total_lines == 0:
+        return [CartTotals(0, 0, 0) for _ in carts]
+
+    cart_index = np.repeat(np.arange(len(carts)), [len(lines) for lines in carts])
+    flat = [line for lines in carts for line in lines]
+    return _price_lines_vectorized(flat, tax_bp, cart_index, len(carts))
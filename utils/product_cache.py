@@ -0,0 +1,62 @@
+from schemas.product import Product
+from utils.cache import TTLCache
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from typing import Iterable, NamedTuple
+from uuid import UUID
+from dotenv import load_dotenv
+import os
+
+
+load_dotenv()
+
+PRODUCT_CACHE_SIZE = int(os.environ.get("PRODUCT_CACHE_SIZE", 100_000))
+PRODUCT_CACHE_TTL = float(os.environ.get("PRODUCT_CACHE_TTL", 300))
+
+
+class CachedProduct(NamedTuple):
+    id: UUID
+    price: float
+    is_removed: bool
+    category_id: int
+
+
+product_cache = TTLCache(max_size=PRODUCT_CACHE_SIZE, ttl=PRODUCT_CACHE_TTL)
+
+
+async def fetch_products(product_ids: Iterable[UUID],
+                         db: AsyncSession) -> dict[UUID, CachedProduct]:
+    """
+    Returns the Catalog Entries for the given Products, only the Cache Misses
+    are Selected from the Database (with a Single Query).
+    """
+    products = {}
+    missing = []
+    for product_id in set(product_ids):
+        cached = product_cache.get(product_id)
+        if cached is None:
+            missing.append(product_id)
+        else:
+            products[product_id] = cached
+
+    if missing:
+        stmt = (
+            select(Product.id, Product.price, Product.is_removed, Product.category_id)
+            .where(Product.id.in_(missing))
+        )
+        results = await db.execute(stmt)
+        for row in results:
+            product = CachedProduct(*row)
+            product_cache.set(product.id, product)
+            products[product.id] = product
+
+    return products
+
+
+def invalidate_products(product_ids: Iterable[UUID] | None = None):
+    """Drop the given Products from the Cache, or the Whole Catalog if None are given."""
+    if product_ids is None:
+        product_cache.clear()
+        return
+
+    product_cache.invalidate(*product_ids)
@@ -0,0 +1,140 @@
+from schemas.product import Product, Category
+from validations.product import ProductRequest, ProductImportError, ProductImportResponse
+from utils.etag import bump_versions
+from utils.product_search import index_products
+from fastapi import UploadFile
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from typing import AsyncGenerator
+from uuid import uuid4
+from dotenv import load_dotenv
+import codecs
+import csv
+import json
+import os
+import time
+
+
+load_dotenv()
+
+PRODUCT_IMPORT_BATCH_SIZE = int(os.environ.get("PRODUCT_IMPORT_BATCH_SIZE", 1000))
+PRODUCT_IMPORT_MAX_ERRORS = int(os.environ.get("PRODUCT_IMPORT_MAX_ERRORS", 1000))
+PRODUCT_IMPORT_READ_SIZE = 64 * 1024
+
+
+async def _read_lines(upload: UploadFile) -> AsyncGenerator[str, None]:
+    """Reads the Upload in Chunks, so the File is never held in Memory as a Whole."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    while chunk := await upload.read(PRODUCT_IMPORT_READ_SIZE):
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def read_import_rows(upload: UploadFile,
+                           import_format: str) -> AsyncGenerator[tuple[int, dict | str], None]:
+    """
+    Yields (Row Number, Raw Row) pairs, the Row is a String when it cannot be Parsed.
+    CSV Files need a Header Row, Quoted Values spanning multiple Lines are not Supported.
+    """
+    header = None
+    row_number = 0
+    async for line in _read_lines(upload):
+        if not line.strip():
+            continue
+
+        if import_format == "csv" and header is None:
+            header = [column.strip() for column in next(csv.reader([line]))]
+            continue
+
+        row_number += 1
+        if import_format == "csv":
+            values = next(csv.reader([line]))
+            if len(values) != len(header):
+                yield row_number, f"Expected {len(header)} Columns, Got {len(values)}"
+                continue
+            # Empty Cells fall back to the Model Defaults.
+            yield row_number, {k: v for k, v in zip(header, values) if v != ""}
+            continue
+
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, f"Invalid JSON: {e.msg}"
+            continue
+        yield row_number, row if isinstance(row, dict) else "Expected a JSON Object"
+
+
+async def import_products(upload: UploadFile,
+                          import_format: str,
+                          db: AsyncSession) -> ProductImportResponse:
+    """
+    Validates the Uploaded Rows with the ProductRequest Model and Inserts the Valid ones
+    in Batches with a single Multi-Row INSERT each, every Batch is Committed on its own.
+    Invalid Rows are Skipped and Reported, up to PRODUCT_IMPORT_MAX_ERRORS of them.
+    """
+    start = time.perf_counter()
+    result = await db.execute(select(Category.id))
+    category_ids = set(result.scalars().all())
+
+    imported = 0
+    failed = 0
+    errors: list[ProductImportError] = []
+    batch: list[dict] = []
+
+    def _reject(row_number: int, message: str):
+        nonlocal failed
+        failed += 1
+        if len(errors) < PRODUCT_IMPORT_MAX_ERRORS:
+            errors.append(ProductImportError(row=row_number, error=message))
+
+    async def _flush():
+        nonlocal imported
+        if not batch:
+            return
+        await db.execute(insert(Product), batch)
+        await bump_versions(db, "products")
+        await db.commit()
+        index_products(batch)
+        imported += len(batch)
+        batch.clear()
+
+    async for row_number, row in read_import_rows(upload, import_format):
+        if isinstance(row, str):
+            _reject(row_number, row)
+            continue
+
+        try:
+            product = ProductRequest.model_validate(row)
+        except ValidationError as e:
+            _reject(row_number, "; ".join(
+                f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+            ))
+            continue
+
+        if product.category_id not in category_ids:
+            _reject(row_number, f"Category {product.category_id} Not Found")
+            continue
+
+        batch.append({"id": uuid4(), **product.model_dump()})
+        if len(batch) >= PRODUCT_IMPORT_BATCH_SIZE:
+            await _flush()
+
+    await _flush()
+
+    duration = time.perf_counter() - start
+    return ProductImportResponse(
+        imported=imported,
+        failed=failed,
+        errors=errors,
+        duration_seconds=round(duration, 3),
+        rows_per_second=round((imported + failed) / duration, 1) if duration > 0 else 0.0
+    )
@@ -0,0 +1,272 @@
+"""
+Product Search by Name and Description, with Prefix Autocomplete on the Last Word.
+
+Two Backends, Chosen with PRODUCT_SEARCH_BACKEND:
+- "memory" (Default): an In-Process Inverted Index, Built at Startup and Updated by the Product
+  Routes after their Writes. Each Worker only sees its own Writes until it Restarts,
+  Deployments with several Workers should use the Postgres Backend.
+- "postgres": a Full Text Query Served by the GIN Index ix_products_search (see schemas/product.py).
+"""
+from schemas.product import Product
+from utils.db import ReadSessionLocal
+from sqlalchemy import bindparam, func, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from typing import Optional
+from uuid import UUID
+from dotenv import load_dotenv
+import bisect
+import heapq
+import os
+import re
+import time
+
+
+load_dotenv()
+
+PRODUCT_SEARCH_BACKEND = os.environ.get("PRODUCT_SEARCH_BACKEND", "memory").strip().lower()
+# Shorter Last Words are Matched Exactly, a One Letter Prefix would Match most of the Catalog.
+PRODUCT_SEARCH_MIN_PREFIX = int(os.environ.get("PRODUCT_SEARCH_MIN_PREFIX", 2))
+PRODUCT_SEARCH_MAX_RESULTS = int(os.environ.get("PRODUCT_SEARCH_MAX_RESULTS", 100))
+PRODUCT_SEARCH_BUILD_BATCH = 10_000
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(value: str) -> list[str]:
+    return _TOKEN.findall(value.lower())
+
+
+class ProductIndex:
+    """
+    Products are Numbered with Dense Document IDs, the Postings of a Word are Sets of them.
+    The Sorted Vocabulary Answers Prefix Lookups with two Bisections.
+    """
+
+    def __init__(self):
+        self._doc_ids: dict[UUID, int] = {}
+        self._product_ids: list[Optional[UUID]] = []
+        self._names: list[str] = []
+        self._name_terms: list[frozenset] = []
+        self._doc_terms: list[frozenset] = []
+        self._categories: list[int] = []
+        self._removed: list[bool] = []
+        # Slots of Removed Products, Reused by the next add().
+        self._free: list[int] = []
+        self._postings: dict[str, set[int]] = {}
+        self._terms: list[str] = []
+        self.built_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def _add_term(self, term: str, doc: int, keep_sorted: bool):
+        postings = self._postings.get(term)
+        if postings is None:
+            postings = self._postings[term] = set()
+            if keep_sorted:
+                bisect.insort(self._terms, term)
+        postings.add(doc)
+
+    def _drop_term(self, term: str, doc: int):
+        postings = self._postings[term]
+        postings.discard(doc)
+        if not postings:
+            del self._postings[term]
+            del self._terms[bisect.bisect_left(self._terms, term)]
+
+    def _new_slot(self) -> int:
+        if self._free:
+            return self._free.pop()
+
+        self._product_ids.append(None)
+        self._names.append("")
+        self._name_terms.append(frozenset())
+        self._doc_terms.append(frozenset())
+        self._categories.append(0)
+        self._removed.append(False)
+        return len(self._product_ids) - 1
+
+    def add(self, product_id: UUID, name: str, description: str, category_id: int, is_removed: bool,
+            keep_sorted: bool = True):
+        """
+        Indexes a Product, Replacing its Previous Entry. Bulk Loads pass keep_sorted=False
+        and call sort_terms() once they are Done, instead of Inserting every Word in Order.
+        """
+        name_terms = frozenset(tokenize(name))
+        doc_terms = name_terms | frozenset(tokenize(description))
+
+        doc = self._doc_ids.get(product_id)
+        if doc is None:
+            doc = self._doc_ids[product_id] = self._new_slot()
+            new_terms = doc_terms
+        else:
+            # An Update keeps the Product's Slot, only the Words that Changed are Moved.
+            old_terms = self._doc_terms[doc]
+            for term in old_terms - doc_terms:
+                self._drop_term(term, doc)
+            new_terms = doc_terms - old_terms
+
+        self._product_ids[doc] = product_id
+        self._names[doc] = name.lower()
+        self._name_terms[doc] = name_terms
+        self._doc_terms[doc] = doc_terms
+        self._categories[doc] = category_id
+        self._removed[doc] = is_removed
+        for term in new_terms:
+            self._add_term(term, doc, keep_sorted)
+
+    def sort_terms(self):
+        self._terms = sorted(self._postings)
+
+    def remove(self, product_id: UUID):
+        doc = self._doc_ids.pop(product_id, None)
+        if doc is None:
+            return
+
+        for term in self._doc_terms[doc]:
+            self._drop_term(term, doc)
+        self._product_ids[doc] = None
+        self._names[doc] = ""
+        self._doc_terms[doc] = self._name_terms[doc] = frozenset()
+        self._free.append(doc)
+
+    def _prefix_terms(self, prefix: str) -> list[str]:
+        start = bisect.bisect_left(self._terms, prefix)
+        end = bisect.bisect_left(self._terms, prefix + "\uffff", lo=start)
+        return self._terms[start:end]
+
+    def search(self,
+               query: str,
+               category_id: Optional[int] = None,
+               include_removed: bool = False,
+               limit: int = 20) -> list[UUID]:
+        """
+        Every Word must Match, the Last one as a Prefix. Products Matching more Words
+        in their Name Rank First, then Alphabetically.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+
+        *exact, last = words
+        prefix_terms = (self._prefix_terms(last) if len(last) >= PRODUCT_SEARCH_MIN_PREFIX
+                        else [last] if last in self._postings else [])
+        if not prefix_terms:
+            return []
+
+        exact_postings = []
+        for word in exact:
+            postings = self._postings.get(word)
+            if not postings:
+                return []
+            exact_postings.append(postings)
+
+        if exact_postings:
+            exact_postings.sort(key=len)
+            candidates = set(exact_postings[0]).intersection(*exact_postings[1:])
+            prefixes = set(prefix_terms)
+            # Cheaper than a Union of the Prefix Postings, which can Cover most of the Catalog.
+            candidates = {doc for doc in candidates if not prefixes.isdisjoint(self._doc_terms[doc])}
+        else:
+            candidates = set().union(*(self._postings[term] for term in prefix_terms))
+
+        def _rank(doc: int):
+            name_terms = self._name_terms[doc]
+            name_hits = sum(word in name_terms for word in exact)
+            name_hits += any(term.startswith(last) for term in name_terms)
+            return -name_hits, self._names[doc]
+
+        matches = (doc for doc in candidates
+                   if (category_id is None or self._categories[doc] == category_id)
+                   and (include_removed or not self._removed[doc]))
+        return [self._product_ids[doc] for doc in heapq.nsmallest(limit, matches, key=_rank)]
+
+
+product_index = ProductIndex()
+
+
+async def build_product_index():
+    """Loads every Product into a Fresh Index, then Swaps it in."""
+    global product_index
+    if PRODUCT_SEARCH_BACKEND != "memory":
+        return
+
+    start = time.perf_counter()
+    index = ProductIndex()
+    stmt = (
+        select(Product.id, Product.name, Product.description, Product.category_id, Product.is_removed)
+        .execution_options(yield_per=PRODUCT_SEARCH_BUILD_BATCH)
+    )
+    async with ReadSessionLocal() as session:
+        result = await session.stream(stmt)
+        async for rows in result.partitions():
+            for row in rows:
+                index.add(row.id, row.name, row.description, row.category_id, row.is_removed,
+                          keep_sorted=False)
+
+    index.sort_terms()
+    index.built_at = time.time()
+    product_index = index
+    print(f"Product Search Index Built: {len(index)} Products in {time.perf_counter() - start:.2f}s.")
+
+
+def index_products(products):
+    """Call after the Write has been Committed, accepts Product Rows or Dicts."""
+    if PRODUCT_SEARCH_BACKEND != "memory":
+        return
+
+    for product in products:
+        if isinstance(product, dict):
+            product_index.add(product["id"], product["name"], product["description"],
+                              product["category_id"], product.get("is_removed", False))
+        else:
+            product_index.add(product.id, product.name, product.description,
+                              product.category_id, product.is_removed)
+
+
+def unindex_products(product_ids):
+    if PRODUCT_SEARCH_BACKEND != "memory":
+        return
+
+    for product_id in product_ids:
+        product_index.remove(product_id)
+
+
+# Must Match the Expression of the ix_products_search Index, or the Planner will not Use it.
+_DOCUMENT = "to_tsvector('simple', products.name || ' ' || products.description)"
+
+
+async def search_products(db: AsyncSession,
+                          query: str,
+                          category_id: Optional[int] = None,
+                          include_removed: bool = False,
+                          limit: int = 20) -> list[UUID]:
+    """IDs of the Matching Products, Best Match First."""
+    limit = max(1, min(limit, PRODUCT_SEARCH_MAX_RESULTS))
+    if PRODUCT_SEARCH_BACKEND != "postgres":
+        return product_index.search(query, category_id, include_removed, limit)
+
+    words = tokenize(query)
+    if not words:
+        return []
+
+    # Words only hold Word Characters, so they cannot Inject tsquery Operators.
+    *exact, last = words
+    terms = [*exact, f"{last}:*" if len(last) >= PRODUCT_SEARCH_MIN_PREFIX else last]
+    document = literal_column(_DOCUMENT)
+    tsquery = func.to_tsquery(literal_column("'simple'"), bindparam("tsquery", " & ".join(terms)))
+
+    stmt = (
+        select(Product.id)
+        .where(document.op("@@", is_comparison=True)(tsquery))
+        .order_by(func.ts_rank(document, tsquery).desc(), Product.name)
+        .limit(limit)
+    )
+    if category_id is not None:
+        stmt = stmt.where(Product.category_id == category_id)
+    if not include_removed:
+        stmt = stmt.where(Product.is_removed == False)
+
+    result = await db.execute(stmt)
+    return list(result.scalars().all())
@@ -0,0 +1,164 @@
+"""
+Query Plan Checker for the Hot Query Shapes of the Routes.
+
+Runs EXPLAIN on every Query below and Fails if any of them is Planned as a Sequential Scan.
+With --seed, a Large Dataset is Inserted first so the Planner has Realistic Statistics,
+everything (Seed included) runs in a single Transaction that is Rolled Back at the End.
+
+Usage:
+    python -m utils.query_plan [--seed ROWS]
+"""
+from schemas import *
+from utils.db import engine
+from utils.pagination import keyset_query
+from utils.filters import apply_filters, parse_sort, INVENTORY_FILTERS, PRODUCT_FILTERS, PRODUCT_SORTS
+from validations.inventory import InventoryFilterParams
+from validations.product import ProductFilterParams
+from utils.transaction_export import apply_transaction_filters
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.future import select
+from uuid import uuid4
+import argparse
+import asyncio
+import json
+import sys
+
+
+SAMPLE_ID = uuid4()
+
+# (Name, Statement) for every Hot Query, the Parameters only need to be Selective.
+HOT_QUERIES = [
+    ("transaction by operation",
+     select(Transaction).where(Transaction.type == "Sale", Transaction.operation_id == SAMPLE_ID)),
+    ("transactions of a store",
+     apply_transaction_filters(select(Transaction), store_id=SAMPLE_ID)
+     .order_by(Transaction.date.desc()).limit(50)),
+    ("orders of a customer",
+     select(Order).where(Order.customer_id == SAMPLE_ID).order_by(Order.date_placed.desc())),
+    ("orders page",
+     keyset_query(select(Order), [(Order.date_placed, True), (Order.id, True)], 50)),
+    ("refunds of an order",
+     select(Refund).where(Refund.order_id == SAMPLE_ID)),
+    ("refunds page",
+     keyset_query(select(Refund), [(Refund.application_date, True), (Refund.id, True)], 100)),
+    ("restocks filter",
+     select(Restock).where(Restock.store_id == SAMPLE_ID, Restock.status == "Pending")
+     .order_by(Restock.date_placed.desc())),
+    ("restocks page",
+     keyset_query(select(Restock), [(Restock.date_placed, True), (Restock.id, True)], 10)),
+    ("removals of a store",
+     select(StockRemoval).where(StockRemoval.store_id == SAMPLE_ID).order_by(StockRemoval.date.desc())),
+    ("inventory of a product",
+     select(Inventory).where(Inventory.product_id == SAMPLE_ID)),
+    ("inventory item of a store",
+     select(Inventory).where(Inventory.store_id == SAMPLE_ID, Inventory.product_id == SAMPLE_ID)),
+    ("active products of a category",
+     select(Product.id, Product.price).where(Product.is_removed == False, Product.category_id == 1)),
+    ("products in a price range",
+     keyset_query(apply_filters(select(Product), ProductFilterParams(price_gte=10, price_lte=11), PRODUCT_FILTERS),
+                  parse_sort("price", PRODUCT_SORTS, Product.id), 100)),
+    ("low stock of a store",
+     apply_filters(select(Inventory), InventoryFilterParams(store_id=SAMPLE_ID, quantity_lt=5), INVENTORY_FILTERS)),
+]
+
+
+# Seed Statements, Rows are Spread over a few Stores, Customers and Products.
+SEED_STATEMENTS = [
+    "INSERT INTO roles (level, role) VALUES (-1, 'query-plan-seed')",
+    """INSERT INTO users (id, username, password, is_internal_user, created_at, updated_at, level)
+       VALUES (gen_random_uuid(), 'query-plan-seed', '-', true, now(), now(), -1)""",
+    "INSERT INTO locations (id, name, address) VALUES (-1, 'Seed', 'Seed')",
+    """INSERT INTO stores (id, name, location_id)
+       SELECT gen_random_uuid(), 'Seed ' || g, -1 FROM generate_series(1, 50) g""",
+    "INSERT INTO categories (id, category) SELECT -g, 'Seed ' || g FROM generate_series(1, 20) g",
+    """INSERT INTO products (id, name, description, price, is_removed, category_id)
+       SELECT gen_random_uuid(), 'Seed ' || g, '-', g % 100, g % 10 = 0, -(1 + g % 20)
+       FROM generate_series(1, :entities) g""",
+    """INSERT INTO customers (id, first_name, last_name, phone_number)
+       SELECT gen_random_uuid(), 'Seed', 'Seed', 'seed-' || g FROM generate_series(1, :entities) g""",
+    """INSERT INTO orders (id, order_amount, discount_amount, tax, status, date_placed, date_received,
+                           order_mode, store_id, customer_id)
+       SELECT gen_random_uuid(), 10, 0, 0, 'Delivered', now() - g * interval '1 minute', now(), 'Online',
+              s.ids[1 + g % array_length(s.ids, 1)], c.ids[1 + g % array_length(c.ids, 1)]
+       FROM generate_series(1, :rows) g,
+            (SELECT array_agg(id) AS ids FROM stores WHERE location_id = -1) s,
+            (SELECT array_agg(id) AS ids FROM customers WHERE last_name = 'Seed') c""",
+    """INSERT INTO refunds (id, reason, amount, status, application_date, store_id, order_id)
+       SELECT gen_random_uuid(), 'Seed', 1, 'Pending', o.date_placed, o.store_id, o.id
+       FROM orders o WHERE o.status = 'Delivered' LIMIT :entities""",
+    """INSERT INTO restocks (id, status, date_placed, store_id)
+       SELECT gen_random_uuid(), (ARRAY['Pending', 'Completed', 'Cancelled'])[1 + g % 3],
+              now() - g * interval '1 minute', s.ids[1 + g % array_length(s.ids, 1)]
+       FROM generate_series(1, :rows) g, (SELECT array_agg(id) AS ids FROM stores WHERE location_id = -1) s""",
+    """INSERT INTO stock_removals (id, removal_reason, date, is_canceled, store_id)
+       SELECT gen_random_uuid(), 'Damaged', now() - g * interval '1 minute', false,
+              s.ids[1 + g % array_length(s.ids, 1)]
+       FROM generate_series(1, :rows) g, (SELECT array_agg(id) AS ids FROM stores WHERE location_id = -1) s""",
+    """INSERT INTO transactions (id, type, date, operation_id, request_made_by, store_id)
+       SELECT gen_random_uuid(), (ARRAY['Restock', 'Sale', 'Refund', 'Removal'])[1 + g % 4],
+              now() - g * interval '1 minute', gen_random_uuid(),
+              (SELECT id FROM users WHERE username = 'query-plan-seed'), s.ids[1 + g % array_length(s.ids, 1)]
+       FROM generate_series(1, :rows) g, (SELECT array_agg(id) AS ids FROM stores WHERE location_id = -1) s""",
+    """INSERT INTO inventory (quantity, max_discount_amount, store_id, product_id)
+       SELECT 100, 0, s.id, p.id
+       FROM (SELECT id FROM stores WHERE location_id = -1) s
+       CROSS JOIN LATERAL (SELECT id FROM products WHERE category_id < 0 LIMIT :rows / 50) p""",
+    "ANALYZE",
+]
+
+
+def _plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+async def seed(conn: AsyncConnection, rows: int):
+    params = {"rows": rows, "entities": max(rows // 10, 1)}
+    for statement in SEED_STATEMENTS:
+        await conn.execute(text(statement), params)
+    print(f"Seeded {rows} Rows per Table.")
+
+
+async def check_plans(conn: AsyncConnection) -> list[str]:
+    """Returns the Names of the Queries that were Planned with a Sequential Scan."""
+    failures = []
+    for name, stmt in HOT_QUERIES:
+        sql = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+        result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = result.scalar()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+
+        seq_scans = [node.get("Relation Name") for node in _plan_nodes(plan[0]["Plan"])
+                     if node["Node Type"] == "Seq Scan"]
+        if seq_scans:
+            failures.append(name)
+            print(f"FAIL  {name}: Seq Scan on {', '.join(seq_scans)}")
+        else:
+            print(f"OK    {name}")
+
+    return failures
+
+
+async def main(rows: int = 0) -> int:
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            if rows:
+                await seed(conn, rows)
+            failures = await check_plans(conn)
+        finally:
+            await transaction.rollback()
+
+    await engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fails if a Hot Query is Planned as a Sequential Scan.")
+    parser.add_argument("--seed", type=int, default=0, metavar="ROWS",
+                        help="Rows to Seed per Table before Checking, Rolled Back afterwards.")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.seed)))
@@ -0,0 +1,32 @@
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from typing import Iterable, List, Optional
+
+
+# One Adapter per Model, building them Compiles a Validator and a Serializer.
+_list_adapters: dict[type[BaseModel], TypeAdapter] = {}
+
+
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    adapter = _list_adapters.get(model)
+    if adapter is None:
+        adapter = _list_adapters[model] = TypeAdapter(List[model])
+    return adapter
+
+
+def list_response(model: type[BaseModel], rows: Iterable, response: Optional[Response] = None) -> Response:
+    """
+    Validates the Rows (ORM Objects or Models) into the Response Model and Encodes the whole List
+    to JSON in one Call, the Route's response_model is then only used for the Docs, so a Route
+    Returning a different Model per Branch Declares all of them (e.g. List[A | B]).
+    FastAPI would otherwise Validate the List a Second Time before Encoding it.
+    Headers Set on the Injected Response (e.g. the Next Cursor) are Carried over.
+    """
+    adapter = _list_adapter(model)
+    items = adapter.validate_python(rows if isinstance(rows, list) else list(rows), from_attributes=True)
+    fast_response = Response(content=adapter.dump_json(items, by_alias=True), media_type="application/json")
+    if response is not None:
+        for name, value in response.headers.items():
+            if name != "content-length":
+                fast_response.headers.append(name, value)
+    return fast_response
@@ -1,8 +1,15 @@
 from schemas.restock import RestockItems, Restock
 from validations.restock import RestockRequest
 from schemas.inventory import Inventory
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import literal_column
+from utils.inventory_summary import apply_inventory_changes
+
+
+# 4 Parameters per Row, PostgreSQL allows at most 32767 per Statement.
+INVENTORY_UPSERT_CHUNK_SIZE = 5000
 
 
 async def create_restock_items(restock_data: RestockRequest, db: AsyncSession):
@@ -32,26 +39,44 @@ async def create_restock_items(restock_data: RestockRequest, db: AsyncSession):
 
 
 async def add_restock_items_to_inventory(restock: Restock, db: AsyncSession):
-    restock_items = {p.product_id: p for p in restock.items}
-    
-    result = await db.execute(
-        select(Inventory)
-        .filter(Inventory.store_id == restock.store_id, Inventory.product_id.in_(restock_items))
-    )
-    
-    store_inventory = {p.product_id: p for p in result.scalars().all()}
-    
-    new_inventory_records = []
-    for item_id, item in restock_items.items():
-        product_from_store_inventory = store_inventory.get(item_id, None)
-        if product_from_store_inventory:
-            product_from_store_inventory.quantity += item.restock_quantity
-        else:
-            new_item = Inventory(
-                store_id=restock.store_id,
-                product_id=item.product_id,
-                quantity=item.restock_quantity,
-                max_discount_amount=0
-            )
-            new_inventory_records.append(new_item)
-            await db.add(new_item)
+    """
+    Adds the Restocked Quantities to the Store Inventory with a single Upsert,
+    Products not yet in the Store Inventory are Inserted, the others are Incremented.
+    """
+    quantities: dict = {}
+    for item in restock.items:
+        quantities[item.product_id] = quantities.get(item.product_id, 0) + item.restock_quantity
+
+    if not quantities:
+        return
+
+    rows = [
+        {
+            "store_id": restock.store_id,
+            "product_id": product_id,
+            "quantity": quantity,
+            "max_discount_amount": 0
+        }
+        for product_id, quantity in quantities.items()
+    ]
+    changes, thresholds = {}, {}
+    # Chunked only to stay under the Bind Parameter Limit of a single Statement.
+    for start in range(0, len(rows), INVENTORY_UPSERT_CHUNK_SIZE):
+        stmt = insert(Inventory).values(rows[start:start + INVENTORY_UPSERT_CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Inventory.store_id, Inventory.product_id],
+            set_={"quantity": Inventory.quantity + stmt.excluded.quantity}
+        ).returning(
+            Inventory.product_id,
+            Inventory.quantity,
+            Inventory.reorder_threshold,
+            # xmax is 0 only for Freshly Inserted Rows.
+            literal_column("xmax = 0").label("inserted")
+        )
+        results = await db.execute(stmt)
+        for row in results:
+            old = None if row.inserted else row.quantity - quantities[row.product_id]
+            changes[row.product_id] = (old, row.quantity)
+            thresholds[row.product_id] = (row.reorder_threshold, row.reorder_threshold)
+
+    await apply_inventory_changes(db, restock.store_id, changes, thresholds)
@@ -0,0 +1,283 @@
+"""
+Hourly and Daily Sales Rollups per (Store, Product).
+
+A Background Job Reads the Sale and Refund Transactions past its Watermark in Batches, Aggregates
+their Orders and Refunds into both Rollup Tables with one Upsert each, and Advances the Watermark
+in the same Commit, so a Batch is Counted exactly once. Reports then Read O(Buckets) Rows.
+
+Transactions younger than SALES_ROLLUP_LAG are left for the next Run: their Date is Set before
+the Commit, a Transaction still in Flight could otherwise Land behind the Watermark.
+Orders Cancelled after they were Rolled Up are not Subtracted.
+"""
+from schemas.order import Order, CartItems
+from schemas.product import Product
+from schemas.refund import Refund, RefundItems
+from schemas.sales_rollup import SalesRollupHourly, SalesRollupDaily, RollupWatermark
+from schemas.transaction import Transaction
+from utils.db import AsyncSessionLocal, _env_bool
+from sqlalchemy import func, literal, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+from dotenv import load_dotenv
+import asyncio
+import os
+import time
+
+
+load_dotenv()
+
+SALES_ROLLUP_ENABLED = _env_bool("SALES_ROLLUP_ENABLED", True)
+SALES_ROLLUP_INTERVAL = float(os.environ.get("SALES_ROLLUP_INTERVAL", 60))
+SALES_ROLLUP_BATCH_SIZE = int(os.environ.get("SALES_ROLLUP_BATCH_SIZE", 5000))
+SALES_ROLLUP_LAG = float(os.environ.get("SALES_ROLLUP_LAG", 30))
+SALES_ROLLUP_WATERMARK = "sales_rollup"
+
+ROLLUP_TABLES = {
+    "hour": SalesRollupHourly,
+    "day": SalesRollupDaily
+}
+MEASURES = ("units_sold", "gross", "discount", "tax", "units_refunded", "refund_amount")
+
+_job: Optional[asyncio.Task] = None
+_stats = {
+    "runs": 0,
+    "transactions": 0,
+    "errors": 0,
+    "last_run_seconds": 0.0
+}
+
+
+##########################
+# Rollup
+##########################
+
+def _bucket(granularity: str, column):
+    # Truncated in UTC, then Converted back to a timestamptz.
+    return func.timezone("UTC", func.date_trunc(granularity, func.timezone("UTC", column)))
+
+
+def _sales_select(granularity: str, transaction_ids: list[UUID]):
+    """
+    Sold Lines of the Batch's Orders. The Order's Amount, Discount and Tax are Split across its Lines
+    by their Share of the Line Value (Discounted, for the Tax), as the Refund Amount is, so the Buckets
+    Sum to the Orders Table. Catalog Prices only Weigh the Lines, they are not Charged.
+    """
+    line_value = Product.price * CartItems.quantity
+    net_value = line_value * (1 - CartItems.discount)
+    order_window = {"partition_by": CartItems.order_id}
+    lines = (
+        select(_bucket(granularity, Transaction.date).label("bucket"),
+               Order.store_id,
+               CartItems.product_id,
+               CartItems.quantity,
+               (Order.order_amount * line_value
+                / func.nullif(func.sum(line_value).over(**order_window), 0)).label("gross"),
+               (Order.discount_amount * line_value
+                / func.nullif(func.sum(line_value).over(**order_window), 0)).label("discount"),
+               (Order.tax * net_value
+                / func.nullif(func.sum(net_value).over(**order_window), 0)).label("tax"))
+        .select_from(Transaction)
+        .join(Order, Order.id == Transaction.operation_id)
+        .join(CartItems, CartItems.order_id == Order.id)
+        .join(Product, Product.id == CartItems.product_id)
+        .where(Transaction.id.in_(transaction_ids), Transaction.type == "Sale")
+        .subquery()
+    )
+
+    return (
+        select(lines.c.bucket,
+               lines.c.store_id,
+               lines.c.product_id,
+               func.sum(lines.c.quantity),
+               func.coalesce(func.sum(lines.c.gross), 0.0),
+               func.coalesce(func.sum(lines.c.discount), 0.0),
+               func.coalesce(func.sum(lines.c.tax), 0.0),
+               literal(0),
+               literal(0.0))
+        .group_by(lines.c.bucket, lines.c.store_id, lines.c.product_id)
+    )
+
+
+def _refunds_select(granularity: str, transaction_ids: list[UUID]):
+    """Refunded Lines of the Batch's Refunds, the Refund Amount is Split by the Lines' Value."""
+    line_value = Product.price * RefundItems.quantity
+    lines = (
+        select(_bucket(granularity, Transaction.date).label("bucket"),
+               Refund.store_id,
+               RefundItems.product_id,
+               RefundItems.quantity,
+               (Refund.amount * line_value
+                / func.nullif(func.sum(line_value).over(partition_by=RefundItems.refund_id), 0)).label("amount"))
+        .select_from(Transaction)
+        .join(Refund, Refund.id == Transaction.operation_id)
+        .join(RefundItems, RefundItems.refund_id == Refund.id)
+        .join(Product, Product.id == RefundItems.product_id)
+        .where(Transaction.id.in_(transaction_ids), Transaction.type == "Refund")
+        .subquery()
+    )
+
+    return (
+        select(lines.c.bucket,
+               lines.c.store_id,
+               lines.c.product_id,
+               literal(0),
+               literal(0.0),
+               literal(0.0),
+               literal(0.0),
+               func.sum(lines.c.quantity),
+               func.coalesce(func.sum(lines.c.amount), 0.0))
+        .group_by(lines.c.bucket, lines.c.store_id, lines.c.product_id)
+    )
+
+
+def _upsert(table, rows):
+    """Adds the Aggregated Rows onto the Existing Buckets."""
+    columns = ["bucket", "store_id", "product_id", *MEASURES]
+    stmt = insert(table).from_select(columns, rows)
+    return stmt.on_conflict_do_update(
+        index_elements=["bucket", "store_id", "product_id"],
+        set_={name: getattr(table, name) + getattr(stmt.excluded, name) for name in MEASURES}
+    )
+
+
+async def roll_up_batch(db: AsyncSession) -> int:
+    """Rolls up the next Batch of Transactions and Commits, Returns how many were Processed."""
+    now = datetime.now(timezone.utc)
+    await db.execute(
+        insert(RollupWatermark)
+        .values(name=SALES_ROLLUP_WATERMARK,
+                last_date=datetime.min.replace(tzinfo=timezone.utc),
+                last_id=UUID(int=0),
+                updated_at=now)
+        .on_conflict_do_nothing()
+    )
+    watermark = (await db.execute(
+        select(RollupWatermark)
+        .where(RollupWatermark.name == SALES_ROLLUP_WATERMARK)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )).scalar_one()
+
+    stmt = (
+        select(Transaction.id, Transaction.date)
+        .where(tuple_(Transaction.date, Transaction.id) > tuple_(watermark.last_date, watermark.last_id),
+               Transaction.date < now - timedelta(seconds=SALES_ROLLUP_LAG),
+               Transaction.type.in_(("Sale", "Refund")))
+        .order_by(Transaction.date, Transaction.id)
+        .limit(SALES_ROLLUP_BATCH_SIZE)
+    )
+    transactions = (await db.execute(stmt)).all()
+    if not transactions:
+        await db.rollback()
+        return 0
+
+    transaction_ids = [transaction.id for transaction in transactions]
+    for granularity, table in ROLLUP_TABLES.items():
+        await db.execute(_upsert(table, _sales_select(granularity, transaction_ids)))
+        await db.execute(_upsert(table, _refunds_select(granularity, transaction_ids)))
+
+    watermark.last_date, watermark.last_id = transactions[-1].date, transactions[-1].id
+    watermark.updated_at = now
+    await db.commit()
+    return len(transactions)
+
+
+async def run_sales_rollup() -> int:
+    """Processes Batches until the Job has Caught up, Returns the Number of Transactions."""
+    start = time.perf_counter()
+    processed = 0
+    async with AsyncSessionLocal() as db:
+        while True:
+            count = await roll_up_batch(db)
+            processed += count
+            if count < SALES_ROLLUP_BATCH_SIZE:
+                break
+
+    _stats["runs"] += 1
+    _stats["transactions"] += processed
+    _stats["last_run_seconds"] = round(time.perf_counter() - start, 3)
+    return processed
+
+
+async def _schedule():
+    while True:
+        try:
+            await run_sales_rollup()
+        except Exception as e:
+            _stats["errors"] += 1
+            print(f"Sales Rollup Failed: {e}")
+        await asyncio.sleep(SALES_ROLLUP_INTERVAL)
+
+
+def start_sales_rollup():
+    global _job
+    if not SALES_ROLLUP_ENABLED or _job is not None:
+        return
+
+    _job = asyncio.create_task(_schedule())
+    print("Sales Rollup Job Started.")
+
+
+async def stop_sales_rollup():
+    """Cancels the Job, a Batch in Progress is Rolled Back with its Session."""
+    global _job
+    if _job is None:
+        return
+
+    _job.cancel()
+    try:
+        await _job
+    except asyncio.CancelledError:
+        pass
+    _job = None
+
+
+async def sales_rollup_status(db: AsyncSession) -> dict:
+    stmt = select(RollupWatermark).where(RollupWatermark.name == SALES_ROLLUP_WATERMARK)
+    watermark = (await db.execute(stmt)).scalar_one_or_none()
+    return {
+        "enabled": SALES_ROLLUP_ENABLED,
+        "running": _job is not None,
+        "watermark": watermark.last_date if watermark else None,
+        "updated_at": watermark.updated_at if watermark else None,
+        **_stats
+    }
+
+
+##########################
+# Reporting
+##########################
+
+async def query_sales(db: AsyncSession,
+                      granularity: str,
+                      start: datetime,
+                      end: datetime,
+                      store_id: Optional[UUID] = None,
+                      product_id: Optional[UUID] = None,
+                      by_store: bool = False,
+                      by_product: bool = False) -> list:
+    """Sums the Rollup Buckets in [Start, End), per Bucket and Optionally per Store and / or Product."""
+    table = ROLLUP_TABLES[granularity]
+    keys = [table.bucket]
+    if by_store:
+        keys.append(table.store_id)
+    if by_product:
+        keys.append(table.product_id)
+
+    stmt = (
+        select(*keys, *(func.sum(getattr(table, name)).label(name) for name in MEASURES))
+        .where(table.bucket >= start, table.bucket < end)
+        .group_by(*keys)
+        .order_by(*keys)
+    )
+    if store_id is not None:
+        stmt = stmt.where(table.store_id == store_id)
+    if product_id is not None:
+        stmt = stmt.where(table.product_id == product_id)
+
+    result = await db.execute(stmt)
+    return result.all()
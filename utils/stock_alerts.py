@@ -0,0 +1,205 @@
+from schemas.inventory import Inventory
+from utils.db import AsyncSessionLocal
+from utils.inventory_summary import LOW_STOCK_THRESHOLD, QuantityChanges
+from sqlalchemy import event, tuple_
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+from dotenv import load_dotenv
+import urllib.request
+import asyncio
+import json
+import os
+import time
+
+
+load_dotenv()
+
+STOCK_ALERT_WEBHOOK_URL = os.environ.get("STOCK_ALERT_WEBHOOK_URL")
+STOCK_ALERT_FILE = os.environ.get("STOCK_ALERT_FILE")
+STOCK_ALERT_QUEUE_SIZE = int(os.environ.get("STOCK_ALERT_QUEUE_SIZE", 10_000))
+STOCK_ALERT_BATCH_SIZE = int(os.environ.get("STOCK_ALERT_BATCH_SIZE", 500))
+STOCK_ALERT_WEBHOOK_TIMEOUT = float(os.environ.get("STOCK_ALERT_WEBHOOK_TIMEOUT", 5))
+
+# Committed Changes waiting for Evaluation: (Commit Time, Store ID, Quantity Changes).
+_queue: Optional[asyncio.Queue] = None
+_consumer: Optional[asyncio.Task] = None
+
+_stats = {
+    "evaluated": 0,
+    "alerts": 0,
+    "dropped": 0,
+    "sink_errors": 0,
+    "max_latency_ms": 0.0,
+    "total_latency_ms": 0.0
+}
+
+
+def alerts_enabled() -> bool:
+    return _queue is not None
+
+
+##########################
+# Request Side
+##########################
+
+# apply_inventory_changes Stashes every Inventory Change on the Session, they are only Handed
+# to the Engine once the Transaction Commits, so Rolled Back Changes never Raise Alerts.
+
+@event.listens_for(Session, "after_commit")
+def _submit_stock_changes(session: Session):
+    pending = session.info.pop("inventory_changes", None)
+    if not pending or _queue is None:
+        return
+
+    committed_at = time.monotonic()
+    for store_id, changes in pending:
+        # Only Decreases can Cross below a Threshold.
+        changes = {product_id: (old, new) for product_id, (old, new) in changes.items()
+                   if new is not None and (old is None or new < old)}
+        if not changes:
+            continue
+        try:
+            # Never Blocks the Request, a Full Queue Drops the Changes instead.
+            _queue.put_nowait((committed_at, store_id, changes))
+        except asyncio.QueueFull:
+            _stats["dropped"] += 1
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stock_changes(session: Session):
+    session.info.pop("inventory_changes", None)
+
+
+##########################
+# Engine Side
+##########################
+
+def _write_file(alerts: list[dict]):
+    with open(STOCK_ALERT_FILE, "a", encoding="utf-8") as file:
+        file.writelines(json.dumps(alert) + "\n" for alert in alerts)
+
+
+def _post_webhook(alerts: list[dict]):
+    request = urllib.request.Request(
+        STOCK_ALERT_WEBHOOK_URL,
+        data=json.dumps({"alerts": alerts}).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    with urllib.request.urlopen(request, timeout=STOCK_ALERT_WEBHOOK_TIMEOUT):
+        pass
+
+
+async def _deliver(alerts: list[dict]):
+    sinks = []
+    if STOCK_ALERT_FILE:
+        sinks.append(_write_file)
+    if STOCK_ALERT_WEBHOOK_URL:
+        sinks.append(_post_webhook)
+
+    for sink in sinks:
+        try:
+            # Both Sinks do Blocking IO, kept off the Event Loop.
+            await asyncio.to_thread(sink, alerts)
+        except Exception as e:
+            _stats["sink_errors"] += 1
+            print(f"Stock Alert Sink {sink.__name__} Failed: {e}")
+
+
+async def evaluate_stock_changes(batch: list[tuple[float, UUID, QuantityChanges]]) -> list[dict]:
+    """
+    Loads the Thresholds of the Touched Rows only (one Query per Batch) and Returns an Alert
+    for every Product whose Quantity has Crossed below its Reorder Threshold.
+    """
+    keys = {(store_id, product_id) for _, store_id, changes in batch for product_id in changes}
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Inventory.store_id, Inventory.product_id, Inventory.reorder_threshold)
+            .where(tuple_(Inventory.store_id, Inventory.product_id).in_(keys))
+        )
+        thresholds = {(row.store_id, row.product_id): row.reorder_threshold for row in result}
+
+    alerts = []
+    now = time.monotonic()
+    for committed_at, store_id, changes in batch:
+        for product_id, (old, new) in changes.items():
+            threshold = thresholds.get((store_id, product_id))
+            if threshold is None:
+                threshold = LOW_STOCK_THRESHOLD
+
+            if new < threshold and (old is None or old >= threshold):
+                latency_ms = (now - committed_at) * 1000
+                _stats["max_latency_ms"] = max(_stats["max_latency_ms"], latency_ms)
+                _stats["total_latency_ms"] += latency_ms
+                alerts.append({
+                    "store_id": str(store_id),
+                    "product_id": str(product_id),
+                    "previous_quantity": old,
+                    "quantity": new,
+                    "reorder_threshold": threshold,
+                    "out_of_stock": new == 0,
+                    "alerted_at": datetime.now(timezone.utc).isoformat()
+                })
+
+    _stats["evaluated"] += len(keys)
+    _stats["alerts"] += len(alerts)
+    return alerts
+
+
+async def _consume():
+    while True:
+        batch = [await _queue.get()]
+        while len(batch) < STOCK_ALERT_BATCH_SIZE and not _queue.empty():
+            batch.append(_queue.get_nowait())
+
+        try:
+            alerts = await evaluate_stock_changes(batch)
+            if alerts:
+                await _deliver(alerts)
+        except Exception as e:
+            print(f"Stock Alert Evaluation Failed: {e}")
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+
+def start_stock_alerts():
+    """Starts the Consumer, only when a Sink is Configured."""
+    global _queue, _consumer
+    if not (STOCK_ALERT_WEBHOOK_URL or STOCK_ALERT_FILE) or _consumer is not None:
+        return
+
+    _queue = asyncio.Queue(maxsize=STOCK_ALERT_QUEUE_SIZE)
+    _consumer = asyncio.create_task(_consume())
+    print("Stock Alert Engine Started.")
+
+
+async def stop_stock_alerts(timeout: float = 5):
+    """Drains the Pending Changes (up to the Timeout) and Stops the Consumer."""
+    global _queue, _consumer
+    if _consumer is None:
+        return
+
+    try:
+        await asyncio.wait_for(_queue.join(), timeout)
+    except asyncio.TimeoutError:
+        pass
+
+    _consumer.cancel()
+    _queue, _consumer = None, None
+
+
+def stock_alert_stats() -> dict:
+    return {
+        "enabled": alerts_enabled(),
+        "queued": _queue.qsize() if _queue else 0,
+        "evaluated": _stats["evaluated"],
+        "alerts": _stats["alerts"],
+        "dropped": _stats["dropped"],
+        "sink_errors": _stats["sink_errors"],
+        "avg_latency_ms": _stats["total_latency_ms"] / _stats["alerts"] if _stats["alerts"] else 0.0,
+        "max_latency_ms": _stats["max_latency_ms"]
+    }
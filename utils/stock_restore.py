@@ -3,6 +3,7 @@ from schemas.inventory import Inventory
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from utils.inventory_summary import apply_inventory_changes
 
 
 async def restore_inventory(db: AsyncSession, store_id: UUID,
@@ -13,7 +14,8 @@ async def restore_inventory(db: AsyncSession, store_id: UUID,
     """
     stmt = select(Inventory).where(Inventory.product_id.in_(products), Inventory.store_id == store_id)
     results = await db.execute(stmt)
-    inventories = {inv.product_id: inv for inv in results}
+    inventories = {inv.product_id: inv for inv in results.scalars().all()}
+    changes = {}
 
     for product_id, quantity in products.items():
         inventory = inventories.get(product_id)
@@ -22,6 +24,7 @@ async def restore_inventory(db: AsyncSession, store_id: UUID,
                 status_code=404,
                 detail=f"Product {product_id} Not Found in Inventory.")
 
+        old_quantity = inventory.quantity
         if add_stock:
             inventory.quantity += quantity
 
@@ -31,3 +34,7 @@ async def restore_inventory(db: AsyncSession, store_id: UUID,
         else:
             raise ValueError(f"Not enough inventory for Product {product_id} in Store {store_id}.\
                                 Only {inventory.quantity} Available.")
+
+        changes[product_id] = (old_quantity, inventory.quantity)
+
+    await apply_inventory_changes(db, store_id, changes)
@@ -0,0 +1,218 @@
+"""
+Store Dashboard: Daily Sales, Refund and Restock Figures of a Store, Aggregated in the Database.
+
+Results are Cached per (Store, Date Range). Once a Write of an Order, Refund, Restock, Removal or
+Transaction has Committed, its Store's Version (utils/data_version.py) is Incremented by a separate
+Statement, so the Writes never Wait on the Version Row. The Version is part of the Cache Key and is
+Read on the Request's Session before the Figures, a Cached Dashboard is never Older than its Version.
+If the Process Dies between the Commit and the Increment, the Dashboard is Stale for up to the TTL.
+"""
+from schemas.order import Order, CartItems
+from schemas.refund import Refund
+from schemas.removal import StockRemoval
+from schemas.restock import Restock, RestockItems
+from schemas.transaction import Transaction
+from utils.cache import TTLCache
+from utils.data_version import increment_versions, get_versions
+from utils.db import AsyncSessionLocal
+from validations.store import StoreDashboardDay, StoreDashboardResponse
+from sqlalchemy import event, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+from datetime import date, datetime, time, timedelta, timezone
+from itertools import chain
+from uuid import UUID
+from dotenv import load_dotenv
+import asyncio
+import os
+
+
+load_dotenv()
+
+STORE_DASHBOARD_CACHE_SIZE = int(os.environ.get("STORE_DASHBOARD_CACHE_SIZE", 1000))
+STORE_DASHBOARD_CACHE_TTL = float(os.environ.get("STORE_DASHBOARD_CACHE_TTL", 300))
+STORE_DASHBOARD_MAX_DAYS = int(os.environ.get("STORE_DASHBOARD_MAX_DAYS", 366))
+
+# Writes of these Models Change the Figures of their Store.
+DASHBOARD_MODELS = (Order, Refund, Restock, StockRemoval, Transaction)
+
+dashboard_cache = TTLCache(max_size=STORE_DASHBOARD_CACHE_SIZE, ttl=STORE_DASHBOARD_CACHE_TTL)
+
+
+# Keeps the Pending Increments Referenced until they are Done.
+_bump_tasks: set[asyncio.Task] = set()
+
+
+def _version_name(store_id: UUID) -> str:
+    return f"store_dashboard:{store_id}"
+
+
+##########################
+# Invalidation
+##########################
+
+@event.listens_for(Session, "before_flush")
+def _collect_changed_stores(session: Session, flush_context, instances):
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, DASHBOARD_MODELS) and obj.store_id is not None:
+            session.info.setdefault("dashboard_stores", set()).add(obj.store_id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_transactions(state):
+    # Bulk Inserts (e.g. utils/bulk_orders.py) Bypass the Flush, their Transaction Rows name the Stores.
+    # The Statement holds an Annotated Copy of the Table, so they are Compared by Name.
+    table = getattr(state.statement, "table", None)
+    if not state.is_insert or getattr(table, "name", None) != Transaction.__tablename__:
+        return
+
+    rows = state.parameters if isinstance(state.parameters, list) else [state.parameters or {}]
+    stores = {row["store_id"] for row in rows if row.get("store_id") is not None}
+    if stores:
+        state.session.info.setdefault("dashboard_stores", set()).update(stores)
+
+
+async def _bump_store_versions(stores: set[UUID]):
+    try:
+        async with AsyncSessionLocal() as session:
+            await increment_versions(session, (_version_name(store_id) for store_id in stores))
+            await session.commit()
+    except Exception as e:
+        print(f"Store Dashboard Version Bump Failed: {e}")
+
+
+@event.listens_for(Session, "after_commit")
+def _schedule_version_bump(session: Session):
+    stores = session.info.pop("dashboard_stores", None)
+    if not stores:
+        return
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+
+    # The Session cannot Emit SQL anymore, the Increment Runs on its own once the Commit is Done.
+    task = loop.create_task(_bump_store_versions(stores))
+    _bump_tasks.add(task)
+    task.add_done_callback(_bump_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_stores(session: Session):
+    session.info.pop("dashboard_stores", None)
+
+
+##########################
+# Aggregation
+##########################
+
+def _dashboard_queries(store_id: UUID, start: datetime, end: datetime) -> dict:
+    """One GROUP BY per Source, each Filtered on the (Store, Date) Index of its Table."""
+    # UTC Days, the same as the Range Bounds, whatever the Session's TimeZone is.
+    order_day = func.date(func.timezone("UTC", Order.date_placed))
+    refund_day = func.date(func.timezone("UTC", Refund.application_date))
+    restock_day = func.date(func.timezone("UTC", Restock.date_placed))
+    live_orders = (Order.store_id == store_id, Order.date_placed >= start,
+                   Order.date_placed < end, Order.status != "Cancelled")
+
+    return {
+        "orders": (
+            select(order_day,
+                   func.count(Order.id),
+                   func.sum(Order.order_amount - Order.discount_amount))
+            .where(*live_orders)
+            .group_by(order_day)
+        ),
+        "units": (
+            select(order_day, func.sum(CartItems.quantity))
+            .join(CartItems, CartItems.order_id == Order.id)
+            .where(*live_orders)
+            .group_by(order_day)
+        ),
+        "refunds": (
+            select(refund_day, func.count(Refund.id), func.sum(Refund.amount))
+            .where(Refund.store_id == store_id,
+                   Refund.application_date >= start,
+                   Refund.application_date < end,
+                   Refund.status.in_(("Approved", "Refunded")))
+            .group_by(refund_day)
+        ),
+        "restocks": (
+            select(restock_day, func.sum(RestockItems.restock_quantity))
+            .join(RestockItems, RestockItems.restock_id == Restock.id)
+            .where(Restock.store_id == store_id,
+                   Restock.date_placed >= start,
+                   Restock.date_placed < end,
+                   Restock.status != "Cancelled")
+            .group_by(restock_day)
+        ),
+    }
+
+
+async def compute_store_dashboard(store_id: UUID,
+                                  start_date: date,
+                                  end_date: date,
+                                  db: AsyncSession) -> StoreDashboardResponse:
+    start = datetime.combine(start_date, time.min, tzinfo=timezone.utc)
+    end = datetime.combine(end_date + timedelta(days=1), time.min, tzinfo=timezone.utc)
+    queries = _dashboard_queries(store_id, start, end)
+
+    # Run one after another on the Request's Session, Parallel Sessions would each Hold a Pooled Connection.
+    results = {name: (await db.execute(stmt)).all() for name, stmt in queries.items()}
+
+    days = {}
+
+    def _entry(day: date) -> StoreDashboardDay:
+        if day not in days:
+            days[day] = StoreDashboardDay(day=day)
+        return days[day]
+
+    for day, orders, revenue in results["orders"]:
+        entry = _entry(day)
+        entry.orders = orders
+        entry.revenue = round(revenue or 0.0, 2)
+    for day, units in results["units"]:
+        _entry(day).units_sold = units or 0
+    for day, refunds, refund_amount in results["refunds"]:
+        entry = _entry(day)
+        entry.refunds = refunds
+        entry.refund_amount = round(refund_amount or 0.0, 2)
+    for day, units in results["restocks"]:
+        _entry(day).restock_units = units or 0
+
+    daily = [days[day] for day in sorted(days)]
+    for entry in daily:
+        entry.refund_rate = round(entry.refunds / entry.orders, 4) if entry.orders else 0.0
+
+    orders = sum(entry.orders for entry in daily)
+    refunds = sum(entry.refunds for entry in daily)
+    return StoreDashboardResponse(
+        store_id=store_id,
+        start_date=start_date,
+        end_date=end_date,
+        revenue=round(sum(entry.revenue for entry in daily), 2),
+        orders=orders,
+        units_sold=sum(entry.units_sold for entry in daily),
+        refunds=refunds,
+        refund_amount=round(sum(entry.refund_amount for entry in daily), 2),
+        refund_rate=round(refunds / orders, 4) if orders else 0.0,
+        restock_units=sum(entry.restock_units for entry in daily),
+        days=daily
+    )
+
+
+async def get_store_dashboard(store_id: UUID,
+                              start_date: date,
+                              end_date: date,
+                              db: AsyncSession) -> StoreDashboardResponse:
+    """Cached Dashboard of a Store, Recomputed once the Store has Committed Writes."""
+    name = _version_name(store_id)
+    version = (await get_versions(db, (name,)))[name]
+    key = (store_id, version, start_date, end_date)
+    dashboard = dashboard_cache.get(key)
+    if dashboard is None:
+        dashboard = await compute_store_dashboard(store_id, start_date, end_date, db)
+        dashboard_cache.set(key, dashboard)
+    return dashboard
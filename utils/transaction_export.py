@@ -0,0 +1,93 @@
+from schemas.transaction import Transaction
+from utils.db import ReadSessionLocal
+from sqlalchemy.future import select
+from typing import AsyncGenerator, Optional
+from datetime import date, datetime, timedelta
+from uuid import UUID
+from dotenv import load_dotenv
+import csv
+import io
+import json
+import os
+
+
+load_dotenv()
+
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", 1000))
+
+EXPORT_COLUMNS = (
+    Transaction.id,
+    Transaction.type,
+    Transaction.date,
+    Transaction.operation_id,
+    Transaction.request_made_by,
+    Transaction.store_id
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+
+def apply_transaction_filters(stmt,
+                              store_id: Optional[UUID] = None,
+                              operation_type: Optional[str] = None,
+                              start_date: Optional[date] = None,
+                              end_date: Optional[date] = None):
+    """Applies the Transaction Filters, the End Date is Inclusive."""
+    if store_id:
+        stmt = stmt.where(Transaction.store_id == store_id)
+    if operation_type:
+        stmt = stmt.where(Transaction.type == operation_type)
+    if start_date:
+        stmt = stmt.where(Transaction.date >= start_date)
+    if end_date:
+        stmt = stmt.where(Transaction.date < end_date + timedelta(days=1))
+    return stmt
+
+
+def _serialize(value):
+    if isinstance(value, (UUID, datetime)):
+        return str(value)
+    return value
+
+
+def _ndjson_chunk(rows) -> str:
+    return "".join(
+        json.dumps({field: _serialize(value) for field, value in zip(EXPORT_FIELDS, row)}) + "\n"
+        for row in rows
+    )
+
+
+def _csv_chunk(rows, include_header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if include_header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+async def stream_transactions(export_format: str, **filters) -> AsyncGenerator[str, None]:
+    """
+    Streams the Filtered Transactions through a Server Side Cursor, one Chunk per Batch,
+    so Memory stays Constant regardless of the Table Size.
+    The Generator owns its Session, as it Outlives the Request Handler.
+    """
+    stmt = apply_transaction_filters(select(*EXPORT_COLUMNS), **filters)
+    stmt = stmt.order_by(Transaction.date, Transaction.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+    async with ReadSessionLocal() as session:
+        result = await session.stream(stmt)
+        include_header = True
+        async for rows in result.partitions():
+            if export_format == "csv":
+                yield _csv_chunk(rows, include_header)
+                include_header = False
+            else:
+                yield _ndjson_chunk(rows)
+
+        if export_format == "csv" and include_header:
+            yield _csv_chunk([], include_header)
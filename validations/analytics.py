@@ -0,0 +1,28 @@
+from pydantic import BaseModel, Field, UUID4, ConfigDict
+from typing import Optional
+from datetime import datetime
+
+
+class SalesRollupResponse(BaseModel):
+    bucket: datetime = Field(..., description="Start of the Hour or Day (UTC)")
+    store_id: Optional[UUID4] = Field(None, description="Store, when Grouped by Store")
+    product_id: Optional[UUID4] = Field(None, description="Product, when Grouped by Product")
+    units_sold: int = Field(0, description="Quantity Sold")
+    gross: float = Field(0.0, description="Sales at the Catalog Price, before Discounts")
+    discount: float = Field(0.0, description="Discounts Given")
+    tax: float = Field(0.0, description="Tax Collected")
+    units_refunded: int = Field(0, description="Quantity Refunded")
+    refund_amount: float = Field(0.0, description="Amount Refunded")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SalesRollupStatusResponse(BaseModel):
+    enabled: bool = Field(..., description="Whether the Rollup Job is Enabled")
+    running: bool = Field(..., description="Whether the Job Runs in this Worker")
+    watermark: Optional[datetime] = Field(None, description="Date of the last Rolled up Transaction")
+    updated_at: Optional[datetime] = Field(None, description="Timestamp When the Watermark last Advanced")
+    runs: int = Field(0, description="Runs of this Worker's Job")
+    transactions: int = Field(0, description="Transactions Rolled up by this Worker")
+    errors: int = Field(0, description="Failed Runs of this Worker's Job")
+    last_run_seconds: float = Field(0.0, description="Duration of the last Run")
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, UUID4, ConfigDict
 from typing import Optional
+from datetime import datetime
 from .product import ProductResponseWithCategory
 
 
@@ -12,6 +13,11 @@ class InventoryBase(BaseModel):
         le=1.0,
         description="Maximum Discount allowed on the product (0-1 scale)"
     )
+    reorder_threshold: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Quantity below which a Low Stock Alert is Raised, Defaults to the Global Threshold"
+    )
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -30,10 +36,35 @@ class InventoryUpdateRequest(BaseModel):
     max_discount_amount: Optional[float] = Field(
         None, ge=0.0, le=1.0, description="Updated Max Discount Allowed (0-1)"
     )
+    reorder_threshold: Optional[int] = Field(
+        None, ge=0, description="Updated Low Stock Alert Threshold"
+    )
 
 
 class InventoryResponseWithProduct(InventoryResponse):
     product: Optional[ProductResponseWithCategory] = Field(
         None, description="Product details including category"
     )
-    product_id: UUID4 = Field(exclude=True, description="Unique identifier for the Product")
\ No newline at end of file
+    product_id: UUID4 = Field(exclude=True, description="Unique identifier for the Product")
+
+
+class StoreInventorySummaryResponse(BaseModel):
+    store_id: UUID4 = Field(..., description="Unique identifier for the Store")
+    sku_count: int = Field(default=0, description="Number of Products Stocked in the Store")
+    units_on_hand: int = Field(default=0, description="Total Quantity of all Products in the Store")
+    stock_value: float = Field(default=0.0, description="Total Value of the Stock at the Current Prices")
+    low_stock_count: int = Field(default=0, description="Number of Products below the Low Stock Threshold")
+    updated_at: Optional[datetime] = Field(default=None, description="Timestamp of the last Change")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class InventoryFilterParams(BaseModel):
+    """Query Parameters for Filtering and Sorting Inventory Lists."""
+    store_id: Optional[UUID4] = Field(None, description="Unique identifier for the Store")
+    product_id: Optional[UUID4] = Field(None, description="Unique identifier for the Product")
+    quantity_lt: Optional[int] = Field(None, ge=0, description="Quantity Strictly Below")
+    quantity_gt: Optional[int] = Field(None, ge=0, description="Quantity Strictly Above")
+    max_discount_amount_gte: Optional[float] = Field(None, ge=0.0, le=1.0, description="Minimum of the Max Discount")
+    max_discount_amount_lte: Optional[float] = Field(None, ge=0.0, le=1.0, description="Maximum of the Max Discount")
+    sort: Optional[str] = Field(None, description="Comma Separated Columns (quantity, max_discount_amount), Prefix '-' for Descending")
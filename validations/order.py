@@ -101,3 +101,27 @@ class OrderResponseWithOutStore(OrderResponse):
 class OrderResponseWithCustomer(OrderResponse):
     customer: Optional[CustomerResponse] = Field(
         None, description="Customer Details")
+
+
+class BulkOrderRequest(BaseModel):
+    orders: List[OrderRequest] = Field(
+        ..., min_length=1, description="Orders to Place, Processed in the given Order")
+
+
+class BulkOrderResult(BaseModel):
+    index: int = Field(..., description="Position of the Order in the Request")
+    status: Literal["Created", "Failed"] = Field(
+        ..., description="Outcome of the Order, either Created or Failed")
+    order_id: Optional[UUID4] = Field(
+        None, description="Unique identifier of the Created Order")
+    detail: Optional[str] = Field(
+        None, description="Reason the Order Failed")
+
+
+class BulkOrderResponse(BaseModel):
+    created: int = Field(..., description="Number of Orders Created")
+    failed: int = Field(..., description="Number of Orders Rejected")
+    results: List[BulkOrderResult] = Field(
+        ..., description="Outcome of every Order, in Request Order")
+    duration_seconds: float = Field(..., description="Time taken by the Batch")
+    orders_per_second: float = Field(..., description="Processing Rate of the Batch")
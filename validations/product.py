@@ -70,3 +70,27 @@ class ProductUpdateRequest(BaseModel):
     price: Optional[float] = Field(None, ge=0.0, description="Product price")
     is_removed: Optional[bool] = Field(None, description="Product Removal Indicator")
     category_id: int = Field(None, description="Foreign Key: Category ID")
+
+
+class ProductFilterParams(BaseModel):
+    """Query Parameters for Filtering and Sorting Product Lists."""
+    price_gte: Optional[float] = Field(None, ge=0.0, description="Minimum Price")
+    price_lte: Optional[float] = Field(None, ge=0.0, description="Maximum Price")
+    category_id: Optional[int] = Field(None, description="Category of the Products")
+    is_removed: Optional[bool] = Field(None, description="Product Removal Indicator")
+    sort: Optional[str] = Field(None, description="Comma Separated Columns (name, price), Prefix '-' for Descending")
+
+
+class ProductImportError(BaseModel):
+    """Rejected Row of a Product Import."""
+    row: int = Field(..., description="Row Number in the Uploaded File, Excluding the Header")
+    error: str = Field(..., description="Reason the Row was Rejected")
+
+
+class ProductImportResponse(BaseModel):
+    """Response model for a Bulk Product Import."""
+    imported: int = Field(..., description="Number of Products Inserted")
+    failed: int = Field(..., description="Number of Rows Rejected")
+    errors: List[ProductImportError] = Field(default_factory=list, description="Rejected Rows, may be Truncated")
+    duration_seconds: float = Field(..., description="Total Import Duration")
+    rows_per_second: float = Field(..., description="Processed Rows per Second")
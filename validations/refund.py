@@ -3,6 +3,7 @@ from typing import Optional, List, Literal
 from datetime import datetime, timezone, timedelta
 from .product import ProductResponseWithCategory
 from schemas.order import Order
+from utils.pricing import price_cart, to_basis_points, to_cents
 
 
 ALLOWED_TRANSITIONS = {
@@ -90,14 +91,18 @@ class RefundRequest(RefundBase):
         self.status = "Approved" if not err_occured else "Rejected"
 
     def calculate_total_amount(self, order: Order) -> float:
-        total = 0
+        # Refunds Return the Discounted Price, without Tax.
+        lines = []
         products_ordered = {p.product_id: p for p in order.items}
         for item in self.items:
             if item.product_id in products_ordered:
                 product = products_ordered[item.product_id]
-                price = product.product.price * (1 - product.discount)
-                total += price * item.quantity
-        return total
+                lines.append((to_cents(product.product.price),
+                              item.quantity,
+                              to_basis_points(product.discount)))
+
+        totals = price_cart(lines, tax_bp=0)
+        return (totals.amount - totals.discount) / 100
 
 
 class RefundUpdateRequest(BaseModel):
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, UUID4
 from typing import Optional, List
+from datetime import date
 from .location import LocationBase
 from .employee import EmployeeResponseWithOutStore
 from .inventory import InventoryBase
@@ -156,3 +157,28 @@ class StoreResponseWithRelations(StoreResponse):
         default_factory=list,
         description="List of Store Refunds"
     )
+
+
+class StoreDashboardDay(BaseModel):
+    day: date = Field(..., description="Day of the Figures")
+    revenue: float = Field(0.0, description="Order Amounts less Discounts, Cancelled Orders Excluded")
+    orders: int = Field(0, description="Number of Orders Placed")
+    units_sold: int = Field(0, description="Quantity of Products Ordered")
+    refunds: int = Field(0, description="Number of Approved or Refunded Refund Applications")
+    refund_amount: float = Field(0.0, description="Amount of those Refunds")
+    refund_rate: float = Field(0.0, description="Refunds per Order")
+    restock_units: int = Field(0, description="Quantity Restocked, Cancelled Restocks Excluded")
+
+
+class StoreDashboardResponse(BaseModel):
+    store_id: UUID4 = Field(..., description="Unique identifier for the Store")
+    start_date: date = Field(..., description="First Day of the Range")
+    end_date: date = Field(..., description="Last Day of the Range (Inclusive)")
+    revenue: float = Field(0.0, description="Revenue over the Range")
+    orders: int = Field(0, description="Orders over the Range")
+    units_sold: int = Field(0, description="Units Sold over the Range")
+    refunds: int = Field(0, description="Refunds over the Range")
+    refund_amount: float = Field(0.0, description="Refunded Amount over the Range")
+    refund_rate: float = Field(0.0, description="Refunds per Order over the Range")
+    restock_units: int = Field(0, description="Units Restocked over the Range")
+    days: List[StoreDashboardDay] = Field(default_factory=list, description="Daily Figures, Days without Activity are Omitted")